@@ -1,66 +1,84 @@
+from importlib.machinery import ModuleSpec
+
+# Streamlit은 이 스크립트를 __spec__ 없는 가짜 __main__ 모듈로 실행하므로, 그대로 두면 작업 프로세스
+# (forkserver/spawn으로 시작하는 채점/렌더링/성적표 프로세스 풀)가 시작할 때마다 이 파일을 __mp_main__으로
+# 다시 실행해 화면 코드와 프로세스 풀 시작까지 반복합니다. 작업 함수는 모두 다른 모듈에 있으므로
+# __main__ 모듈 이름을 지정해 multiprocessing이 작업 프로세스에서 이 파일을 다시 실행하지 않게 합니다.
+__spec__ = ModuleSpec('__main__', None)
+
 import streamlit as st
 import pandas as pd
-import io
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+import numpy as np
 from datetime import datetime
 from pathlib import Path
 import os
 
+import functools
+import hashlib
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from grading import (
+    PARALLEL_MIN_ROWS, ROW_LAYOUTS, SUBJECT_CODE_MAPPINGS, TAMGU_LAYOUT, compile_answer_key, diff_answer_keys,
+    grade_chunks, grade_frame, regrade, wrong_answer_distribution
+)
+from loaders import (
+    STREAMING_CHUNK_ROWS, iter_student_data_chunks, load_answer_data, load_student_data, load_student_info,
+    load_student_preview
+)
+from exports import (
+    build_item_analysis_workbook, build_results_workbook, build_wrong_distribution_workbook, iter_result_chunks,
+    to_csv_bytes, to_excel_bytes
+)
+from item_analysis import GROUP_RATIO, analyze_subject
+from archive import ARCHIVE_AVAILABLE, ExamArchive
+from reports import REPORT_CARD_WORKERS, REPORTLAB_AVAILABLE, iter_report_cards, subject_report_aggregates, write_report_cards_zip
+from rendering import RenderService, statistics_report_aggregates
+from assets import static_asset_base64
+from standard_scores import DEFAULT_STANDARD_SCORE_SCALE, GRADE_CUMULATIVE_RATIOS, STANDARD_SCORE_SCALES, convert_scores
+from profiling import NULL_PROFILER, StageProfiler
+
 # ==================== 상수 정의 ====================
-# 탐구 과목 CSV 파일 구조 관련 상수
-STUDENT_ID_COL_IDX = 0          # 수험번호 컬럼 인덱스
-SUBJECT_CODE1_COL_IDX = 1       # 과목코드1 컬럼 인덱스 (탐구용)
-SUBJECT_CODE2_COL_IDX = 2       # 과목코드2 컬럼 인덱스 (탐구용)
-ANSWERS_START_COL_IDX = 3       # 답안 시작 컬럼 인덱스
-QUESTIONS_PER_SUBJECT = 20      # 탐구 과목당 문항 수
-
-# 한글 폰트 경로 (macOS)
-KOREAN_FONT_PATHS = [
-    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
-    '/System/Library/Fonts/Supplemental/AppleGothic.ttf'
-]
-
-# ==================== 과목 코드 매핑 설정 ====================
-SUBJECT_CODE_MAPPINGS = {
-    "국어": {
-        "1": "화법과 작문",
-        "2": "언어와 매체"
-    },
-    "수학": {
-        "1": "확률과 통계",
-        "2": "미분과 적분",
-        "3": "기하"
-    },
-    "영어": {
-        "1": "영어"
-    },
-    "한국사": {
-        "1": "한국사"
-    },
-    "탐구": {
-        # 사회탐구
-        "11": "생활과 윤리",
-        "12": "윤리와 사상",
-        "13": "한국지리",
-        "14": "세계지리",
-        "15": "동아시아사",
-        "16": "세계사",
-        "17": "경제",
-        "18": "정치와 법",
-        "19": "사회·문화",
-        # 과학탐구
-        "20": "물리학Ⅰ",
-        "21": "화학Ⅰ",
-        "22": "생명과학Ⅰ",
-        "23": "지구과학Ⅰ",
-        "24": "물리학Ⅱ",
-        "25": "화학Ⅱ",
-        "26": "생명과학Ⅱ",
-        "27": "지구과학Ⅱ"
-    }
+# 탐구 과목 CSV 파일 구조 (한 행에 2개 과목, grading.TAMGU_LAYOUT 참고)
+QUESTIONS_PER_SUBJECT = TAMGU_LAYOUT.questions_per_subject  # 탐구 과목당 문항 수
+
+# 업로드 파일 파싱 결과 캐시 크기 (파일 내용 해시 기준, 로더별)
+LOADER_CACHE_SIZE = 8
+
+# 이 크기 이상의 학생 답안 파일은 자동으로 스트리밍 채점
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+# 과목별 병렬 채점 프로세스 수 기본값 (사이드바에서 변경 가능)
+# 순차 채점이 기본이며, 배포 환경에서 benchmarks/bench_parallel_grading.py가 빨라지는 것을 확인한 경우에만 늘림
+DEFAULT_GRADING_WORKERS = 1
+
+# 다운로드 파일 캐시 크기 ((결과 해시, 과목, 형식) 기준)
+EXPORT_CACHE_SIZE = 64
+
+# 결과 표 페이지 크기 선택지 (현재 페이지 행만 브라우저로 전송)
+RESULT_PAGE_SIZES = (50, 100, 500, 1000)
+
+# 결과 표 정렬 기준 (표시 이름 → 컬럼, None은 채점 순서)
+RESULT_SORT_COLUMNS = {
+    '채점 순서': None,
+    '총점': '총점',
+    '표준점수': '표준점수',
+    '백분위': '백분위',
+    '등급': '등급',
+    '정답수': '정답수',
+    '수험번호': '수험번호',
+    '이름': '이름',
+    '학번': '학번',
 }
 
+# 채점 결과 화면에 쓰는 session_state 키 (업로드 파일이 바뀌면 함께 초기화)
+RESULT_STATE_KEYS = (
+    'result_df', 'response_data', 'result_hash', 'result_subject_type', 'answer_key', 'archived_exam_id', 'regrade_report',
+    'report_card_job'
+)
+
 # 과목별 안내 메시지
 SUBJECT_INFO_MESSAGES = {
     "국어": """
@@ -108,20 +126,6 @@ SUBJECT_INFO_MESSAGES = {
     """
 }
 
-# reportlab 선택적 import (PDF 기능용)
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-
 # 페이지 설정
 st.set_page_config(
     page_title="자동 채점 시스템",
@@ -159,15 +163,10 @@ st.markdown("---")
 # 사이드바 - 파일 업로드
 with st.sidebar:
     # SN 로고 및 브랜딩 (컴팩트하게)
-    import base64
-
-    # 상대 경로로 로고 파일 로드
-    logo_path = Path(__file__).parent / "public" / "sn-logo.png"
-
-    if logo_path.exists():
-        with open(logo_path, 'rb') as f:
-            logo_data = base64.b64encode(f.read()).decode()
+    # 상대 경로로 로고 파일 로드 (base64 인코딩은 프로세스마다 한 번)
+    logo_data = static_asset_base64(Path(__file__).parent / "public" / "sn-logo.png")
 
+    if logo_data is not None:
         st.markdown(f"""
             <div style='display: flex; align-items: center; margin-bottom: 10px; margin-top: -10px;'>
                 <img src='data:image/png;base64,{logo_data}' width='35' style='margin-right: 8px;'/>
@@ -336,670 +335,145 @@ with st.sidebar:
     st.markdown("---")
     st.subheader("⚙️ 설정")
     debug_mode = st.checkbox("🔧 디버깅 모드", value=False, help="파일 구조 및 채점 과정을 상세히 표시합니다")
+    trace_memory = debug_mode and st.checkbox(
+        "📏 단계별 메모리 측정",
+        value=True,
+        help="디버깅 모드의 단계별 성능 패널에 단계마다 최대 할당 메모리(tracemalloc)를 함께 기록합니다. "
+             "측정하는 동안에는 처리가 느려집니다."
+    )
+    grading_workers = st.number_input(
+        "🧮 과목별 병렬 채점 프로세스 수",
+        min_value=1,
+        max_value=max(os.cpu_count() or 1, DEFAULT_GRADING_WORKERS),
+        value=DEFAULT_GRADING_WORKERS,
+        help=f"여러 과목코드가 섞인 파일을 과목별로 나누어 동시에 채점합니다. "
+             f"1이면 순차 채점하며, {PARALLEL_MIN_ROWS:,}행 미만은 항상 순차 채점합니다. "
+             f"CPU가 여러 개인 환경에서만 빨라집니다."
+    )
+    streaming_mode = st.checkbox(
+        "📦 대용량 스트리밍 채점",
+        value=False,
+        help=f"학생 답안을 {STREAMING_CHUNK_ROWS:,}행씩 나누어 읽으면서 채점합니다. "
+             f"{STREAMING_THRESHOLD_BYTES // (1024 * 1024)}MB보다 큰 파일은 자동으로 적용됩니다."
+    )
 
 
-def setup_korean_font_for_pdf():
-    """PDF 생성을 위한 한글 폰트 설정
-
-    Returns:
-        str: 사용 가능한 폰트 이름 ('Korean' 또는 'Helvetica')
-    """
-    try:
-        # macOS 한글 폰트 (AppleSDGothicNeo)
-        pdfmetrics.registerFont(TTFont('Korean', KOREAN_FONT_PATHS[0], subfontIndex=0))
-        return 'Korean'
-    except:
-        try:
-            # 대체 폰트 (AppleGothic)
-            pdfmetrics.registerFont(TTFont('Korean', KOREAN_FONT_PATHS[1]))
-            return 'Korean'
-        except:
-            # 폰트 로드 실패 시 기본 폰트 사용
-            return 'Helvetica'
-
-
-def setup_korean_font_for_matplotlib():
-    """matplotlib 그래프를 위한 한글 폰트 설정
-
-    matplotlib의 rcParams를 설정하여 한글이 제대로 표시되도록 합니다.
-    """
-    try:
-        plt.rcParams['font.family'] = 'AppleGothic'
-    except:
-        plt.rcParams['font.family'] = 'DejaVu Sans'
-    plt.rcParams['axes.unicode_minus'] = False
-
-
-def load_student_data(file, is_tamgu=False):
-    """학생 답안 파일 로드
+def get_file_hash(file):
+    """업로드된 파일 내용의 SHA-256 해시
 
     Args:
-        file: CSV 또는 Excel 파일 객체
-        is_tamgu: 탐구 과목 여부 (기본값: False)
+        file: Streamlit UploadedFile 또는 파일 객체
 
     Returns:
-        pandas.DataFrame: 학생 답안 데이터
-
-    Raises:
-        UnicodeDecodeError: 인코딩 오류 시
-        pd.errors.EmptyDataError: 빈 파일일 경우
-        Exception: 기타 파일 읽기 오류
+        str: 16진수 해시 문자열
     """
-    # 파일 확장자 확인
-    file_name = file.name.lower() if hasattr(file, 'name') else ''
-    is_excel = file_name.endswith('.xlsx') or file_name.endswith('.xls')
-    
-    try:
-        if is_excel:
-            # Excel 파일 읽기
-            df = pd.read_excel(file, engine='openpyxl')
-        else:
-            # CSV 파일 읽기 - UTF-8 시도
-            df = pd.read_csv(file, encoding='utf-8')
-    except UnicodeDecodeError:
-        # CSV 파일의 경우 UTF-8로 읽기 실패 시 CP949(한글 Windows 인코딩) 시도
-        if not is_excel:
-            try:
-                file.seek(0)  # 파일 포인터를 처음으로 되돌림
-                df = pd.read_csv(file, encoding='cp949')
-            except Exception as e:
-                raise Exception(
-                    f"❌ 파일 인코딩 오류\n\n"
-                    f"원인: UTF-8과 CP949(한글 Windows) 인코딩 모두 실패했습니다.\n\n"
-                    f"해결방법:\n"
-                    f"1. Excel 파일로 저장하거나\n"
-                    f"2. CSV 파일을 Excel에서 다시 저장할 때 'UTF-8' 인코딩 선택\n"
-                    f"3. 메모장에서 '다른 이름으로 저장' → 인코딩을 'UTF-8'로 선택\n\n"
-                    f"상세 오류: {str(e)}"
-                )
-        else:
-            raise Exception(
-                f"❌ Excel 파일 읽기 오류\n\n"
-                f"Excel 파일을 읽는 중 오류가 발생했습니다.\n\n"
-                f"해결방법:\n"
-                f"1. 파일이 올바른 Excel 형식(.xlsx, .xls)인지 확인하세요\n"
-                f"2. 파일이 손상되지 않았는지 확인하세요\n"
-                f"3. 다른 프로그램으로 파일을 열어보세요"
-            )
-    except pd.errors.EmptyDataError:
-        raise Exception(
-            f"❌ 빈 파일 오류\n\n"
-            f"학생 답안 파일이 비어있습니다.\n\n"
-            f"해결방법:\n"
-            f"1. 파일에 데이터가 있는지 확인하세요\n"
-            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
-        )
-    except Exception as e:
-        file_type = "Excel" if is_excel else "CSV"
-        raise Exception(
-            f"❌ 파일 읽기 오류\n\n"
-            f"학생 답안 {file_type} 파일을 읽는 중 오류가 발생했습니다.\n\n"
-            f"해결방법:\n"
-            f"1. {file_type} 파일 형식이 올바른지 확인하세요\n"
-            f"2. 파일이 손상되지 않았는지 확인하세요\n"
-            f"3. 다른 프로그램으로 파일을 열어보세요\n"
-            f"4. Excel 파일인 경우 첫 번째 시트에 데이터가 있는지 확인하세요\n\n"
-            f"상세 오류: {str(e)}"
-        )
-
-    # 기본 컬럼 수 검증
-    if is_tamgu:
-        # 탐구: 최소 3개 컬럼 (수험번호, 과목코드1, 과목코드2) + 40개 문항
-        min_required_cols = ANSWERS_START_COL_IDX + (QUESTIONS_PER_SUBJECT * 2)
-        if len(df.columns) < min_required_cols:
-            raise Exception(
-                f"❌ 탐구 과목 파일 형식 오류\n\n"
-                f"현재 컬럼 수: {len(df.columns)}개\n"
-                f"필요한 최소 컬럼 수: {min_required_cols}개\n"
-                f"(수험번호 + 과목코드1 + 과목코드2 + 40개 문항)\n\n"
-                f"해결방법:\n"
-                f"1. 탐구 샘플 파일을 다운로드하여 형식을 확인하세요\n"
-                f"2. 모든 40개 문항 답안이 입력되었는지 확인하세요\n"
-                f"3. 과목코드1, 과목코드2가 올바르게 입력되었는지 확인하세요"
-            )
+    if hasattr(file, 'getvalue'):
+        data = file.getvalue()
     else:
-        # 일반 과목: 최소 3개 컬럼 (수험번호, 과목코드, 답안 최소 1개)
-        min_required_cols = 3
-        if len(df.columns) < min_required_cols:
-            raise Exception(
-                f"❌ 학생 답안 파일 형식 오류\n\n"
-                f"현재 컬럼 수: {len(df.columns)}개\n"
-                f"필요한 최소 컬럼 수: {min_required_cols}개\n"
-                f"(수험번호 + 과목코드 + 답안 1개 이상)\n\n"
-                f"해결방법:\n"
-                f"1. 샘플 파일을 다운로드하여 형식을 확인하세요\n"
-                f"2. 첫 번째 열: 수험번호, 두 번째 열: 과목코드, 세 번째 열부터: 답안\n"
-                f"3. 헤더 행이 포함되어 있는지 확인하세요"
-            )
-
-    # 데이터 행 존재 확인
-    if len(df) == 0:
-        raise Exception(
-            f"❌ 데이터 없음 오류\n\n"
-            f"파일에 데이터 행이 없습니다. (헤더만 있음)\n\n"
-            f"해결방법:\n"
-            f"1. 학생 답안 데이터가 입력되었는지 확인하세요\n"
-            f"2. 최소 1명 이상의 학생 데이터가 필요합니다"
-        )
-
-    # 탐구 과목인 경우 특수 처리
-    if is_tamgu:
-        # 탐구는 한 행에 2개 과목이 있음
-        # 형식: 수험번호 | 과목코드1 | 과목코드2 | 1~20번(과목1) | 21~40번(과목2)
-        new_rows = []
-
-        # 컬럼 인덱스 범위 검증
-        required_indices = [STUDENT_ID_COL_IDX, SUBJECT_CODE1_COL_IDX, SUBJECT_CODE2_COL_IDX]
-        for idx in required_indices:
-            if idx >= len(df.columns):
-                raise Exception(
-                    f"❌ 탐구 파일 구조 오류\n\n"
-                    f"필요한 컬럼 인덱스 {idx}가 존재하지 않습니다.\n"
-                    f"현재 컬럼 수: {len(df.columns)}개\n\n"
-                    f"해결방법:\n"
-                    f"1. 탐구 샘플 파일 형식을 확인하세요\n"
-                    f"2. 수험번호, 과목코드1, 과목코드2가 모두 있어야 합니다"
-                )
-
-        for idx, row in df.iterrows():
-            student_id = row[df.columns[STUDENT_ID_COL_IDX]]      # 수험번호
-            subject_code1 = row[df.columns[SUBJECT_CODE1_COL_IDX]]  # 과목코드1
-            subject_code2 = row[df.columns[SUBJECT_CODE2_COL_IDX]]  # 과목코드2
-
-            # 첫 번째 과목 (1~20번 문항)
-            row1_data = {'수험번호': student_id, '과목코드': subject_code1}
-            missing_count_1 = 0
-            for i in range(QUESTIONS_PER_SUBJECT):
-                col_idx = ANSWERS_START_COL_IDX + i
-                if col_idx < len(df.columns):
-                    row1_data[f'{i+1}번'] = row[df.columns[col_idx]]
-                else:
-                    missing_count_1 += 1
-
-            if missing_count_1 > 0:
-                raise Exception(
-                    f"❌ 탐구 과목1 답안 누락\n\n"
-                    f"학생 {student_id}의 첫 번째 탐구 과목 답안이 {missing_count_1}개 누락되었습니다.\n"
-                    f"필요: 20개 문항, 현재: {QUESTIONS_PER_SUBJECT - missing_count_1}개\n\n"
-                    f"해결방법:\n"
-                    f"1. 모든 학생의 1~20번 답안을 확인하세요\n"
-                    f"2. 빈칸이 있다면 0 또는 공백으로 채우세요"
-                )
-            new_rows.append(row1_data)
-
-            # 두 번째 과목 (21~40번 문항을 1~20번으로 변환)
-            row2_data = {'수험번호': student_id, '과목코드': subject_code2}
-            missing_count_2 = 0
-            for i in range(QUESTIONS_PER_SUBJECT):
-                col_idx = ANSWERS_START_COL_IDX + QUESTIONS_PER_SUBJECT + i
-                if col_idx < len(df.columns):
-                    row2_data[f'{i+1}번'] = row[df.columns[col_idx]]
-                else:
-                    missing_count_2 += 1
-
-            if missing_count_2 > 0:
-                raise Exception(
-                    f"❌ 탐구 과목2 답안 누락\n\n"
-                    f"학생 {student_id}의 두 번째 탐구 과목 답안이 {missing_count_2}개 누락되었습니다.\n"
-                    f"필요: 20개 문항, 현재: {QUESTIONS_PER_SUBJECT - missing_count_2}개\n\n"
-                    f"해결방법:\n"
-                    f"1. 모든 학생의 21~40번 답안을 확인하세요\n"
-                    f"2. 빈칸이 있다면 0 또는 공백으로 채우세요"
-                )
-            new_rows.append(row2_data)
-
-        # 새로운 DataFrame 생성
-        df = pd.DataFrame(new_rows)
-
-    return df
+        position = file.tell()
+        file.seek(0)
+        data = file.read()
+        file.seek(position)
+    return hashlib.sha256(data).hexdigest()
+
+
+def stage_profiler():
+    """현재 세션의 단계별 측정기 (profiling.StageProfiler, 디버깅 모드에서만 기록)"""
+    if 'stage_profiler' not in st.session_state:
+        st.session_state['stage_profiler'] = StageProfiler(enabled=False)
+    return st.session_state['stage_profiler']
+
+
+# ==================== 파일 로더 캐시 ====================
+# Streamlit은 위젯을 조작할 때마다 스크립트 전체를 다시 실행하므로,
+# 업로드 파일 내용의 해시가 같으면 파싱/검증 결과를 재사용합니다.
+# (인자 이름이 '_'로 시작하면 캐시 키에서 제외됩니다)
+# 캐시된 결과를 돌려줄 때는 함수 본문이 실행되지 않으므로 단계별 측정값도 새로 기록하지 않습니다.
+
+@st.cache_resource(max_entries=LOADER_CACHE_SIZE, show_spinner=False)
+def cached_load_student_data(file_hash, _file, layout=None, _profiler=NULL_PROFILER):
+    """load_student_data 결과를 (파일 해시, 행 구조) 기준으로 캐시"""
+    _file.seek(0)
+    return load_student_data(_file, layout=layout, profiler=_profiler)
+
+
+@st.cache_resource(max_entries=LOADER_CACHE_SIZE, show_spinner=False)
+def cached_load_student_preview(file_hash, _file, layout=None):
+    """스트리밍 채점 미리보기(파일 앞부분)를 (파일 해시, 행 구조) 기준으로 캐시"""
+    return load_student_preview(_file, layout)
+
+
+@st.cache_resource(max_entries=LOADER_CACHE_SIZE, show_spinner=False)
+def cached_load_answer_data(file_hash, _file, _profiler=NULL_PROFILER):
+    """load_answer_data 결과를 파일 해시 기준으로 캐시"""
+    _file.seek(0)
+    with _profiler.stage('정답 읽기') as stage:
+        answer_df = load_answer_data(_file)
+        stage.rows = len(answer_df)
+    return answer_df
+
+
+@st.cache_resource(max_entries=LOADER_CACHE_SIZE, show_spinner=False)
+def cached_load_student_info(file_hash, _file, _profiler=NULL_PROFILER):
+    """load_student_info 결과를 파일 해시 기준으로 캐시"""
+    _file.seek(0)
+    with _profiler.stage('학생 정보 읽기') as stage:
+        student_info_dict = load_student_info(_file)
+        stage.rows = len(student_info_dict['by_student_id'])
+    return student_info_dict
 
 
-def load_answer_data(file):
-    """정답/배점 파일 로드
+# ==================== 다운로드 파일 생성 ====================
+# 다운로드 파일은 화면을 그릴 때가 아니라 버튼을 눌렀을 때 만들고,
+# (결과 해시, 과목, 형식) 기준으로 재사용합니다.
 
-    Args:
-        file: CSV 또는 Excel 파일 객체
+def get_result_hash(result_df):
+    """채점 결과 DataFrame 내용의 SHA-256 해시"""
+    row_hashes = pd.util.hash_pandas_object(result_df, index=True).to_numpy()
+    column_names = '|'.join(map(str, result_df.columns)).encode()
+    return hashlib.sha256(row_hashes.tobytes() + column_names).hexdigest()
 
-    Returns:
-        pandas.DataFrame: 정답 및 배점 데이터
 
-    Raises:
-        UnicodeDecodeError: 인코딩 오류 시
-        pd.errors.EmptyDataError: 빈 파일일 경우
-        Exception: 기타 파일 읽기 오류
-    """
-    # 파일 확장자 확인
-    file_name = file.name.lower() if hasattr(file, 'name') else ''
-    is_excel = file_name.endswith('.xlsx') or file_name.endswith('.xls')
-    
-    try:
-        if is_excel:
-            # Excel 파일 읽기
-            df = pd.read_excel(file, engine='openpyxl')
-        else:
-            # CSV 파일 읽기 - UTF-8 시도
-            df = pd.read_csv(file, encoding='utf-8')
-    except UnicodeDecodeError:
-        # CSV 파일의 경우 UTF-8로 읽기 실패 시 CP949(한글 Windows 인코딩) 시도
-        if not is_excel:
-            try:
-                file.seek(0)  # 파일 포인터를 처음으로 되돌림
-                df = pd.read_csv(file, encoding='cp949')
-            except Exception as e:
-                raise Exception(
-                    f"❌ 파일 인코딩 오류\n\n"
-                    f"원인: UTF-8과 CP949(한글 Windows) 인코딩 모두 실패했습니다.\n\n"
-                    f"해결방법:\n"
-                    f"1. Excel 파일로 저장하거나\n"
-                    f"2. CSV 파일을 Excel에서 다시 저장할 때 'UTF-8' 인코딩 선택\n"
-                    f"3. 메모장에서 '다른 이름으로 저장' → 인코딩을 'UTF-8'로 선택\n\n"
-                    f"상세 오류: {str(e)}"
-                )
-        else:
-            raise Exception(
-                f"❌ Excel 파일 읽기 오류\n\n"
-                f"Excel 파일을 읽는 중 오류가 발생했습니다.\n\n"
-                f"해결방법:\n"
-                f"1. 파일이 올바른 Excel 형식(.xlsx, .xls)인지 확인하세요\n"
-                f"2. 파일이 손상되지 않았는지 확인하세요\n"
-                f"3. 다른 프로그램으로 파일을 열어보세요"
-            )
-    except pd.errors.EmptyDataError:
-        raise Exception(
-            f"❌ 빈 파일 오류\n\n"
-            f"정답/배점 파일이 비어있습니다.\n\n"
-            f"해결방법:\n"
-            f"1. 파일에 데이터가 있는지 확인하세요\n"
-            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
-        )
-    except Exception as e:
-        file_type = "Excel" if is_excel else "CSV"
-        raise Exception(
-            f"❌ 파일 읽기 오류\n\n"
-            f"정답/배점 {file_type} 파일을 읽는 중 오류가 발생했습니다.\n\n"
-            f"해결방법:\n"
-            f"1. {file_type} 파일 형식이 올바른지 확인하세요\n"
-            f"2. 파일이 손상되지 않았는지 확인하세요\n"
-            f"3. 다른 프로그램으로 파일을 열어보세요\n"
-            f"4. Excel 파일인 경우 첫 번째 시트에 데이터가 있는지 확인하세요\n\n"
-            f"상세 오류: {str(e)}"
-        )
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def build_export(result_hash, subject, file_format, _build, _profiler=NULL_PROFILER, _rows=0):
+    """다운로드 파일 내용 생성 (같은 결과/과목/형식이면 캐시된 내용 반환)"""
+    stage = f"내보내기 · {file_format}" if subject == 'None' else f"내보내기 · {file_format} ({subject})"
+    with _profiler.stage(stage, rows=_rows):
+        return _build()
 
-    # 컬럼 수 검증 (최소 4개: 과목번호, 문항, 정답, 배점)
-    if len(df.columns) < 4:
-        raise Exception(
-            f"❌ 정답/배점 파일 형식 오류\n\n"
-            f"현재 컬럼 수: {len(df.columns)}개\n"
-            f"필요한 컬럼 수: 4개 (과목번호, 문항, 정답, 배점)\n\n"
-            f"해결방법:\n"
-            f"1. 샘플 파일을 다운로드하여 형식을 확인하세요\n"
-            f"2. 필수 컬럼: 과목번호 | 문항 | 정답 | 배점\n"
-            f"3. 현재 컬럼: {', '.join(df.columns.tolist())}"
-        )
 
-    # 데이터 행 존재 확인
-    if len(df) == 0:
-        raise Exception(
-            f"❌ 데이터 없음 오류\n\n"
-            f"정답/배점 파일에 데이터 행이 없습니다. (헤더만 있음)\n\n"
-            f"해결방법:\n"
-            f"1. 정답 및 배점 데이터가 입력되었는지 확인하세요\n"
-            f"2. 최소 1개 이상의 문항 정답이 필요합니다"
-        )
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def cached_item_analysis(result_hash, subject, _result_df, _response_data, _answer_key, _profiler=NULL_PROFILER):
+    """과목별 문항 분석표 (같은 채점 결과/과목이면 캐시된 결과 반환)"""
+    with _profiler.stage(f"문항 분석 · {subject}", rows=len(_response_data[subject].rows)):
+        return analyze_subject(_result_df, _response_data, _answer_key, subject)
 
-    # 배점 컬럼 유효성 검사 (숫자로 변환 가능한지)
-    points_col = df.columns[3]  # 네 번째 컬럼이 배점
-    invalid_rows = []
-    for idx, value in enumerate(df[points_col]):
-        try:
-            float(value)
-        except (ValueError, TypeError):
-            invalid_rows.append(idx + 2)  # +2는 헤더 포함 및 1-based 인덱싱
-
-    if invalid_rows:
-        raise Exception(
-            f"❌ 배점 데이터 형식 오류\n\n"
-            f"배점 컬럼에 숫자가 아닌 값이 있습니다.\n"
-            f"문제가 있는 행: {', '.join(map(str, invalid_rows[:5]))}"
-            f"{'...' if len(invalid_rows) > 5 else ''}\n\n"
-            f"해결방법:\n"
-            f"1. 배점 컬럼(4번째 컬럼)에 숫자만 입력하세요\n"
-            f"2. 빈칸, 문자, 특수문자가 있는지 확인하세요\n"
-            f"3. 소수점은 점(.)으로 표시하세요 (예: 2.5)"
-        )
 
-    return df
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def cached_score_conversion(result_hash, subject_type, _result_df, _profiler=NULL_PROFILER):
+    """전체 과목 표준점수/백분위/등급과 등급컷 표 (같은 채점 결과면 캐시된 결과 반환)"""
+    with _profiler.stage('표준점수 환산', rows=len(_result_df)):
+        return convert_scores(_result_df, STANDARD_SCORE_SCALES.get(subject_type, DEFAULT_STANDARD_SCORE_SCALE))
 
 
-def load_student_info(file):
-    """학생 정보 파일 로드
+def deferred_export(result_hash, subject, file_format, build, rows=0):
+    """download_button의 data로 넘길 지연 생성 함수
 
     Args:
-        file: CSV 또는 Excel 파일 객체
+        result_hash: get_result_hash의 결과
+        subject: 과목코드 (전체 결과는 None)
+        file_format: 파일 종류 (예: 'results.xlsx', 'wrong.csv')
+        build: 인자 없이 bytes를 반환하는 함수
+        rows: 내보내는 채점 결과 행 수 (단계별 성능 패널의 처리량 계산용)
 
     Returns:
-        dict: 3가지 방식으로 매칭 가능한 학생 정보 딕셔너리
-            - by_full: 학번+전화번호로 매칭
-            - by_student_id: 학번으로 매칭
-            - by_phone: 전화번호로 매칭
-
-    Raises:
-        UnicodeDecodeError: 인코딩 오류 시
-        pd.errors.EmptyDataError: 빈 파일일 경우
-        Exception: 기타 파일 읽기 오류
+        callable: 다운로드 버튼을 눌렀을 때만 build를 실행하는 함수
     """
-    # 파일 확장자 확인
-    file_name = file.name.lower() if hasattr(file, 'name') else ''
-    is_excel = file_name.endswith('.xlsx') or file_name.endswith('.xls')
-    
-    try:
-        if is_excel:
-            # Excel 파일 읽기
-            df = pd.read_excel(file, engine='openpyxl')
-        else:
-            # CSV 파일 읽기 - UTF-8 시도
-            df = pd.read_csv(file, encoding='utf-8')
-    except UnicodeDecodeError:
-        # CSV 파일의 경우 UTF-8로 읽기 실패 시 CP949(한글 Windows 인코딩) 시도
-        if not is_excel:
-            try:
-                file.seek(0)  # 파일 포인터를 처음으로 되돌림
-                df = pd.read_csv(file, encoding='cp949')
-            except Exception as e:
-                raise Exception(
-                    f"❌ 파일 인코딩 오류\n\n"
-                    f"원인: UTF-8과 CP949(한글 Windows) 인코딩 모두 실패했습니다.\n\n"
-                    f"해결방법:\n"
-                    f"1. Excel 파일로 저장하거나\n"
-                    f"2. CSV 파일을 Excel에서 다시 저장할 때 'UTF-8' 인코딩 선택\n"
-                    f"3. 메모장에서 '다른 이름으로 저장' → 인코딩을 'UTF-8'로 선택\n\n"
-                    f"상세 오류: {str(e)}"
-                )
-        else:
-            raise Exception(
-                f"❌ Excel 파일 읽기 오류\n\n"
-                f"Excel 파일을 읽는 중 오류가 발생했습니다.\n\n"
-                f"해결방법:\n"
-                f"1. 파일이 올바른 Excel 형식(.xlsx, .xls)인지 확인하세요\n"
-                f"2. 파일이 손상되지 않았는지 확인하세요\n"
-                f"3. 다른 프로그램으로 파일을 열어보세요"
-            )
-    except pd.errors.EmptyDataError:
-        raise Exception(
-            f"❌ 빈 파일 오류\n\n"
-            f"학생 정보 파일이 비어있습니다.\n\n"
-            f"해결방법:\n"
-            f"1. 파일에 데이터가 있는지 확인하세요\n"
-            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
-        )
-    except Exception as e:
-        file_type = "Excel" if is_excel else "CSV"
-        raise Exception(
-            f"❌ 파일 읽기 오류\n\n"
-            f"학생 정보 {file_type} 파일을 읽는 중 오류가 발생했습니다.\n\n"
-            f"해결방법:\n"
-            f"1. {file_type} 파일 형식이 올바른지 확인하세요\n"
-            f"2. 파일이 손상되지 않았는지 확인하세요\n"
-            f"3. 다른 프로그램으로 파일을 열어보세요\n"
-            f"4. Excel 파일인 경우 첫 번째 시트에 데이터가 있는지 확인하세요\n\n"
-            f"상세 오류: {str(e)}"
-        )
-
-    # 컬럼 수 검증 (최소 3개: 학번, 전화번호, 이름)
-    if len(df.columns) < 3:
-        raise Exception(
-            f"❌ 학생 정보 파일 형식 오류\n\n"
-            f"현재 컬럼 수: {len(df.columns)}개\n"
-            f"필요한 컬럼 수: 3개 (학번, 전화번호, 이름)\n\n"
-            f"해결방법:\n"
-            f"1. 샘플 파일을 다운로드하여 형식을 확인하세요\n"
-            f"2. 필수 컬럼: 학번 | 전화번호 | 이름\n"
-            f"3. 현재 컬럼: {', '.join(df.columns.tolist())}"
-        )
-
-    # 데이터 행 존재 확인
-    if len(df) == 0:
-        raise Exception(
-            f"❌ 데이터 없음 오류\n\n"
-            f"학생 정보 파일에 데이터 행이 없습니다. (헤더만 있음)\n\n"
-            f"해결방법:\n"
-            f"1. 학생 정보 데이터가 입력되었는지 확인하세요\n"
-            f"2. 최소 1명 이상의 학생 정보가 필요합니다"
-        )
-
-    # 학번, 전화번호, 이름 저장 (3가지 방식으로 매칭 가능하도록)
-    student_info_dict = {
-        'by_full': {},      # 학번+전화번호 (완전 매칭)
-        'by_student_id': {},  # 학번으로 매칭
-        'by_phone': {}      # 전화번호로 매칭
-    }
-
-    # 컬럼 인덱스 범위 검증 및 데이터 처리
-    skipped_rows = []
-    valid_count = 0
-
-    for idx, row in df.iterrows():
-        try:
-            # 학번과 이름이 모두 비어있으면 빈 행으로 간주하고 건너뛰기
-            is_student_num_empty = pd.isna(row[df.columns[0]]) or str(row[df.columns[0]]).strip() == ''
-            is_name_empty = pd.isna(row[df.columns[2]]) or str(row[df.columns[2]]).strip() == ''
-
-            # 둘 다 비어있으면 건너뛰기 (완전히 빈 행)
-            if is_student_num_empty and is_name_empty:
-                skipped_rows.append(idx + 2)
-                continue
-
-            # 학번이나 이름 중 하나만 비어있으면 경고하고 건너뛰기
-            if is_student_num_empty:
-                skipped_rows.append(idx + 2)
-                continue
-
-            if is_name_empty:
-                skipped_rows.append(idx + 2)
-                continue
-
-            student_num = str(row[df.columns[0]])  # 학번
-            phone = str(row[df.columns[1]]) if not pd.isna(row[df.columns[1]]) else ''  # 전화번호 (선택)
-            name = str(row[df.columns[2]])  # 이름
-
-            full_id = student_num + phone  # 학번 + 전화번호
-
-            info = {
-                '학번': student_num,
-                '전화번호': phone,
-                '이름': name
-            }
+    # 버튼을 누르면 스크립트 밖(다운로드 요청)에서 실행되므로 측정기는 지금 넘겨 둠
+    return functools.partial(build_export, result_hash, str(subject), file_format, build, stage_profiler(), rows)
 
-            # 3가지 방식으로 저장
-            student_info_dict['by_full'][full_id] = info
-            student_info_dict['by_student_id'][student_num] = info
-            if phone:  # 전화번호가 있을 때만 저장
-                student_info_dict['by_phone'][phone] = info
-
-            valid_count += 1
-
-        except IndexError:
-            # 컬럼이 부족한 행은 건너뛰기
-            skipped_rows.append(idx + 2)
-            continue
-
-    # 건너뛴 행이 있으면 경고 표시 (Streamlit import 필요)
-    if skipped_rows and len(skipped_rows) > 0:
-        import streamlit as st
-        if len(skipped_rows) <= 5:
-            st.warning(
-                f"⚠️ 학생 정보 파일 일부 행 건너뛰기\n\n"
-                f"건너뛴 행: {', '.join(map(str, skipped_rows))}\n"
-                f"(학번 또는 이름이 비어있거나 컬럼이 부족함)\n\n"
-                f"유효한 학생 정보: {valid_count}명"
-            )
-        else:
-            st.warning(
-                f"⚠️ 학생 정보 파일 일부 행 건너뛰기\n\n"
-                f"건너뛴 행 수: {len(skipped_rows)}개\n"
-                f"첫 5개 행: {', '.join(map(str, skipped_rows[:5]))}\n"
-                f"(학번 또는 이름이 비어있거나 컬럼이 부족함)\n\n"
-                f"유효한 학생 정보: {valid_count}명"
-            )
-
-    return student_info_dict
-
-
-def generate_subject_pdf_report(subject, subject_df, subject_label):
-    """과목별 PDF 리포트 생성"""
-    if not REPORTLAB_AVAILABLE:
-        return None
-    
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), 
-                           rightMargin=30, leftMargin=30, 
-                           topMargin=30, bottomMargin=30)
-    
-    # 스토리 (PDF 내용)
-    story = []
-
-    # 한글 폰트 설정
-    font_name = setup_korean_font_for_pdf()
-
-    # 스타일 정의
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName=font_name
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName=font_name
-    )
-    
-    # 제목
-    title_text = f"{subject} 과목 채점 리포트"
-    if font_name == 'Helvetica':
-        title_text = f"{subject} Subject Report"  # 폰트 실패 시 영문으로
-    story.append(Paragraph(title_text, title_style))
-    story.append(Spacer(1, 0.2*inch))
-    
-    # 1. 기본 통계
-    story.append(Paragraph("1. Basic Statistics" if font_name == 'Helvetica' else "1. 기본 통계", heading_style))
-    
-    stats_data = [
-        ['Item' if font_name == 'Helvetica' else '항목', 'Value' if font_name == 'Helvetica' else '값'],
-        ['Students' if font_name == 'Helvetica' else '인원', f"{len(subject_df)}"],
-        ['Average' if font_name == 'Helvetica' else '평균 점수', f"{subject_df['총점'].mean():.1f}"],
-        ['Std Dev' if font_name == 'Helvetica' else '표준편차', f"{subject_df['총점'].std():.2f}"],
-        ['Max Score' if font_name == 'Helvetica' else '최고 점수', f"{subject_df['총점'].max()}"],
-        ['Min Score' if font_name == 'Helvetica' else '최저 점수', f"{subject_df['총점'].min()}"],
-    ]
-    
-    stats_table = Table(stats_data, colWidths=[3*inch, 3*inch])
-    stats_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), font_name),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('FONTSIZE', (0, 1), (-1, -1), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
-    ]))
-    story.append(stats_table)
-    story.append(Spacer(1, 0.3*inch))
-    
-    # 2. 점수 분포
-    story.append(Paragraph("2. Score Distribution" if font_name == 'Helvetica' else "2. 점수 분포 (10점 단위)", heading_style))
-    
-    # 점수 분포 계산
-    bins = list(range(0, 101, 10))
-    labels = [f"{i}-{i+9}" for i in range(0, 100, 10)]
-    subject_df_temp = subject_df.copy()
-    subject_df_temp['점수구간'] = pd.cut(subject_df_temp['총점'], bins=bins, labels=labels, include_lowest=True)
-    score_dist = subject_df_temp['점수구간'].value_counts().sort_index()
-    
-    # 점수 분포 테이블
-    dist_data = [['Score Range' if font_name == 'Helvetica' else '점수 구간', 'Students' if font_name == 'Helvetica' else '학생 수', 'Ratio' if font_name == 'Helvetica' else '비율']]
-    for idx, count in score_dist.items():
-        ratio = f"{(count / len(subject_df) * 100):.1f}%"
-        dist_data.append([str(idx), str(count), ratio])
-    
-    dist_table = Table(dist_data, colWidths=[2*inch, 2*inch, 2*inch])
-    dist_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2ecc71')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, -1), font_name),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
-    ]))
-    story.append(dist_table)
-    story.append(Spacer(1, 0.3*inch))
-    
-    # 3. 오답 분석
-    story.append(Paragraph("3. Wrong Answer Analysis" if font_name == 'Helvetica' else "3. 오답 분석", heading_style))
-    
-    # 오답 번호 파싱
-    wrong_question_counts = {}
-    for idx, row in subject_df.iterrows():
-        wrong_nums = row['오답번호']
-        if wrong_nums and wrong_nums != '없음':
-            for num_str in str(wrong_nums).split(','):
-                try:
-                    num = int(num_str.strip())
-                    wrong_question_counts[num] = wrong_question_counts.get(num, 0) + 1
-                except:
-                    pass
-    
-    if wrong_question_counts:
-        sorted_wrong = sorted(wrong_question_counts.items(), key=lambda x: x[1], reverse=True)[:15]
-        
-        wrong_data = [['Question No.' if font_name == 'Helvetica' else '문항 번호', 
-                       'Wrong Count' if font_name == 'Helvetica' else '오답 인원', 
-                       'Wrong Rate' if font_name == 'Helvetica' else '오답률']]
-        for q_num, count in sorted_wrong:
-            rate = f"{(count / len(subject_df) * 100):.1f}%"
-            wrong_data.append([str(q_num), str(count), rate])
-        
-        wrong_table = Table(wrong_data, colWidths=[2*inch, 2*inch, 2*inch])
-        wrong_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e74c3c')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
-        ]))
-        story.append(wrong_table)
-    else:
-        no_wrong_text = "All students answered correctly!" if font_name == 'Helvetica' else "모든 학생이 전 문항을 맞췄습니다!"
-        story.append(Paragraph(no_wrong_text, styles['Normal']))
-    
-    # PDF 생성
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
 
-
-def display_subject_statistics(subject_df, subject_code, result_df=None, subject_name=None):
+def display_subject_statistics(subject_df, subject_code, result_df=None, subject_name=None, response_data=None, result_hash=None, answer_key=None, grade_cuts=None):
     """과목별 상세 통계를 표시하는 공통 함수
 
     Args:
@@ -1007,6 +481,10 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
         subject_code: 과목 코드 (str)
         result_df: 전체 결과 DataFrame (오답 CSV 다운로드용, optional)
         subject_name: 과목명 (str, optional) - 다운로드 파일명에 사용
+        response_data: 문항별 채점 결과 (grading.ResponseData) - 오답 분석 및 오답번호 표시용
+        result_hash: 채점 결과 해시 (다운로드 파일 캐시 키)
+        answer_key: 채점에 사용한 정답 (grading.AnswerKey, optional) - 문항 분석용
+        grade_cuts: 등급컷 표 (standard_scores.grade_cut_table, optional)
     """
     # 과목명이 제공되지 않으면 과목코드를 사용
     if subject_name is None:
@@ -1097,26 +575,35 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
         chart_data = dist_df.set_index('점수 구간')['학생 수']
         st.bar_chart(chart_data)
 
+    # 등급컷 (표준점수 기준 상위 누적 비율, 동점자는 상위 등급)
+    if grade_cuts is not None:
+        st.markdown("---")
+        st.subheader("🎯 등급컷")
+        st.caption(
+            "1~8등급 상위 누적 비율: " + ", ".join(f"{ratio:.0%}" for ratio in GRADE_CUMULATIVE_RATIOS)
+            + " · 컷은 해당 등급 최저 점수 (동점자는 모두 상위 등급)"
+        )
+        st.dataframe(
+            grade_cuts,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                '원점수 컷': st.column_config.NumberColumn('원점수 컷', format='%g'),
+                '표준점수 컷': st.column_config.NumberColumn('표준점수 컷', format='%d'),
+                '비율': st.column_config.NumberColumn('비율', format='%.1f%%'),
+                '누적 비율': st.column_config.NumberColumn('누적 비율', format='%.1f%%'),
+            }
+        )
+
     # 오답 분석
     st.markdown("---")
     st.subheader("🔍 오답 분석")
 
-    # 오답 번호를 파싱하여 각 문항별 오답 개수 계산
-    wrong_question_counts = {}
-    for idx, row in subject_df.iterrows():
-        wrong_nums = row['오답번호']
-        if wrong_nums and wrong_nums != '없음':
-            for num_str in wrong_nums.split(','):
-                try:
-                    num = int(num_str.strip())
-                    wrong_question_counts[num] = wrong_question_counts.get(num, 0) + 1
-                except:
-                    pass
-
-    if wrong_question_counts:
-        # 오답이 많은 순으로 정렬
-        sorted_wrong = sorted(wrong_question_counts.items(), key=lambda x: x[1], reverse=True)
+    # 문항별 오답 인원 (정답 여부 행렬의 열 합, 오답이 많은 순)
+    subject_responses = response_data[subject_code]
+    all_wrong_df = cached_wrong_distribution(result_hash, subject_code, subject_responses, stage_profiler())
 
+    if len(all_wrong_df) > 0:
         # 상위 10개 문항 표시
         st.write("**오답이 많은 문항 TOP 10**")
 
@@ -1124,23 +611,19 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
 
         with col1:
             # 표로 표시
-            top_10 = sorted_wrong[:10]
-            df_wrong = pd.DataFrame(top_10, columns=['문항 번호', '오답 인원'])
-            df_wrong['오답률'] = (df_wrong['오답 인원'] / len(subject_df) * 100).round(1).astype(str) + '%'
+            df_wrong = all_wrong_df.head(10)
             st.dataframe(df_wrong, use_container_width=True, hide_index=True)
 
         with col2:
             # 바 차트로 시각화
             chart_data = pd.DataFrame({
-                '문항': [f"{q}번" for q, _ in sorted_wrong[:10]],
-                '오답 인원': [count for _, count in sorted_wrong[:10]]
+                '문항': [f"{q}번" for q in df_wrong['문항 번호']],
+                '오답 인원': df_wrong['오답 인원'].to_numpy()
             })
             st.bar_chart(chart_data.set_index('문항'))
 
         # 전체 오답 분포
         with st.expander("📊 전체 문항별 오답 분포 보기"):
-            all_wrong_df = pd.DataFrame(sorted_wrong, columns=['문항 번호', '오답 인원'])
-            all_wrong_df['오답률'] = (all_wrong_df['오답 인원'] / len(subject_df) * 100).round(1).astype(str) + '%'
             st.dataframe(all_wrong_df, use_container_width=True, hide_index=True)
 
             # 오답 분포 다운로드 (Excel 및 CSV)
@@ -1148,13 +631,10 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
             
             with col1_wrong:
                 # Excel 형식 다운로드 (한글 깨짐 방지)
-                wrong_excel_buffer = io.BytesIO()
-                with pd.ExcelWriter(wrong_excel_buffer, engine='openpyxl') as writer:
-                    all_wrong_df.to_excel(writer, sheet_name='오답분포', index=False)
-                wrong_excel_buffer.seek(0)
                 st.download_button(
                     label=f"📥 {subject_name} 오답 분포 Excel 다운로드 (권장)",
-                    data=wrong_excel_buffer,
+                    data=deferred_export(result_hash, subject_code, 'wrong.xlsx',
+                                         lambda: to_excel_bytes({'오답분포': all_wrong_df}), rows=len(subject_df)),
                     file_name=f"{subject_name}_오답분포_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                     use_container_width=True,
@@ -1163,10 +643,10 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
             
             with col2_wrong:
                 # CSV 형식 다운로드
-                wrong_csv = all_wrong_df.to_csv(index=False, encoding='utf-8-sig')
                 st.download_button(
                     label=f"📥 {subject_name} 오답 분포 CSV 다운로드",
-                    data=wrong_csv,
+                    data=deferred_export(result_hash, subject_code, 'wrong.csv',
+                                         lambda: to_csv_bytes(all_wrong_df), rows=len(subject_df)),
                     file_name=f"{subject_name}_오답분포_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv",
                     use_container_width=True,
@@ -1175,7 +655,52 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
     else:
         st.info("모든 학생이 전 문항을 맞췄습니다! 🎉")
 
-    # 과목별 채점 결과 다운로드
+    # 문항 분석 (선택지 분포, 정답률, 변별도, 점이연상관)
+    item_analysis_df = None
+    if answer_key is not None and result_df is not None:
+        st.markdown("---")
+        st.subheader("📐 문항 분석")
+        st.caption(
+            f"정답률: 정답 인원 비율 · 변별도: 총점 상위 {GROUP_RATIO:.0%} 정답률 - 하위 {GROUP_RATIO:.0%} 정답률 · "
+            f"점이연상관: 문항 정답 여부와 총점의 상관계수 (변별도/점이연상관이 0 이하이면 검토 필요)"
+        )
+        item_analysis_df = cached_item_analysis(
+            result_hash, subject_code, result_df, response_data, answer_key, stage_profiler()
+        )
+        st.dataframe(
+            item_analysis_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                '정답률': st.column_config.NumberColumn('정답률', format='%.2f'),
+                '변별도': st.column_config.NumberColumn('변별도', format='%.2f'),
+                '점이연상관': st.column_config.NumberColumn('점이연상관', format='%.2f'),
+            }
+        )
+
+        col1_item, col2_item = st.columns(2)
+        with col1_item:
+            st.download_button(
+                label=f"📥 {subject_name} 문항 분석 Excel 다운로드 (권장)",
+                data=deferred_export(result_hash, subject_code, 'items.xlsx',
+                                     lambda: to_excel_bytes({'문항분석': item_analysis_df.round(3)}), rows=len(subject_df)),
+                file_name=f"{subject_name}_문항분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+                key=f"items_excel_{subject_code}"
+            )
+        with col2_item:
+            st.download_button(
+                label=f"📥 {subject_name} 문항 분석 CSV 다운로드",
+                data=deferred_export(result_hash, subject_code, 'items.csv',
+                                     lambda: to_csv_bytes(item_analysis_df.round(3)), rows=len(subject_df)),
+                file_name=f"{subject_name}_문항분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key=f"items_csv_{subject_code}"
+            )
+
+    # 과목별 채점 결과 다운로드 (오답번호는 내보낼 때 생성)
     st.markdown("---")
     st.subheader("💾 이 과목 결과 다운로드")
 
@@ -1183,13 +708,10 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
 
     with col1:
         # Excel 형식 다운로드 (한글 깨짐 방지)
-        excel_buffer = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            subject_df.to_excel(writer, sheet_name='채점결과', index=False)
-        excel_buffer.seek(0)
         st.download_button(
             label=f"📥 Excel 다운로드 (권장)",
-            data=excel_buffer,
+            data=deferred_export(result_hash, subject_code, 'results.xlsx',
+                                 lambda: to_excel_bytes({'채점결과': iter_result_chunks(subject_df, response_data)}), rows=len(subject_df)),
             file_name=f"{subject_name}_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True,
@@ -1198,10 +720,10 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
 
     with col2:
         # CSV 형식 다운로드
-        subject_csv = subject_df.to_csv(index=False, encoding='utf-8-sig')
         st.download_button(
             label=f"📥 CSV 다운로드",
-            data=subject_csv,
+            data=deferred_export(result_hash, subject_code, 'results.csv',
+                                 lambda: to_csv_bytes(iter_result_chunks(subject_df, response_data)), rows=len(subject_df)),
             file_name=f"{subject_name}_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
             mime="text/csv",
             use_container_width=True,
@@ -1212,27 +734,35 @@ def display_subject_statistics(subject_df, subject_code, result_df=None, subject
     st.markdown("---")
     if REPORTLAB_AVAILABLE:
         # 고유한 키 생성을 위해 subject_code 사용
-        button_key = f"pdf_{subject_code}_{id(subject_df)}"
+        button_key = f"pdf_{subject_code}"
         if st.button(f"📄 PDF 리포트 생성", key=button_key, use_container_width=True):
-            with st.spinner("PDF 생성 중..."):
-                pdf_buffer = generate_subject_pdf_report(subject_name, subject_df, subject_code)
+            with st.spinner("PDF 생성 중..."), stage_profiler().stage(f"PDF 렌더링 · {subject_code}", rows=len(subject_df)):
+                pdf_bytes = render_service().render(
+                    'subject_pdf', subject_name,
+                    subject_report_aggregates(subject_df, subject_responses, item_analysis_df)
+                )
                 st.download_button(
                     label=f"📥 PDF 다운로드",
-                    data=pdf_buffer,
+                    data=pdf_bytes,
                     file_name=f"{subject_name}_리포트_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
                     mime="application/pdf",
                     use_container_width=True,
-                    key=f"pdf_download_{subject_code}_{id(subject_df)}"
+                    key=f"pdf_download_{subject_code}"
                 )
             st.success("✅ PDF가 생성되었습니다!")
     else:
         st.info("📄 PDF 기능을 사용하려면 reportlab을 설치하세요.\n\n`pip install reportlab`")
 
 
-def grade_students(student_df, answer_df, student_info_dict=None, subject_code_mapping=None, debug_mode=False):
-    """채점 수행"""
-    results = []
-    
+def grade_students(student_df, answer_df, student_info_dict=None, subject_code_mapping=None, debug_mode=False, answer_key=None, workers=None, profiler=NULL_PROFILER):
+    """채점 수행
+
+    과목코드별 응답 행렬을 정답 벡터와 한 번에 비교하는 채점 엔진(grading.grade_frame)을
+    호출하고, 오류/경고 및 디버깅 정보를 화면에 표시합니다.
+    answer_key가 주어지지 않으면 answer_df로부터 컴파일합니다.
+    workers가 2 이상이면 과목코드별로 나누어 프로세스 풀에서 동시에 채점합니다.
+    profiler에는 정답 컴파일, 채점, 학생 정보 매칭 단계를 기록합니다.
+    """
     # 디버깅 모드일 때만 파일 구조 표시
     if debug_mode:
         with st.expander("🔍 파일 구조 확인 (디버깅)", expanded=True):
@@ -1249,208 +779,675 @@ def grade_students(student_df, answer_df, student_info_dict=None, subject_code_m
             st.write(f"- 3번째 열 (columns[2]): **{answer_df.columns[2]}** ← 정답")
             st.write(f"- 4번째 열 (columns[3]): **{answer_df.columns[3]}** ← 배점")
     
-    # 첫 번째와 두 번째 열은 수험번호, 과목코드
-    id_col = student_df.columns[0]
-    subject_col = student_df.columns[1]
-    
-    # 정답 데이터를 과목별로 그룹화
-    answer_dict = {}
-    for subject in answer_df[answer_df.columns[0]].unique():
-        subject_answers = answer_df[answer_df[answer_df.columns[0]] == subject]
-        # 문항 번호 순으로 정렬
-        subject_answers = subject_answers.sort_values(by=subject_answers.columns[1])
-        answer_dict[subject] = {
-            'answers': subject_answers[subject_answers.columns[2]].tolist(),
-            'points': subject_answers[subject_answers.columns[3]].tolist()
-        }
+    # 정답 데이터를 과목별로 컴파일
+    if answer_key is None:
+        answer_key = compile_answer_key(answer_df, profiler=profiler)
     
     # 디버깅: 정답 데이터 확인
     if debug_mode:
         with st.expander("🔍 정답 데이터 구조 (디버깅)", expanded=False):
-            for subj, data in answer_dict.items():
+            for subj, subject_key in answer_key.subjects.items():
                 st.info(f"📚 **과목코드: {subj}**")
-                st.write(f"- 문항 수: {len(data['answers'])}개")
-                st.write(f"- 정답 (1~5번): {data['answers'][:5]}")
-                st.write(f"- 배점 (1~5번): {data['points'][:5]}")
-                try:
-                    total = sum([float(p) for p in data['points']])
-                    st.write(f"- ✅ **만점: {int(total)}점**")
-                except:
-                    st.error(f"- ❌ 배점 합계 계산 오류: {data['points']}")
+                st.write(f"- 문항 수: {subject_key.total_questions}개")
+                st.write(f"- 정답 (1~5번): {subject_key.answers[:5]}")
+                st.write(f"- 배점 (1~5번): {subject_key.points_raw[:5]}")
+                st.write(f"- ✅ **만점: {int(subject_key.max_score)}점**")
                 st.write("---")
     
-    # 디버깅 모드일 때 학생별 채점 과정 표시
+    # 과목코드별 행렬 채점
+    result_df, response_data, issues = grade_frame(
+        student_df, answer_key, student_info_dict, subject_code_mapping, workers, profiler
+    )
+    
+    for level, message in issues:
+        getattr(st, level)(message)
+    
+    # 디버깅 모드일 때 학생별 채점 결과 표시
     if debug_mode:
-        debug_expander = st.expander("🔍 학생별 채점 과정 (디버깅)", expanded=False)
+        with st.expander("🔍 학생별 채점 과정 (디버깅)", expanded=False):
+            # 결과 행은 정답이 있는 과목코드의 학생 답안 행과 같은 순서
+            graded_rows = student_df[student_df[student_df.columns[1]].isin(list(answer_key.keys()))]
+            for (_, student_row), (_, row) in zip(graded_rows.iterrows(), result_df.iterrows()):
+                subject = row['과목코드']
+                student_answers = student_row.iloc[2:].tolist()
+                st.success(f"👤 **학생 {row['수험번호']} - 과목코드: {subject}로 채점**")
+                st.write(f"- 학생 답안 (1~5번): {student_answers[:5]}")
+                st.write(f"- 정답 (1~5번): {answer_key[subject].answers[:5]}")
+                st.write(f"✅ **채점 완료** - 총점: **{row['총점']}점** / 만점: **{row['만점']}점** / 정답수: **{row['정답수']}/{row['문항수']}개**")
+                st.write("---")
     
-    # 각 학생별로 채점
-    for idx, row in student_df.iterrows():
-        student_id = row[id_col]
-        subject = row[subject_col]
+    return result_df, response_data
 
-        if subject not in answer_dict:
-            available_subjects = ', '.join([str(s) for s in answer_dict.keys()])
-            st.error(
-                f"❌ 과목코드 매칭 오류\n\n"
-                f"학생 답안의 과목코드 '{subject}'에 해당하는 정답이 없습니다.\n"
-                f"수험번호: {student_id}\n\n"
-                f"정답 파일에 있는 과목코드: {available_subjects}\n\n"
-                f"해결방법:\n"
-                f"1. 정답 파일에 과목코드 '{subject}'의 정답을 추가하세요\n"
-                f"2. 학생 답안 파일의 과목코드가 올바른지 확인하세요\n"
-                f"3. 과목코드가 정확히 일치하는지 확인하세요 (대소문자, 공백 주의)"
+
+def grade_students_streaming(student_file, answer_key, layout=None, student_info_dict=None, subject_code_mapping=None, workers=None, profiler=NULL_PROFILER):
+    """대용량 학생 답안 파일을 조각 단위로 읽으면서 채점
+
+    파일 전체를 DataFrame으로 읽지 않고 STREAMING_CHUNK_ROWS 행씩 grading.grade_chunks에
+    넘기며, 읽은 바이트 비율로 진행 상황을 표시합니다. 결과는 grade_students와 같습니다.
+    profiler에는 조각마다 읽기, 검증/변환, 채점 시간을 누적합니다.
+    """
+    file_size = getattr(student_file, 'size', 0)
+    progress_bar = st.progress(0.0, text="⚡ 채점 중...")
+
+    def report_progress(grader):
+        fraction = min(student_file.tell() / file_size, 1.0) if file_size else 0.0
+        progress_bar.progress(fraction, text=f"⚡ 채점 중... {grader.n_rows:,}행 처리")
+
+    student_file.seek(0)
+    chunks = iter_student_data_chunks(student_file, layout, profiler=profiler)
+    result_df, response_data, issues = grade_chunks(
+        chunks, answer_key, student_info_dict, subject_code_mapping, progress=report_progress, workers=workers,
+        profiler=profiler
+    )
+    progress_bar.progress(1.0, text=f"✅ {len(result_df):,}행 채점 완료")
+
+    for level, message in issues:
+        getattr(st, level)(message)
+
+    return result_df, response_data
+
+
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def cached_subject_rows(result_hash, _result_df):
+    """과목코드별 result_df 행 위치와 과목명 (같은 채점 결과면 캐시된 결과 반환)"""
+    rows = _result_df.groupby('과목코드', observed=True, sort=False).indices
+    if '과목명' in _result_df.columns:
+        names = {subject: _result_df['과목명'].iat[positions[0]] for subject, positions in rows.items()}
+    else:
+        names = {subject: subject for subject in rows}
+    return rows, names
+
+
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def cached_wrong_distribution(result_hash, subject, _subject_responses, _profiler=NULL_PROFILER):
+    """과목별 문항 오답 분포표 (같은 채점 결과/과목이면 캐시된 결과 반환)"""
+    with _profiler.stage(f"오답 분포 · {subject}", rows=len(_subject_responses.rows)):
+        return wrong_answer_distribution(_subject_responses)
+
+
+@st.cache_data(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def cached_result_view(result_hash, query, subject_names, sort_column, ascending, _result_df):
+    """검색어/과목명으로 거르고 정렬한 결과 표의 행 위치 (같은 조건이면 캐시된 결과 반환)
+
+    Args:
+        result_hash: 채점 결과 해시
+        query: 수험번호/이름/학번에 포함된 문자열 (빈 문자열이면 전체)
+        subject_names: 표시할 과목명 tuple (빈 tuple이면 전체)
+        sort_column: 정렬 컬럼 (None이면 채점 순서)
+        ascending: 오름차순 여부
+
+    Returns:
+        numpy.ndarray: result_df 행 위치
+    """
+    mask = np.ones(len(_result_df), dtype=bool)
+    if subject_names:
+        mask &= _result_df['과목명'].isin(subject_names).to_numpy()
+    query = query.strip()
+    if query:
+        matched = np.zeros(len(_result_df), dtype=bool)
+        for column in ('수험번호', '이름', '학번'):
+            if column in _result_df.columns:
+                values = _result_df[column].astype(str)
+                matched |= values.str.contains(query, regex=False, na=False).to_numpy()
+        mask &= matched
+    positions = np.flatnonzero(mask)
+
+    if sort_column is not None:
+        # 정렬할 컬럼 하나만 행 위치 순서로 꺼내 안정 정렬 (동점은 채점 순서 유지)
+        order = _result_df[sort_column].iloc[positions].reset_index(drop=True)
+        order = order.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+        positions = positions[order]
+    elif not ascending:
+        positions = positions[::-1]
+    return positions
+
+
+@st.cache_resource(max_entries=EXPORT_CACHE_SIZE, show_spinner=False)
+def cached_scored_result(result_hash, subject_type, _result_df, _scores):
+    """채점 결과에 표준점수/백분위/등급 컬럼을 붙인 DataFrame (같은 채점 결과/과목 종류면 같은 객체 반환)
+
+    st.cache_data는 꺼낼 때마다 복사본을 만들므로, 다시 실행할 때마다 결과 전체를 복사하지 않도록
+    파일 로더 캐시처럼 cache_resource에 두고 읽기 전용으로 사용합니다.
+    """
+    return _result_df.join(_scores)
+
+
+@st.fragment
+def display_result_table(result_df, response_data, result_hash):
+    """채점 결과 표 (서버에서 검색/과목 필터/정렬/페이지 나누기)
+
+    전체 결과 대신 현재 페이지 행만 표시용으로 만들어 브라우저로 보내며,
+    조건을 바꾸거나 페이지를 넘기면 이 프래그먼트만 다시 실행됩니다.
+    """
+    has_info = '이름' in result_df.columns and '학번' in result_df.columns
+    subject_options = sorted(result_df['과목명'].astype(str).unique().tolist()) if '과목명' in result_df.columns else []
+    sort_options = [label for label, column in RESULT_SORT_COLUMNS.items() if column is None or column in result_df.columns]
+
+    # 다른 채점 결과에서 남은 선택값 정리 (선택지에 없는 값은 위젯 오류)
+    if 'result_subjects' in st.session_state:
+        st.session_state['result_subjects'] = [name for name in st.session_state['result_subjects'] if name in subject_options]
+
+    col_query, col_subject, col_sort, col_order = st.columns([2, 3, 1.5, 1])
+    with col_query:
+        query = st.text_input("🔎 검색", placeholder="이름, 학번, 수험번호" if has_info else "수험번호", key="result_query")
+    with col_subject:
+        selected_subjects = st.multiselect("과목", subject_options, placeholder="전체 과목", key="result_subjects") if subject_options else []
+    with col_sort:
+        sort_label = st.selectbox("정렬", sort_options, key="result_sort")
+    with col_order:
+        descending = st.toggle("내림차순", value=RESULT_SORT_COLUMNS[sort_label] in ('총점', '표준점수', '백분위', '정답수'), key=f"result_desc_{sort_label}")
+
+    positions = cached_result_view(
+        result_hash, query, tuple(selected_subjects), RESULT_SORT_COLUMNS[sort_label], not descending, result_df
+    )
+
+    col_size, col_page, col_info = st.columns([1, 1, 3])
+    with col_size:
+        page_size = st.selectbox("페이지당 행 수", RESULT_PAGE_SIZES, index=1, key="result_page_size")
+    n_pages = max(1, -(-len(positions) // page_size))
+    if st.session_state.get('result_page', 1) > n_pages:
+        st.session_state['result_page'] = n_pages
+    with col_page:
+        page = st.number_input("페이지", min_value=1, max_value=n_pages, value=1, step=1, key="result_page")
+    start = (page - 1) * page_size
+    page_positions = positions[start:start + page_size]
+    with col_info:
+        st.write("")
+        st.caption(
+            f"전체 {len(result_df):,}행 중 {len(positions):,}행 · "
+            f"{start + 1 if len(page_positions) else 0:,}–{start + len(page_positions):,}행 표시 ({page}/{n_pages} 페이지)"
+        )
+
+    # 현재 페이지만 표시용으로 변환 (오답번호는 정답 여부 행렬에서 생성, index는 result_df 행 위치)
+    page_df = response_data.display_frame(result_df.iloc[page_positions])
+    if has_info:
+        # 학생 정보가 있는 경우: 이름, 학번 순서로 표시 (수험번호 제거)
+        display_columns = ['이름', '학번', '전화번호', '과목코드', '과목명', '총점', '만점', '정답수', '표준점수', '백분위', '등급', '오답번호']
+        page_df = page_df[[column for column in display_columns if column in page_df.columns]]
+    # 학생 정보가 없는 경우: 수험번호 그대로 표시
+
+    st.dataframe(page_df, use_container_width=True)
+
+
+@st.fragment
+def display_subject_detail(result_df, response_data, result_hash, answer_key, score_conversion, subjects):
+    """과목별 상세 통계 (선택한 과목 하나만 계산/표시)
+
+    st.tabs는 모든 탭 내용을 매번 그리므로 과목 선택 + 프래그먼트로 바꿨습니다.
+    과목을 바꾸거나 과목 안의 버튼을 눌러도 이 프래그먼트만 다시 실행되고,
+    과목별 행 위치, 오답 분포, 문항 분석, 등급컷은 채점 결과 해시 기준 캐시를 씁니다.
+    """
+    subject_rows, subject_names = cached_subject_rows(result_hash, result_df)
+
+    if len(subjects) > 1:
+        subject = st.radio(
+            "과목 선택",
+            subjects,
+            format_func=lambda code: f"📘 {subject_names[code]}",
+            horizontal=True,
+            label_visibility="collapsed",
+            key="subject_detail"
+        )
+    else:
+        # 과목이 하나만 있는 경우 선택 없이 바로 표시
+        subject = subjects[0]
+
+    # 해당 과목 데이터 (index는 result_df 행 위치 그대로)
+    subject_df = result_df.iloc[subject_rows[subject]]
+    display_subject_statistics(subject_df, subject, result_df, subject_names[subject], response_data, result_hash, answer_key,
+                               score_conversion.cut_tables.get(subject))
+
+
+@st.cache_resource
+def render_service():
+    """그래프/PDF 렌더링 작업 프로세스 풀 (모든 세션 공유, 결과는 집계값 해시로 캐시)
+
+    첫 화면에서 미리 만들어 작업 프로세스 시작과 한글 폰트 등록을 끝내 둡니다.
+    """
+    service = RenderService()
+    service.warm_up()
+    return service
+
+
+def remove_temp_files(paths):
+    """임시 파일 삭제 (이미 지워졌거나 지울 수 없으면 무시)"""
+    for path in list(paths):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        paths.discard(path)
+
+
+def close_report_card_worker(executor, paths):
+    """세션이 끝날 때 성적표 생성 스레드를 멈추고 남은 임시 ZIP 파일 삭제"""
+    executor.shutdown(wait=False, cancel_futures=True)
+    remove_temp_files(paths)
+
+
+class ReportCardWorker:
+    """세션 하나의 학생별 성적표 ZIP 생성 스레드와 임시 ZIP 파일 목록
+
+    세션마다 따로 만들어 다른 사용자의 ZIP 생성을 기다리지 않습니다.
+    세션이 끝나 session_state와 함께 정리되거나 서버가 종료되면 남은 임시 ZIP 파일을 지웁니다.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report-cards')
+        self.paths = set()
+        weakref.finalize(self, close_report_card_worker, self.executor, self.paths)
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def new_path(self):
+        """새 임시 ZIP 파일 경로 (세션이 끝나면 삭제)"""
+        fd, path = tempfile.mkstemp(prefix='report_cards_', suffix='.zip')
+        os.close(fd)
+        self.paths.add(Path(path))
+        return Path(path)
+
+
+def report_card_worker():
+    """현재 세션의 성적표 생성 스레드 (session_state에 세션마다 하나)"""
+    if 'report_card_worker' not in st.session_state:
+        st.session_state['report_card_worker'] = ReportCardWorker()
+    return st.session_state['report_card_worker']
+
+
+def start_report_card_job(result_df, response_data, result_hash):
+    """학생별 성적표 ZIP 생성을 백그라운드에서 시작하고 진행 상황을 담은 작업 정보 반환
+
+    PDF는 write_report_cards_zip이 프로세스 풀(REPORT_CARD_WORKERS개, 채점 프로세스 수와 별개)에서
+    만들어 임시 ZIP 파일에 바로 쓰므로 화면은 생성이 끝날 때까지 기다리지 않습니다.
+    """
+    worker = report_card_worker()
+    cards = list(iter_report_cards(result_df, response_data))
+    path = worker.new_path()
+    job = {'result_hash': result_hash, 'path': path, 'done': 0, 'total': len(cards), 'lock': threading.Lock()}
+
+    def report_progress(done, total):
+        job['done'] = done
+
+    job['future'] = worker.submit(write_report_cards_zip, cards, path, REPORT_CARD_WORKERS, None, report_progress)
+    return job
+
+
+def serve_report_card_zip(job):
+    """다운로드할 성적표 ZIP 내용 (download_button의 지연 생성 함수)
+
+    처음 누를 때 임시 ZIP 파일을 읽고 바로 지우며, 화면이 갱신되기 전에 다시 누르면 읽어 둔 내용을 반환합니다.
+    """
+    with job['lock']:
+        if 'data' not in job:
+            job['data'] = job['path'].read_bytes()
+            remove_temp_files({job['path']})
+        return job['data']
+
+
+def display_report_cards(result_df, response_data, result_hash):
+    """학생별 성적표 생성 버튼, 진행률, ZIP 다운로드 (생성 중에는 이 부분만 1초마다 갱신)"""
+    job = st.session_state.get('report_card_job')
+    if job is not None and job['result_hash'] != result_hash:
+        job = None
+    if job is not None and job['future'].done() and not job.get('finished'):
+        # 생성이 끝나면 화면 전체를 한 번 다시 그려 1초 갱신 중지
+        job['finished'] = True
+        st.rerun()
+
+    if job is not None and 'data' in job:
+        # 내려받은 ZIP은 임시 파일을 이미 지웠으므로 읽어 둔 내용도 버리고 생성 버튼으로 돌아감
+        st.caption(f"✅ 성적표 ZIP({job['total']:,}명)을 내려받았습니다. 다시 받으려면 새로 생성하세요.")
+        del st.session_state['report_card_job']
+        job = None
+
+    if job is None:
+        n_students = result_df['수험번호'].nunique()
+        if st.button(f"🧾 학생별 성적표 PDF 생성 ({n_students:,}명, ZIP)", use_container_width=True):
+            previous = st.session_state.get('report_card_job')
+            if previous is not None and previous['future'].done():
+                remove_temp_files({previous['path']})
+            st.session_state['report_card_job'] = start_report_card_job(result_df, response_data, result_hash)
+            st.rerun()
+    elif not job['future'].done():
+        st.progress(job['done'] / max(job['total'], 1), text=f"성적표 생성 중... {job['done']:,}/{job['total']:,}명")
+    elif job['future'].exception() is not None:
+        st.error(f"❌ 성적표 생성 실패: {job['future'].exception()}")
+        remove_temp_files({job['path']})
+        del st.session_state['report_card_job']
+    else:
+        st.download_button(
+            label=f"📥 학생별 성적표 ZIP 다운로드 ({job['total']:,}명)",
+            data=functools.partial(serve_report_card_zip, job),
+            file_name=f"학생별_성적표_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            mime="application/zip",
+            use_container_width=True,
+            key="download_report_cards"
+        )
+
+
+def display_results(result_df, response_data, result_hash, subject_type=None, answer_key=None):
+    """채점 결과 화면 (결과 표, 통계, 과목별 상세 통계, 다운로드, 보관함 저장)
+
+    새로 채점한 결과와 보관함에서 불러온 결과를 같은 화면으로 표시합니다.
+    표준점수/백분위/등급은 과목코드별로 환산해 결과 표와 다운로드에 함께 붙입니다.
+    """
+    # 재채점/보관함 저장에는 환산 점수 없는 원래 채점 결과 사용
+    score_conversion = cached_score_conversion(result_hash, subject_type, result_df, stage_profiler())
+    graded_df, result_df = result_df, cached_scored_result(result_hash, subject_type, result_df, score_conversion.scores)
+
+    # 결과 표시
+    st.subheader("📊 채점 결과")
+    
+    # 검색/과목/정렬 조건에 맞는 현재 페이지만 만들어 표시
+    display_result_table(result_df, response_data, result_hash)
+    
+    # 전체 기본 통계
+    st.markdown("---")
+    st.subheader("📈 전체 기본 통계")
+    
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        st.metric("총 인원", f"{len(result_df)}명")
+    
+    with col2:
+        avg_score = result_df['총점'].mean()
+        st.metric("전체 평균", f"{avg_score:.1f}점")
+    
+    with col3:
+        std_score = result_df['총점'].std()
+        st.metric("표준편차", f"{std_score:.2f}")
+    
+    with col4:
+        max_score = result_df['총점'].max()
+        max_row = result_df[result_df['총점'] == max_score].iloc[0]
+        if '이름' in result_df.columns:
+            max_label = f"{max_row['이름']} ({max_row['학번']})"
+        else:
+            max_label = f"수험번호: {max_row['수험번호']}"
+        st.metric("최고 점수", f"{max_score}점", delta=max_label)
+    
+    with col5:
+        min_score = result_df['총점'].min()
+        min_row = result_df[result_df['총점'] == min_score].iloc[0]
+        if '이름' in result_df.columns:
+            min_label = f"{min_row['이름']} ({min_row['학번']})"
+        else:
+            min_label = f"수험번호: {min_row['수험번호']}"
+        st.metric("최저 점수", f"{min_score}점", delta=min_label)
+    
+    # 과목별 통계 요약
+    st.markdown("---")
+    st.subheader("📚 과목별 통계 요약")
+
+    # 과목명으로 그룹화 (과목코드 대신)
+    subject_stats = result_df.groupby('과목명').agg({
+        '수험번호': 'count',
+        '총점': ['mean', 'std', 'max', 'min']
+    }).round(2)
+
+    subject_stats.columns = ['응시 인원', '평균', '표준편차', '최고점', '최저점']
+    st.dataframe(subject_stats, use_container_width=True)
+    
+    # 과목별 상세 통계 (과목 선택)
+    st.markdown("---")
+    st.subheader("📖 과목별 상세 통계")
+    
+    subjects = sorted(result_df['과목코드'].unique().tolist())
+
+    # 선택한 과목 하나만 프래그먼트 안에서 표시 (과목 전환, 과목 안의 버튼은 이 부분만 다시 실행)
+    display_subject_detail(result_df, response_data, result_hash, answer_key, score_conversion, subjects)
+
+    # 전체 다운로드
+    st.markdown("---")
+    st.subheader("💾 전체 결과 다운로드")
+
+    # 탐구 과목인지 확인 (2개 이상의 과목이 있는 경우)
+    is_tamgu = subject_type == '탐구'
+
+    if is_tamgu and len(subjects) >= 2:
+        # 탐구: 채점결과와 오답분포를 별도 파일로 다운로드
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # 1. 채점결과 Excel 다운로드 (전체 + 과목별 시트)
+            st.download_button(
+                label="📥 채점 결과 Excel 다운로드",
+                data=deferred_export(result_hash, None, 'results_by_subject.xlsx', functools.partial(
+                    build_results_workbook, result_df, response_data, subjects), rows=len(result_df)),
+                file_name=f"전체_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+                key="download_scores"
+            )
+
+        with col2:
+            # 2. 오답분포 Excel 다운로드 (과목별 시트)
+            st.download_button(
+                label="📥 오답 분포 Excel 다운로드",
+                data=deferred_export(result_hash, None, 'wrong_by_subject.xlsx', functools.partial(
+                    build_wrong_distribution_workbook, result_df, response_data, subjects), rows=len(result_df)),
+                file_name=f"전체_오답분포_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+                key="download_wrongs"
+            )
+    else:
+        # 일반 과목: Excel 및 CSV 다운로드
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Excel 형식 다운로드 (한글 깨짐 방지)
+            st.download_button(
+                label="📥 전체 채점 결과 Excel 다운로드 (권장)",
+                data=deferred_export(result_hash, None, 'results.xlsx', lambda: to_excel_bytes(
+                    {'전체 채점결과': iter_result_chunks(result_df, response_data)}), rows=len(result_df)),
+                file_name=f"전체_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+                key="download_all_excel"
             )
-            continue
 
-        answers = answer_dict[subject]['answers']
-        points = answer_dict[subject]['points']
+        with col2:
+            # CSV 형식 다운로드
+            st.download_button(
+                label="📥 전체 채점 결과 CSV 다운로드",
+                data=deferred_export(result_hash, None, 'results.csv', lambda: to_csv_bytes(
+                    iter_result_chunks(result_df, response_data)), rows=len(result_df)),
+                file_name=f"전체_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key="download_all_csv"
+            )
 
-        # 총 문항 수 (정답지 기준)
-        total_questions = len(answers)
+    # 전체 문항 분석 (과목별 시트)
+    if answer_key is not None:
+        st.download_button(
+            label="📥 전체 문항 분석 Excel 다운로드 (과목별 시트)",
+            data=deferred_export(result_hash, None, 'items_by_subject.xlsx', functools.partial(
+                build_item_analysis_workbook, result_df, response_data, answer_key, subjects), rows=len(result_df)),
+            file_name=f"전체_문항분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True,
+            key="download_items"
+        )
 
-        # 배점을 숫자로 변환 (문자열로 읽힌 경우 대비)
-        points_numeric = []
-        for p_idx, p in enumerate(points):
-            try:
-                points_numeric.append(float(p))
-            except (ValueError, TypeError):
-                st.error(
-                    f"❌ 배점 변환 오류\n\n"
-                    f"과목코드: {subject}, 문항: {p_idx + 1}번\n"
-                    f"잘못된 배점 값: '{p}'\n\n"
-                    f"해결방법:\n"
-                    f"1. 정답 파일의 배점 컬럼에 숫자만 입력하세요\n"
-                    f"2. 해당 문항의 배점을 수정하세요"
+    # 학생별 성적표 (과목별 점수, 표준점수/백분위/등급, 석차, 오답 문항)
+    if REPORTLAB_AVAILABLE:
+        st.markdown("---")
+        st.subheader("🧾 학생별 성적표")
+        job = st.session_state.get('report_card_job')
+        running = job is not None and job['result_hash'] == result_hash and not job['future'].done()
+        st.fragment(display_report_cards, run_every=1 if running else None)(
+            result_df, response_data, result_hash
+        )
+
+    # 전체 통계 리포트 이미지 (공통)
+    st.markdown("---")
+    col_img1, col_img2 = st.columns([1, 1])
+    with col_img1:
+        if st.button("📊 전체 통계 리포트 이미지 생성", use_container_width=True):
+            with st.spinner("이미지 생성 중..."):
+                # 통계 리포트 이미지 생성 (렌더링 작업 프로세스, 같은 집계값이면 캐시된 이미지)
+                with stage_profiler().stage('통계 이미지 렌더링', rows=len(result_df)):
+                    image_bytes = render_service().render('statistics_png', statistics_report_aggregates(result_df))
+
+                # 다운로드 버튼 표시
+                st.download_button(
+                    label="📥 통계 리포트 이미지 다운로드",
+                    data=image_bytes,
+                    file_name=f"전체통계리포트_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png",
+                    mime="image/png",
+                    use_container_width=True
                 )
-                points_numeric.append(0)
+                st.success("✅ 이미지가 생성되었습니다!")
+
+    # 정답 정정 재채점 (보관한 답안 코드 행렬로 바뀐 문항만 다시 채점)
+    if answer_key is not None:
+        st.markdown("---")
+        st.subheader("🔁 정답 정정 재채점")
+        st.caption("정답이나 배점을 고친 정답 파일을 올리면 학생 답안을 다시 올리지 않고 바뀐 문항만 다시 채점합니다.")
+        corrected_file = st.file_uploader(
+            "정정된 정답/배점 파일 (CSV 또는 Excel)",
+            type=['csv', 'xlsx', 'xls'],
+            key='corrected_answer'
+        )
+        if corrected_file:
+            try:
+                corrected_hash = get_file_hash(corrected_file)
+                corrected_key = compile_answer_key(cached_load_answer_data(corrected_hash, corrected_file), corrected_hash)
+                changes, _ = diff_answer_keys(answer_key, corrected_key)
+                if not changes:
+                    st.info("현재 채점 결과와 정답/배점이 바뀐 문항이 없습니다.")
+                elif st.button(f"🔁 바뀐 {sum(len(questions) for questions in changes.values())}개 문항 재채점", type="primary"):
+                    regrade_result = regrade(graded_df, response_data, answer_key, corrected_key)
+                    st.session_state['result_df'] = regrade_result.result_df
+                    st.session_state['response_data'] = regrade_result.response_data
+                    st.session_state['result_hash'] = get_result_hash(regrade_result.result_df)
+                    st.session_state['answer_key'] = regrade_result.answer_key
+                    st.session_state['regrade_report'] = regrade_result
+                    st.rerun()
+            except Exception as e:
+                st.error(str(e))
+
+        regrade_report = st.session_state.get('regrade_report')
+        if regrade_report is not None:
+            for level, message in regrade_report.issues:
+                getattr(st, level)(message)
+            st.success(f"✅ 정답 정정 재채점 완료 - 총점이 바뀐 학생 {len(regrade_report.changed_students)}명")
+            st.markdown("**바뀐 문항**")
+            st.dataframe(regrade_report.changed_questions, use_container_width=True, hide_index=True)
+            if len(regrade_report.changed_students) > 0:
+                st.markdown("**총점이 바뀐 학생**")
+                st.dataframe(regrade_report.changed_students, use_container_width=True, hide_index=True)
+
+    # 보관함 저장 (다시 업로드/채점하지 않고 사이드바에서 불러오기)
+    if ARCHIVE_AVAILABLE and answer_key is not None:
+        st.markdown("---")
+        st.subheader("🗄️ 시험 결과 보관")
+        col_id, col_save = st.columns([3, 1])
+        with col_id:
+            default_exam_id = st.session_state.get('archived_exam_id') or f"{datetime.now().strftime('%Y-%m-%d')} {subject_type or ''}".strip()
+            exam_id = st.text_input("시험 ID", value=default_exam_id, help="같은 시험 ID로 저장하면 기존 결과를 덮어씁니다")
+        with col_save:
+            st.write("")
+            save_clicked = st.button("💾 보관함에 저장", use_container_width=True)
+        if save_clicked:
+            try:
+                exam_archive.save(exam_id, graded_df, response_data, answer_key, subject_type)
+                st.session_state['archived_exam_id'] = exam_id.strip()
+                st.success(f"✅ '{exam_id.strip()}' 시험 결과를 저장했습니다. 사이드바 보관함에서 다시 불러올 수 있습니다.")
+            except (ValueError, OSError) as e:
+                st.error(f"❌ 보관함 저장 실패: {e}")
 
-        max_score = sum(points_numeric)
 
-        # 학생 답안 (3번째 열부터)
-        student_answers = row[2:].tolist()
+def display_stage_profile(profiler, context):
+    """디버깅 모드의 단계별 성능 패널 (시간, 행/초, 최대 할당 메모리 표와 JSON 다운로드)
 
-        # 학생 답안 수와 정답 문항 수 비교
-        if len(student_answers) < total_questions:
-            st.warning(
-                f"⚠️ 답안 부족 경고\n\n"
-                f"수험번호: {student_id}, 과목: {subject}\n"
-                f"정답지 문항 수: {total_questions}개\n"
-                f"학생 답안 수: {len(student_answers)}개\n\n"
-                f"누락된 {total_questions - len(student_answers)}개 문항은 오답 처리됩니다."
+    Args:
+        profiler: profiling.StageProfiler
+        context: JSON에 함께 저장할 실행 조건 (과목 종류, 파일 크기, 프로세스 수 등)
+    """
+    st.markdown("---")
+    with st.expander("⏱️ 단계별 성능 (디버깅)", expanded=True):
+        if not profiler.timings:
+            st.info("아직 측정된 단계가 없습니다. 디버깅 모드를 켠 상태에서 파일을 올리고 채점하면 단계별로 기록됩니다.")
+            return
+
+        st.caption(
+            "단계별 마지막 측정값입니다. 캐시에서 가져온 단계(같은 파일 다시 읽기, 같은 결과의 통계/다운로드)는 "
+            "다시 측정하지 않으며, 다운로드 파일 생성 시간은 버튼을 누른 뒤 화면이 다시 그려질 때 표시됩니다."
+        )
+        if profiler.trace_memory:
+            st.caption(
+                "최대 메모리는 이 프로세스의 Python 할당(tracemalloc)이며 병렬 채점/렌더링 작업 프로세스는 포함하지 않습니다. "
+                "메모리를 측정하는 동안에는 시간이 더 걸립니다."
             )
-        
-        # 디버깅: 학생 답안 확인
-        if debug_mode:
-            with debug_expander:
-                st.success(f"👤 **학생 {student_id} - 과목코드: {subject}로 채점**")
-                st.write(f"- 학생 답안 (1~5번): {student_answers[:5]}")
-                st.write(f"- 정답 (1~5번): {answers[:5]}")
-                st.write(f"- 이 학생은 **{subject} 과목의 정답**으로 채점합니다")
-        
-        total_score = 0
-        correct_count = 0
-        wrong_questions = []
-        
-        # 채점 (정답지 기준으로 반복)
-        for i in range(total_questions):
-            question_num = i + 1
-            correct_ans = answers[i]
-            point = points_numeric[i]
-            
-            # 학생 답안이 존재하는지 확인
-            if i < len(student_answers):
-                student_ans = student_answers[i]
-                
-                # 답안 비교 (문자열로 변환하여 비교)
-                if pd.notna(student_ans) and pd.notna(correct_ans):
-                    # 공백 제거
-                    student_ans_str = str(student_ans).strip()
-                    correct_ans_str = str(correct_ans).strip()
-                    
-                    # 숫자인 경우 정수/실수 비교, 문자인 경우 문자열 비교
-                    try:
-                        # 숫자로 변환 시도
-                        if float(student_ans_str) == float(correct_ans_str):
-                            total_score += point
-                            correct_count += 1
-                        else:
-                            wrong_questions.append(question_num)
-                    except:
-                        # 문자열 비교
-                        if student_ans_str == correct_ans_str:
-                            total_score += point
-                            correct_count += 1
-                        else:
-                            wrong_questions.append(question_num)
-                else:
-                    # 답을 적지 않은 경우 (빈칸)
-                    wrong_questions.append(question_num)
-            else:
-                # 학생이 해당 문항을 아예 작성하지 않은 경우
-                wrong_questions.append(question_num)
-        
-        # 디버깅: 점수 계산 확인
-        if debug_mode:
-            with debug_expander:
-                st.write(f"✅ **채점 완료** - 총점: **{int(total_score)}점** / 만점: **{int(max_score)}점** / 정답수: **{correct_count}/{total_questions}개**")
-                st.write("---")
-        
-        # 학생 정보 매칭 (3가지 방식 시도)
-        result_dict = {'수험번호': student_id}
-        
-        if student_info_dict:
-            matched_info = None
-            student_id_str = str(student_id)
-            
-            # 1순위: 완전 매칭 (학번+전화번호)
-            if student_id_str in student_info_dict['by_full']:
-                matched_info = student_info_dict['by_full'][student_id_str]
-            
-            # 2순위: 학번으로 매칭 (수험번호가 학번으로 시작하는지)
-            elif not matched_info:
-                for student_num, info in student_info_dict['by_student_id'].items():
-                    if student_id_str.startswith(student_num) or student_id_str == student_num:
-                        matched_info = info
-                        break
-            
-            # 3순위: 전화번호로 매칭 (수험번호가 전화번호로 끝나는지)
-            if not matched_info:
-                for phone, info in student_info_dict['by_phone'].items():
-                    if student_id_str.endswith(phone) or student_id_str == phone:
-                        matched_info = info
-                        break
-            
-            # 매칭된 정보가 있으면 추가
-            if matched_info:
-                result_dict['학번'] = matched_info['학번']
-                result_dict['전화번호'] = matched_info['전화번호']
-                result_dict['이름'] = matched_info['이름']
-        
-        # 과목명 매핑 (정수와 문자열 모두 처리)
-        subject_name = subject
-        if subject_code_mapping:
-            # 문자열로 변환하여 조회
-            subject_str = str(subject)
-            if subject_str in subject_code_mapping:
-                subject_name = subject_code_mapping[subject_str]
-            # 정수로 조회 (소수점 제거)
-            elif isinstance(subject, (int, float)):
-                subject_int_str = str(int(subject))
-                if subject_int_str in subject_code_mapping:
-                    subject_name = subject_code_mapping[subject_int_str]
-        
-        result_dict.update({
-            '과목코드': subject,
-            '과목명': subject_name,
-            '총점': int(total_score),
-            '만점': int(max_score),
-            '정답수': f"{correct_count}/{total_questions}",
-            '오답번호': ', '.join(map(str, wrong_questions)) if wrong_questions else '없음'
-        })
-        
-        results.append(result_dict)
-    
-    return pd.DataFrame(results)
+
+        profile_df = profiler.to_frame()
+        slowest = profile_df.loc[profile_df['시간(초)'].idxmax()]
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("측정 단계 합계", f"{profiler.total_seconds:.2f}초")
+        with col2:
+            st.metric("가장 오래 걸린 단계", slowest['단계'], delta=f"{slowest['시간(초)']:.2f}초", delta_color="off")
+
+        st.dataframe(
+            profile_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                '시간(초)': st.column_config.NumberColumn('시간(초)', format='%.3f'),
+                '행 수': st.column_config.NumberColumn('행 수', format='%d'),
+                '행/초': st.column_config.NumberColumn('행/초', format='%.0f'),
+                '최대 메모리(MB)': st.column_config.NumberColumn('최대 메모리(MB)', format='%.1f'),
+            }
+        )
+        st.download_button(
+            label="📥 측정 결과 JSON 다운로드",
+            data=profiler.to_json(**context),
+            file_name=f"단계별성능_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+            key="download_stage_profile"
+        )
+
+
+# 시험 결과 보관함 (지난 시험을 다시 업로드/채점하지 않고 불러오기)
+exam_archive = ExamArchive()
+
+# 렌더링 작업 프로세스 시작과 한글 폰트 등록을 첫 화면에서 미리 (첫 PDF/그래프 생성 지연 방지)
+render_service()
+
+# 디버깅 모드에서만 단계별 시간/메모리 측정 (측정값은 세션에 보관, 업로드 파일이 바뀌면 초기화)
+stage_profiler().enabled = debug_mode
+stage_profiler().trace_memory = trace_memory
+
+with st.sidebar:
+    st.markdown("---")
+    st.subheader("🗄️ 시험 결과 보관함")
+    if not ARCHIVE_AVAILABLE:
+        st.caption("pyarrow를 설치하면 채점 결과를 보관함에 저장할 수 있습니다.")
+    else:
+        archived_exams = exam_archive.exams()
+        if len(archived_exams) == 0:
+            st.caption("저장된 시험이 없습니다. 채점 후 결과 화면에서 저장할 수 있습니다.")
+        else:
+            archived_exam_id = st.selectbox(
+                "저장된 시험",
+                archived_exams['시험 ID'].tolist(),
+                format_func=lambda exam_id: f"{exam_id} ({archived_exams.set_index('시험 ID').at[exam_id, '인원']:,}명)"
+            )
+            if st.button("📂 불러오기", use_container_width=True):
+                archived_exam = exam_archive.load(archived_exam_id)
+                st.session_state['result_df'] = archived_exam.result_df
+                st.session_state['response_data'] = archived_exam.response_data
+                st.session_state['result_hash'] = get_result_hash(archived_exam.result_df)
+                st.session_state['result_subject_type'] = archived_exam.subject_type
+                st.session_state['answer_key'] = archived_exam.answer_key
+                st.session_state['archived_exam_id'] = archived_exam.exam_id
+                st.session_state.pop('regrade_report', None)
+                st.success(f"✅ '{archived_exam.exam_id}' 결과를 불러왔습니다 ({archived_exam.saved_at} 저장)")
 
 
 # 메인 영역
@@ -1461,21 +1458,39 @@ if student_file and answer_file:
         
         # 데이터 로드
         with st.spinner("📂 파일을 불러오는 중..."):
-            student_df = load_student_data(student_file, is_tamgu=is_tamgu)
-            answer_df = load_answer_data(answer_file)
+            # 파일 내용 해시 (같은 내용이면 다시 파싱하지 않음)
+            student_hash = get_file_hash(student_file)
+            answer_hash = get_file_hash(answer_file)
+            info_hash = get_file_hash(student_info_file) if student_info_file else None
+
+            # 한 행에 여러 과목이 있는 과목 종류(탐구 등)는 행 구조에 맞춰 변환
+            row_layout = ROW_LAYOUTS.get(st.session_state.get('subject_type'))
+
+            # 파일 내용이나 과목 종류가 변경되면 기존 결과와 단계별 측정값 초기화
+            current_files = (student_hash, answer_hash, info_hash, row_layout)
+            if 'previous_files' not in st.session_state or st.session_state['previous_files'] != current_files:
+                st.session_state['previous_files'] = current_files
+                for key in RESULT_STATE_KEYS:
+                    if key in st.session_state:
+                        del st.session_state[key]
+                stage_profiler().reset()
+
+            # 대용량 파일은 전체를 읽지 않고 채점 시 조각 단위로 읽음 (미리보기는 앞부분만)
+            use_streaming = streaming_mode or getattr(student_file, 'size', 0) > STREAMING_THRESHOLD_BYTES
+            if use_streaming:
+                student_df = cached_load_student_preview(student_hash, student_file, row_layout)
+            else:
+                student_df = cached_load_student_data(student_hash, student_file, row_layout, stage_profiler())
+            answer_df = cached_load_answer_data(answer_hash, answer_file, stage_profiler())
+            # 정답 파일 내용이 같으면 컴파일된 정답을 재사용
+            answer_key = compile_answer_key(answer_df, answer_hash, stage_profiler())
             
             # 학생 정보 파일 로드 (선택사항)
             student_info_dict = None
             if student_info_file:
-                student_info_dict = load_student_info(student_info_file)
-            
-            # 파일이 변경되면 기존 결과 초기화
-            info_file_name = student_info_file.name if student_info_file else None
-            current_files = (student_file.name, answer_file.name, info_file_name)
-            if 'previous_files' not in st.session_state or st.session_state['previous_files'] != current_files:
-                st.session_state['previous_files'] = current_files
-                if 'result_df' in st.session_state:
-                    del st.session_state['result_df']
+                student_info_dict = cached_load_student_info(info_hash, student_info_file, stage_profiler())
+                for level, message in student_info_dict['issues']:
+                    getattr(st, level)(message)
         
         # 데이터 미리보기 (접기 가능)
         with st.expander("📂 업로드된 파일 미리보기", expanded=False):
@@ -1487,7 +1502,10 @@ if student_file and answer_file:
             with col1:
                 st.subheader("👥 학생 답안 데이터")
                 st.dataframe(student_df.head(), use_container_width=True)
-                st.caption(f"총 {len(student_df)}명의 학생")
+                if use_streaming:
+                    st.caption("📦 스트리밍 채점: 전체 인원은 채점하면서 집계됩니다")
+                else:
+                    st.caption(f"총 {len(student_df)}명의 학생")
             
             with col2:
                 st.subheader("✅ 정답 및 배점 데이터")
@@ -1517,9 +1535,24 @@ if student_file and answer_file:
             with st.spinner("⚡ 채점 중..."):
                 # 과목코드 매핑 가져오기
                 subject_code_mapping = st.session_state.get('subject_code_mapping', {})
-                result_df = grade_students(student_df, answer_df, student_info_dict, subject_code_mapping, debug_mode)
-                # session_state에 저장하여 페이지 새로고침 시에도 유지
+                if use_streaming:
+                    result_df, response_data = grade_students_streaming(
+                        student_file, answer_key, row_layout, student_info_dict, subject_code_mapping, grading_workers,
+                        stage_profiler()
+                    )
+                else:
+                    result_df, response_data = grade_students(
+                        student_df, answer_df, student_info_dict, subject_code_mapping, debug_mode, answer_key, grading_workers,
+                        stage_profiler()
+                    )
+                # session_state에 저장하여 페이지 새로고침 시에도 유지 (문항별 정답 여부 행렬 포함)
                 st.session_state['result_df'] = result_df
+                st.session_state['response_data'] = response_data
+                st.session_state['result_hash'] = get_result_hash(result_df)
+                st.session_state['result_subject_type'] = st.session_state.get('subject_type')
+                st.session_state['answer_key'] = answer_key
+                st.session_state.pop('archived_exam_id', None)
+                st.session_state.pop('regrade_report', None)
             
             if student_info_dict:
                 st.success("✅ 채점이 완료되었습니다! (학생 이름 포함)")
@@ -1528,304 +1561,8 @@ if student_file and answer_file:
         
         # session_state에서 결과 가져오기
         if 'result_df' in st.session_state:
-            result_df = st.session_state['result_df']
-            
-            # 결과 표시
-            st.subheader("📊 채점 결과")
-            
-            # 화면 표시용 DataFrame (수험번호 제거)
-            display_df = result_df.copy()
-            if '이름' in display_df.columns and '학번' in display_df.columns:
-                # 학생 정보가 있는 경우: 이름, 학번 순서로 표시 (수험번호 제거)
-                display_columns = ['이름', '학번', '전화번호', '과목코드', '과목명', '총점', '만점', '정답수', '오답번호']
-                display_df = display_df[display_columns]
-            # 학생 정보가 없는 경우: 수험번호 그대로 표시
-            
-            st.dataframe(display_df, use_container_width=True)
-            
-            # 전체 기본 통계
-            st.markdown("---")
-            st.subheader("📈 전체 기본 통계")
-            
-            col1, col2, col3, col4, col5 = st.columns(5)
-            
-            with col1:
-                st.metric("총 인원", f"{len(result_df)}명")
-            
-            with col2:
-                avg_score = result_df['총점'].mean()
-                st.metric("전체 평균", f"{avg_score:.1f}점")
-            
-            with col3:
-                std_score = result_df['총점'].std()
-                st.metric("표준편차", f"{std_score:.2f}")
-            
-            with col4:
-                max_score = result_df['총점'].max()
-                max_row = result_df[result_df['총점'] == max_score].iloc[0]
-                if '이름' in result_df.columns:
-                    max_label = f"{max_row['이름']} ({max_row['학번']})"
-                else:
-                    max_label = f"수험번호: {max_row['수험번호']}"
-                st.metric("최고 점수", f"{max_score}점", delta=max_label)
-            
-            with col5:
-                min_score = result_df['총점'].min()
-                min_row = result_df[result_df['총점'] == min_score].iloc[0]
-                if '이름' in result_df.columns:
-                    min_label = f"{min_row['이름']} ({min_row['학번']})"
-                else:
-                    min_label = f"수험번호: {min_row['수험번호']}"
-                st.metric("최저 점수", f"{min_score}점", delta=min_label)
-            
-            # 과목별 통계 요약
-            st.markdown("---")
-            st.subheader("📚 과목별 통계 요약")
-
-            # 과목명으로 그룹화 (과목코드 대신)
-            subject_stats = result_df.groupby('과목명').agg({
-                '수험번호': 'count',
-                '총점': ['mean', 'std', 'max', 'min']
-            }).round(2)
-
-            subject_stats.columns = ['응시 인원', '평균', '표준편차', '최고점', '최저점']
-            st.dataframe(subject_stats, use_container_width=True)
-            
-            # 과목별 상세 통계 (탭으로 구분)
-            st.markdown("---")
-            st.subheader("📖 과목별 상세 통계")
-            
-            subjects = sorted(result_df['과목코드'].unique().tolist())
-
-            if len(subjects) > 1:
-                # 과목명으로 탭 제목 생성
-                subject_names_for_tabs = []
-                for subject in subjects:
-                    subject_df_temp = result_df[result_df['과목코드'] == subject]
-                    if '과목명' in subject_df_temp.columns and len(subject_df_temp) > 0:
-                        subject_names_for_tabs.append(subject_df_temp['과목명'].iloc[0])
-                    else:
-                        subject_names_for_tabs.append(subject)
-
-                tabs = st.tabs([f"📘 {name}" for name in subject_names_for_tabs])
-
-                for tab, subject in zip(tabs, subjects):
-                    with tab:
-                        # 해당 과목 데이터 필터링
-                        subject_df = result_df[result_df['과목코드'] == subject].copy()
-
-                        # 과목명 가져오기 (첫 번째 행의 과목명)
-                        subject_name = subject_df['과목명'].iloc[0] if '과목명' in subject_df.columns else subject
-
-                        # 공통 함수 호출
-                        display_subject_statistics(subject_df, subject, result_df, subject_name)
-            else:
-                # 과목이 하나만 있는 경우 탭 없이 바로 표시
-                subject = subjects[0]
-                subject_df = result_df.copy()
-
-                # 과목명 가져오기 (첫 번째 행의 과목명)
-                subject_name = subject_df['과목명'].iloc[0] if '과목명' in subject_df.columns else subject
-
-                # 공통 함수 호출
-                display_subject_statistics(subject_df, subject, result_df, subject_name)
-
-            # 전체 다운로드
-            st.markdown("---")
-            st.subheader("💾 전체 결과 다운로드")
-
-            # 탐구 과목인지 확인 (2개 이상의 과목이 있는 경우)
-            is_tamgu = st.session_state.get('subject_type') == '탐구'
-
-            if is_tamgu and len(subjects) >= 2:
-                # 탐구: 채점결과와 오답분포를 별도 파일로 다운로드
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    # 1. 채점결과 Excel 다운로드
-                    score_buffer = io.BytesIO()
-                    with pd.ExcelWriter(score_buffer, engine='openpyxl') as writer:
-                        # 첫 번째 시트: 전체 채점결과 (모든 과목)
-                        result_df.to_excel(writer, sheet_name='전체 채점결과', index=False)
-
-                        # 각 과목별 채점결과 시트
-                        for subject in subjects:
-                            subject_df = result_df[result_df['과목코드'] == subject].copy()
-                            # 과목명 가져오기
-                            subject_name = subject_df['과목명'].iloc[0] if '과목명' in subject_df.columns else str(subject)
-                            # 시트명은 최대 31자로 제한
-                            sheet_name = subject_name[:31] if len(subject_name) > 31 else subject_name
-                            subject_df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                    score_buffer.seek(0)
-                    st.download_button(
-                        label="📥 채점 결과 Excel 다운로드",
-                        data=score_buffer,
-                        file_name=f"전체_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
-                        key="download_scores"
-                    )
-
-                with col2:
-                    # 2. 오답분포 Excel 다운로드
-                    wrong_buffer = io.BytesIO()
-                    with pd.ExcelWriter(wrong_buffer, engine='openpyxl') as writer:
-                        for subject in subjects:
-                            subject_df = result_df[result_df['과목코드'] == subject].copy()
-                            # 과목명 가져오기
-                            subject_name = subject_df['과목명'].iloc[0] if '과목명' in subject_df.columns else str(subject)
-
-                            # 오답분포 계산
-                            wrong_question_counts = {}
-                            for idx, row in subject_df.iterrows():
-                                wrong_nums = row['오답번호']
-                                if wrong_nums and wrong_nums != '없음':
-                                    for num_str in wrong_nums.split(','):
-                                        try:
-                                            num = int(num_str.strip())
-                                            wrong_question_counts[num] = wrong_question_counts.get(num, 0) + 1
-                                        except:
-                                            pass
-
-                            if wrong_question_counts:
-                                sorted_wrong = sorted(wrong_question_counts.items(), key=lambda x: x[1], reverse=True)
-                                all_wrong_df = pd.DataFrame(sorted_wrong, columns=['문항 번호', '오답 인원'])
-                                all_wrong_df['오답률'] = (all_wrong_df['오답 인원'] / len(subject_df) * 100).round(1).astype(str) + '%'
-
-                                # 시트명은 과목명 사용
-                                sheet_name = subject_name[:31] if len(subject_name) > 31 else subject_name
-                                all_wrong_df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                    wrong_buffer.seek(0)
-                    st.download_button(
-                        label="📥 오답 분포 Excel 다운로드",
-                        data=wrong_buffer,
-                        file_name=f"전체_오답분포_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
-                        key="download_wrongs"
-                    )
-            else:
-                # 일반 과목: Excel 및 CSV 다운로드
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    # Excel 형식 다운로드 (한글 깨짐 방지)
-                    excel_buffer = io.BytesIO()
-                    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                        result_df.to_excel(writer, sheet_name='전체 채점결과', index=False)
-                    excel_buffer.seek(0)
-                    st.download_button(
-                        label="📥 전체 채점 결과 Excel 다운로드 (권장)",
-                        data=excel_buffer,
-                        file_name=f"전체_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
-                        key="download_all_excel"
-                    )
-
-                with col2:
-                    # CSV 형식 다운로드
-                    csv = result_df.to_csv(index=False, encoding='utf-8-sig')
-                    st.download_button(
-                        label="📥 전체 채점 결과 CSV 다운로드",
-                        data=csv,
-                        file_name=f"전체_채점결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv",
-                        use_container_width=True,
-                        key="download_all_csv"
-                    )
-
-            # 전체 통계 리포트 이미지 (공통)
-            st.markdown("---")
-            col_img1, col_img2 = st.columns([1, 1])
-            with col_img1:
-                if st.button("📊 전체 통계 리포트 이미지 생성", use_container_width=True):
-                    with st.spinner("이미지 생성 중..."):
-                        # 통계 리포트 이미지 생성
-                        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-                        fig.suptitle('채점 통계 리포트 (전체)', fontsize=20, fontweight='bold', y=0.98)
-
-                        # 한글 폰트 설정
-                        setup_korean_font_for_matplotlib()
-
-                        # 1. 기본 통계 표
-                        ax1 = axes[0, 0]
-                        ax1.axis('off')
-                        stats_data = [
-                            ['인원', f"{len(result_df)}명"],
-                            ['평균 점수', f"{result_df['총점'].mean():.1f}점"],
-                            ['표준편차', f"{result_df['총점'].std():.2f}"],
-                            ['최고 점수', f"{result_df['총점'].max()}점 (수험번호: {result_df[result_df['총점'] == result_df['총점'].max()]['수험번호'].values[0]})"],
-                            ['최저 점수', f"{result_df['총점'].min()}점 (수험번호: {result_df[result_df['총점'] == result_df['총점'].min()]['수험번호'].values[0]})"]
-                        ]
-                        table1 = ax1.table(cellText=stats_data, cellLoc='left', loc='center',
-                                          colWidths=[0.3, 0.7])
-                        table1.auto_set_font_size(False)
-                        table1.set_fontsize(12)
-                        table1.scale(1, 3)
-                        for i in range(len(stats_data)):
-                            table1[(i, 0)].set_facecolor('#E8F4F8')
-                            table1[(i, 0)].set_text_props(weight='bold')
-                        ax1.set_title('📈 전체 기본 통계', fontsize=16, fontweight='bold', pad=20)
-                        
-                        # 2. 과목별 평균 점수
-                        ax2 = axes[0, 1]
-                        if len(result_df['과목코드'].unique()) > 1:
-                            subject_means = result_df.groupby('과목코드')['총점'].mean().sort_values(ascending=False)
-                            subjects_list = list(subject_means.index)
-                            means = list(subject_means.values)
-                            bars = ax2.bar(subjects_list, means, color='lightgreen', edgecolor='black', alpha=0.7)
-                            ax2.set_ylabel('평균 점수', fontsize=12)
-                            ax2.set_title('📚 과목별 평균 점수', fontsize=16, fontweight='bold', pad=20)
-                            ax2.grid(axis='y', alpha=0.3)
-                            # 막대에 숫자 표시
-                            for bar, mean in zip(bars, means):
-                                ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height(),
-                                        f'{mean:.1f}', ha='center', va='bottom', fontsize=10)
-                        else:
-                            ax2.text(0.5, 0.5, '단일 과목', ha='center', va='center', fontsize=14)
-                            ax2.axis('off')
-                        
-                        # 3. 과목별 응시 인원
-                        ax3 = axes[1, 0]
-                        subject_counts = result_df['과목코드'].value_counts().sort_index()
-                        bars = ax3.barh(subject_counts.index, subject_counts.values, color='skyblue', edgecolor='black', alpha=0.7)
-                        ax3.set_xlabel('응시 인원', fontsize=12)
-                        ax3.set_title('📊 과목별 응시 인원', fontsize=16, fontweight='bold', pad=20)
-                        ax3.invert_yaxis()
-                        ax3.grid(axis='x', alpha=0.3)
-                        # 막대에 숫자 표시
-                        for bar, count in zip(bars, subject_counts.values):
-                            ax3.text(bar.get_width(), bar.get_y() + bar.get_height()/2, 
-                                    f' {count}명', va='center', fontsize=10)
-                        
-                        # 4. 전체 점수 분포
-                        ax4 = axes[1, 1]
-                        ax4.hist(result_df['총점'], bins=10, color='coral', edgecolor='black', alpha=0.7)
-                        ax4.set_xlabel('점수', fontsize=12)
-                        ax4.set_ylabel('학생 수', fontsize=12)
-                        ax4.set_title('📊 전체 점수 분포', fontsize=16, fontweight='bold', pad=20)
-                        ax4.grid(axis='y', alpha=0.3)
-                        
-                        plt.tight_layout()
-                        
-                        # 이미지를 바이트로 저장
-                        buf = io.BytesIO()
-                        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-                        buf.seek(0)
-                        plt.close()
-                        
-                        # 다운로드 버튼 표시
-                        st.download_button(
-                            label="📥 통계 리포트 이미지 다운로드",
-                            data=buf,
-                            file_name=f"전체통계리포트_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png",
-                            mime="image/png",
-                            use_container_width=True
-                        )
-                        st.success("✅ 이미지가 생성되었습니다!")
+            display_results(st.session_state['result_df'], st.session_state['response_data'], st.session_state['result_hash'],
+                            st.session_state.get('result_subject_type'), st.session_state.get('answer_key'))
             
     except Exception as e:
         error_msg = str(e)
@@ -1843,7 +1580,12 @@ if student_file and answer_file:
                 f"3. 필수 컬럼이 모두 있는지 확인하세요\n"
                 f"4. 디버깅 모드를 활성화하면 더 자세한 정보를 볼 수 있습니다"
             )
-        
+
+elif 'result_df' in st.session_state:
+    # 업로드 파일 없이 보관함에서 불러온 결과
+    display_results(st.session_state['result_df'], st.session_state['response_data'], st.session_state['result_hash'],
+                    st.session_state.get('result_subject_type'), st.session_state.get('answer_key'))
+
 else:
     # 안내 메시지
     st.info("👈 왼쪽 사이드바에서 파일을 업로드해주세요.")
@@ -1893,5 +1635,13 @@ else:
     - 💾 결과 CSV 다운로드
     """)
 
-
-
+# 디버깅 모드: 지금까지 측정한 단계별 시간/처리량/메모리
+if debug_mode:
+    display_stage_profile(stage_profiler(), {
+        'subject_type': st.session_state.get('subject_type'),
+        'student_file': getattr(student_file, 'name', None),
+        'student_file_bytes': getattr(student_file, 'size', None),
+        'result_rows': len(st.session_state['result_df']) if 'result_df' in st.session_state else None,
+        'grading_workers': grading_workers,
+        'streaming': streaming_mode,
+    })
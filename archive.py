@@ -0,0 +1,243 @@
+"""시험 결과 보관소
+
+채점 결과, 과목별 답안 코드 행렬, 정답/배점을 시험 ID별로 저장해 두었다가
+다시 업로드하거나 채점하지 않고 바로 불러옵니다.
+
+저장 구조 (ARCHIVE_DIR 아래):
+    archive.sqlite3              시험 목록과 과목별 요약 (시험 ID, 과목코드 기준 색인)
+    <저장 폴더>/results.parquet   채점 결과 (result_df, 컬럼 타입 그대로)
+    <저장 폴더>/answer_key.parquet 정답/배점 (과목번호 | 문항번호 | 정답 | 배점)
+    <저장 폴더>/responses_<n>.parquet 과목별 답안 코드 행렬 (result_df 행 위치 | 1 | 2 | ...)
+
+Parquet 읽기/쓰기에는 pyarrow가 필요합니다.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from grading import AnswerKey, ResponseData, SubjectResponses, build_answer_key, grade_matrix, map_key_codes
+
+# pyarrow 선택적 import (Parquet 저장용)
+try:
+    import pyarrow  # noqa: F401
+    ARCHIVE_AVAILABLE = True
+except ImportError:
+    ARCHIVE_AVAILABLE = False
+
+# 보관소 위치 (배포 환경에서는 컨테이너 재시작 후에도 남는 볼륨 경로로 지정)
+ARCHIVE_DIR = Path(os.environ.get('SCORING_ARCHIVE_DIR', Path(__file__).parent / 'exam_archive'))
+
+# Parquet에서 읽은 뒤 다시 범주형으로 바꾸는 result_df 컬럼
+CATEGORICAL_COLUMNS = ('과목코드', '과목명')
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exams (
+    exam_id TEXT PRIMARY KEY,
+    storage TEXT NOT NULL,
+    subject_type TEXT,
+    saved_at TEXT NOT NULL,
+    n_rows INTEGER NOT NULL,
+    n_subjects INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exam_subjects (
+    exam_id TEXT NOT NULL REFERENCES exams(exam_id) ON DELETE CASCADE,
+    subject TEXT NOT NULL,
+    subject_name TEXT,
+    position INTEGER NOT NULL,
+    n_students INTEGER NOT NULL,
+    n_questions INTEGER NOT NULL,
+    max_score REAL NOT NULL,
+    mean_score REAL,
+    tokens TEXT NOT NULL,
+    PRIMARY KEY (exam_id, subject)
+);
+"""
+
+
+def _to_json(value):
+    """과목코드/답안 토큰을 JSON 문자열로 (정수와 문자열 과목코드 구분 유지)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    return json.dumps(value, ensure_ascii=False)
+
+
+@dataclass
+class ArchivedExam:
+    """보관소에서 불러온 시험 하나"""
+    exam_id: str
+    subject_type: str
+    saved_at: str
+    result_df: pd.DataFrame
+    response_data: ResponseData
+    answer_key: AnswerKey
+
+
+class ExamArchive:
+    """시험 ID별 채점 결과 보관소 (SQLite 목록 + Parquet 데이터)
+
+    같은 시험 ID로 다시 저장하면 기존 내용을 바꿉니다.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = Path(root)
+
+    def _connect(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.root / 'archive.sqlite3', timeout=30)
+        conn.execute('PRAGMA foreign_keys = ON')
+        conn.executescript(CATALOG_SCHEMA)
+        return conn
+
+    def __contains__(self, exam_id):
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT 1 FROM exams WHERE exam_id = ?', (exam_id,)).fetchone() is not None
+
+    def save(self, exam_id, result_df, response_data, answer_key, subject_type=None):
+        """채점 결과, 답안 코드 행렬, 정답/배점 저장
+
+        Args:
+            exam_id: 시험 ID (예: '2025-06 모의고사')
+            result_df: 채점 결과 DataFrame
+            response_data: 채점 시 함께 만든 ResponseData
+            answer_key: 채점에 사용한 AnswerKey
+            subject_type: 과목 종류 (optional, 불러올 때 화면 구성에 사용)
+        """
+        exam_id = exam_id.strip()
+        if not exam_id:
+            raise ValueError("시험 ID를 입력하세요")
+
+        storage = hashlib.sha1(exam_id.encode('utf-8')).hexdigest()[:16]
+        target = self.root / storage
+        staging = self.root / f'.{storage}.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        # 파일을 임시 폴더에 모두 쓴 뒤 교체하므로 저장 중 실패해도 기존 내용은 남음
+        result_df.reset_index(drop=True).to_parquet(staging / 'results.parquet', index=False)
+        self._answer_key_frame(answer_key).to_parquet(staging / 'answer_key.parquet', index=False)
+
+        subject_rows = []
+        for position, (subject, subject_responses) in enumerate(response_data.subjects.items()):
+            n_questions = subject_responses.responses.shape[1]
+            responses_df = pd.DataFrame(subject_responses.responses, columns=[str(q) for q in range(1, n_questions + 1)])
+            responses_df.insert(0, 'row', subject_responses.rows.astype(np.int32))
+            responses_df.to_parquet(staging / f'responses_{position}.parquet', index=False)
+
+            rows = subject_responses.rows
+            subject_name = result_df['과목명'].iat[rows[0]] if '과목명' in result_df.columns and len(rows) else subject
+            subject_key = answer_key[subject]
+            subject_rows.append((
+                exam_id, _to_json(subject), str(subject_name), position, len(rows), n_questions,
+                subject_key.max_score, float(result_df['총점'].iloc[rows].mean()) if len(rows) else None,
+                json.dumps(subject_responses.tokens, ensure_ascii=False),
+            ))
+
+        if target.exists():
+            shutil.rmtree(target)
+        staging.rename(target)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM exams WHERE exam_id = ?', (exam_id,))
+            conn.execute(
+                'INSERT INTO exams VALUES (?, ?, ?, ?, ?, ?)',
+                (exam_id, storage, subject_type, datetime.now().isoformat(timespec='seconds'),
+                 len(result_df), len(response_data.subjects)),
+            )
+            conn.executemany('INSERT INTO exam_subjects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', subject_rows)
+
+    @staticmethod
+    def _answer_key_frame(answer_key):
+        """AnswerKey를 정답 파일 형식 DataFrame으로 (과목코드는 JSON, 정답은 문자열)"""
+        records = []
+        for subject, subject_key in answer_key.subjects.items():
+            for question, (answer, points) in enumerate(zip(subject_key.answers, subject_key.points), start=1):
+                records.append((_to_json(subject), question, None if pd.isna(answer) else str(answer), float(points)))
+        return pd.DataFrame(records, columns=['과목번호', '문항번호', '정답', '배점'])
+
+    def exams(self):
+        """저장된 시험 목록 (최근 저장 순)"""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(
+                'SELECT exam_id AS "시험 ID", subject_type AS "과목 종류", saved_at AS "저장 시각", '
+                'n_rows AS "인원", n_subjects AS "과목 수" FROM exams ORDER BY saved_at DESC',
+                conn,
+            )
+
+    def subjects(self, exam_id):
+        """시험의 과목별 요약 (과목코드, 과목명, 응시 인원, 문항 수, 만점, 평균)"""
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(
+                'SELECT subject, subject_name, n_students, n_questions, max_score, mean_score '
+                'FROM exam_subjects WHERE exam_id = ? ORDER BY position',
+                conn, params=(exam_id,),
+            )
+        df['subject'] = [json.loads(subject) for subject in df['subject']]
+        return df.rename(columns={
+            'subject': '과목코드', 'subject_name': '과목명', 'n_students': '응시 인원',
+            'n_questions': '문항 수', 'max_score': '만점', 'mean_score': '평균',
+        })
+
+    def load(self, exam_id):
+        """저장된 시험 불러오기
+
+        정답 여부 행렬은 저장된 답안 코드와 정답으로 다시 계산합니다. (행렬 비교 한 번)
+
+        Raises:
+            KeyError: 저장되지 않은 시험 ID
+        """
+        with closing(self._connect()) as conn:
+            exam = conn.execute(
+                'SELECT storage, subject_type, saved_at FROM exams WHERE exam_id = ?', (exam_id,)
+            ).fetchone()
+            if exam is None:
+                raise KeyError(exam_id)
+            subject_rows = conn.execute(
+                'SELECT subject, position, tokens FROM exam_subjects WHERE exam_id = ? ORDER BY position', (exam_id,)
+            ).fetchall()
+        storage, subject_type, saved_at = exam
+        folder = self.root / storage
+
+        result_df = pd.read_parquet(folder / 'results.parquet')
+        for column in CATEGORICAL_COLUMNS:
+            if column in result_df.columns:
+                result_df[column] = result_df[column].astype('category')
+        answer_df = pd.read_parquet(folder / 'answer_key.parquet')
+        answer_df['과목번호'] = pd.Series([json.loads(subject) for subject in answer_df['과목번호']], dtype=object)
+        answer_key = build_answer_key(answer_df)
+
+        response_data = ResponseData(n_rows=len(result_df))
+        for subject_json, position, tokens_json in subject_rows:
+            subject = json.loads(subject_json)
+            responses_df = pd.read_parquet(folder / f'responses_{position}.parquet')
+            responses = responses_df.iloc[:, 1:].to_numpy()
+            # 정정 재채점 후에는 정답 토큰 순서가 답안 코드 순서와 다를 수 있으므로 토큰으로 맞춤
+            token_codes = {token: code for code, token in enumerate(json.loads(tokens_json))}
+            subject_key = answer_key[subject]
+            correct, _ = grade_matrix(responses, map_key_codes(subject_key, token_codes), subject_key.points)
+            response_data.subjects[subject] = SubjectResponses(
+                subject=subject,
+                rows=responses_df['row'].to_numpy(np.int64),
+                correct=correct,
+                responses=responses,
+                tokens=list(token_codes),
+            )
+
+        return ArchivedExam(exam_id, subject_type, saved_at, result_df, response_data, answer_key)
+
+    def delete(self, exam_id):
+        """저장된 시험 삭제"""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute('SELECT storage FROM exams WHERE exam_id = ?', (exam_id,)).fetchone()
+            if row is None:
+                return
+            conn.execute('DELETE FROM exams WHERE exam_id = ?', (exam_id,))
+        shutil.rmtree(self.root / row[0], ignore_errors=True)
@@ -0,0 +1,128 @@
+"""한글 폰트와 정적 파일 캐시
+
+한글 폰트는 검색 경로에서 프로세스마다 한 번만 찾아 reportlab/matplotlib에 한 번씩 등록하고,
+로고 같은 정적 파일은 base64로 한 번만 인코딩해 둡니다.
+(Streamlit 재실행, PDF/그래프 생성마다 폰트 파일을 다시 읽지 않음)
+
+폰트 검색 순서:
+    1. 환경 변수 SCORING_FONT_PATH (파일 또는 폴더, 여러 개는 os.pathsep으로 구분)
+    2. 저장소의 fonts/ 폴더
+    3. macOS 시스템 폰트 (AppleSDGothicNeo, AppleGothic)
+    4. Linux 폰트 (fonts-nanum, fonts-noto-cjk 패키지 경로)
+"""
+import base64
+import functools
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+# 저장소에 함께 둔 폰트 폴더 (*.ttf, *.ttc, *.otf)
+BUNDLED_FONT_DIR = Path(__file__).parent / 'fonts'
+
+# 시스템 한글 폰트 후보 (경로, TTC 안의 글꼴 번호)
+KOREAN_FONT_PATHS = [
+    # macOS
+    ('/System/Library/Fonts/AppleSDGothicNeo.ttc', 0),
+    ('/System/Library/Fonts/Supplemental/AppleGothic.ttf', 0),
+    # Linux (Debian/Ubuntu fonts-nanum)
+    ('/usr/share/fonts/truetype/nanum/NanumGothic.ttf', 0),
+    ('/usr/share/fonts/nanum/NanumGothic.ttf', 0),
+    # Linux (fonts-noto-cjk, TTC 안 1번이 KR) - reportlab은 CFF 글꼴을 읽지 못해 matplotlib에서만 사용
+    ('/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc', 1),
+    ('/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc', 1),
+]
+
+FONT_FILE_SUFFIXES = ('.ttf', '.ttc', '.otf')
+
+# reportlab에 등록하는 한글 폰트 이름 (한글 폰트가 없으면 Helvetica)
+PDF_FONT_NAME = 'Korean'
+PDF_FALLBACK_FONT = 'Helvetica'
+MATPLOTLIB_FALLBACK_FONT = 'DejaVu Sans'
+
+
+@dataclass(frozen=True)
+class FontCandidate:
+    """한글 폰트 파일 후보"""
+    path: Path
+    subfont_index: int = 0
+
+
+def font_search_paths():
+    """검색 순서대로 존재하는 한글 폰트 후보 목록"""
+    entries = []
+    for value in os.environ.get('SCORING_FONT_PATH', '').split(os.pathsep):
+        if value.strip():
+            entries.append((Path(value.strip()), 0))
+    entries.append((BUNDLED_FONT_DIR, 0))
+    entries.extend((Path(path), index) for path, index in KOREAN_FONT_PATHS)
+
+    candidates = []
+    for path, index in entries:
+        if path.is_dir():
+            candidates.extend(
+                FontCandidate(font_path) for font_path in sorted(path.iterdir())
+                if font_path.suffix.lower() in FONT_FILE_SUFFIXES
+            )
+        elif path.is_file():
+            candidates.append(FontCandidate(path, index))
+    return candidates
+
+
+@functools.lru_cache(maxsize=None)
+def register_pdf_font():
+    """reportlab에 한글 폰트를 한 번만 등록
+
+    Returns:
+        str: 사용 가능한 폰트 이름 (PDF_FONT_NAME 또는 PDF_FALLBACK_FONT)
+    """
+    try:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+    except ImportError:
+        return PDF_FALLBACK_FONT
+
+    for candidate in font_search_paths():
+        try:
+            pdfmetrics.registerFont(TTFont(PDF_FONT_NAME, str(candidate.path), subfontIndex=candidate.subfont_index))
+            return PDF_FONT_NAME
+        except Exception:
+            # TrueType 글꼴이 아니거나(CFF) 읽을 수 없는 파일은 다음 후보로
+            continue
+    return PDF_FALLBACK_FONT
+
+
+@functools.lru_cache(maxsize=None)
+def register_matplotlib_font():
+    """matplotlib 폰트 목록에 한글 폰트를 한 번만 추가하고 rcParams에 설정
+
+    Returns:
+        str: 설정한 폰트 이름 (한글 폰트가 없으면 MATPLOTLIB_FALLBACK_FONT)
+    """
+    import matplotlib
+    from matplotlib import font_manager
+
+    font_name = MATPLOTLIB_FALLBACK_FONT
+    for candidate in font_search_paths():
+        try:
+            font_manager.fontManager.addfont(str(candidate.path))
+            font_name = font_manager.FontProperties(fname=str(candidate.path)).get_name()
+            break
+        except Exception:
+            continue
+    matplotlib.rcParams['font.family'] = font_name
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return font_name
+
+
+def warm_up():
+    """한글 폰트를 미리 등록 (작업 프로세스 시작 시 호출하면 첫 PDF/그래프에서 폰트를 읽지 않음)"""
+    return register_pdf_font(), register_matplotlib_font()
+
+
+@functools.lru_cache(maxsize=32)
+def static_asset_base64(path):
+    """정적 파일(로고 등)의 base64 문자열 (파일이 없으면 None, 경로별로 한 번만 읽음)"""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    return base64.b64encode(path.read_bytes()).decode()
@@ -0,0 +1,291 @@
+"""명령줄 일괄 채점
+
+Streamlit 화면 없이 여러 학생 답안 파일을 한 번에 채점합니다.
+파일 하나를 작업 하나로 보고 프로세스 풀에서 병렬로 채점하며,
+파일마다 채점 결과(표준점수/백분위/등급 포함), 과목별 오답 분포, 문항 분석을 저장하고
+처리 속도를 출력합니다.
+
+사용 예:
+    # 폴더 안의 모든 학생 답안 파일을 같은 정답 파일로 채점
+    python batch_grade.py answers/ --answers sample_answers.csv --info sample_student_info.csv -o results/
+
+    # 파일마다 정답/학생 정보/과목 종류가 다르면 목록 파일(CSV) 사용
+    python batch_grade.py --manifest nightly.csv -o results/ --workers 4
+
+목록 파일 컬럼: student_file, answer_file, info_file(선택), subject_type(선택)
+(상대 경로는 목록 파일 위치 기준)
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import pandas as pd
+
+from exports import (
+    build_item_analysis_workbook, build_results_workbook, build_wrong_distribution_workbook, iter_result_chunks, write_csv
+)
+from grading import ROW_LAYOUTS, SUBJECT_CODE_MAPPINGS, compile_answer_key, grade_chunks, wrong_answer_distribution
+from item_analysis import analyze_subject
+from loaders import iter_student_data_chunks, load_answer_data, load_student_info
+from standard_scores import DEFAULT_STANDARD_SCORE_SCALE, STANDARD_SCORE_SCALES, convert_scores
+
+# 폴더 모드에서 채점할 학생 답안 파일 확장자
+STUDENT_FILE_SUFFIXES = ('.csv', '.xlsx', '.xls')
+
+# 출력 파일 형식
+OUTPUT_FORMATS = ('xlsx', 'csv')
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """학생 답안 파일 하나의 채점 작업"""
+    student_file: Path
+    answer_file: Path
+    info_file: Path = None
+    subject_type: str = None
+    output_stem: str = None     # 결과 파일 이름 앞부분 (없으면 학생 답안 파일 이름)
+
+    @property
+    def output_name(self):
+        return self.output_stem or self.student_file.stem
+
+
+@dataclass
+class BatchResult:
+    """채점 작업 하나의 결과 요약"""
+    job: BatchJob
+    rows: int = 0
+    subjects: int = 0
+    seconds: float = 0.0
+    outputs: tuple = ()
+    issues: tuple = ()
+    error: str = None
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def assign_output_stems(jobs):
+    """결과 파일 이름이 겹치지 않도록 작업마다 output_stem 지정
+
+    파일 이름(확장자 제외)이 같은 작업(a.csv와 a.xlsx, 다른 폴더의 같은 이름 등)은
+    목록 순서대로 _2, _3 ...을 붙입니다. (대소문자만 다른 이름도 같은 이름으로 봄)
+    """
+    used_names = set()
+    assigned = []
+    for job in jobs:
+        stem = output_stem = job.student_file.stem
+        n = 1
+        while output_stem.lower() in used_names:
+            n += 1
+            output_stem = f"{stem}_{n}"
+        used_names.add(output_stem.lower())
+        assigned.append(replace(job, output_stem=output_stem))
+    return assigned
+
+
+def jobs_from_directory(student_dir, answer_file, info_file=None, subject_type=None):
+    """폴더 안의 학생 답안 파일마다 같은 정답/학생 정보로 작업 생성 (파일 이름 순)"""
+    # 같은 폴더에 정답/학생 정보 파일이 있어도 학생 답안으로 채점하지 않음
+    excluded = {Path(path).resolve() for path in (answer_file, info_file) if path}
+    paths = sorted(
+        path for path in Path(student_dir).iterdir()
+        if path.is_file() and path.suffix.lower() in STUDENT_FILE_SUFFIXES and path.resolve() not in excluded
+    )
+    return assign_output_stems(
+        BatchJob(path, Path(answer_file), Path(info_file) if info_file else None, subject_type) for path in paths
+    )
+
+
+def jobs_from_manifest(manifest_file, subject_type=None):
+    """목록 파일(CSV)의 행마다 작업 생성 (subject_type 컬럼이 비어 있으면 기본값 사용)"""
+    manifest_path = Path(manifest_file)
+    base_dir = manifest_path.parent
+    manifest = pd.read_csv(manifest_path, dtype=str, keep_default_na=False)
+
+    missing = {'student_file', 'answer_file'} - set(manifest.columns)
+    if missing:
+        raise ValueError(f"목록 파일에 필수 컬럼이 없습니다: {', '.join(sorted(missing))}")
+
+    def resolve(value):
+        value = value.strip()
+        return base_dir / value if value else None
+
+    jobs = []
+    for _, row in manifest.iterrows():
+        jobs.append(BatchJob(
+            student_file=resolve(row['student_file']),
+            answer_file=resolve(row['answer_file']),
+            info_file=resolve(row.get('info_file', '')),
+            subject_type=row.get('subject_type', '').strip() or subject_type,
+        ))
+    return assign_output_stems(jobs)
+
+
+def write_outputs(result_df, response_data, answer_key, output_dir, stem, file_format):
+    """채점 결과, 과목별 오답 분포, 문항 분석을 파일로 저장하고 저장한 경로 목록 반환
+
+    결과는 조각 단위로 파일에 바로 쓰므로 파일 전체 내용을 메모리에 만들지 않습니다.
+    """
+    subjects = list(response_data.subjects)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results_path = output_dir / f'{stem}_채점결과.{file_format}'
+    wrong_path = output_dir / f'{stem}_오답분포.{file_format}'
+    items_path = output_dir / f'{stem}_문항분석.{file_format}'
+
+    if file_format == 'xlsx':
+        build_results_workbook(result_df, response_data, subjects, results_path)
+        build_wrong_distribution_workbook(result_df, response_data, subjects, wrong_path)
+        build_item_analysis_workbook(result_df, response_data, answer_key, subjects, items_path)
+    else:
+        write_csv(iter_result_chunks(result_df, response_data), results_path)
+        # CSV는 시트가 없으므로 오답 분포/문항 분석을 과목코드/과목명 컬럼을 붙여 하나로 합침
+        distributions, analyses = [], []
+        for subject in subjects:
+            subject_name = result_df['과목명'].iat[response_data[subject].rows[0]]
+            wrong_df = wrong_answer_distribution(response_data[subject])
+            analysis_df = analyze_subject(result_df, response_data, answer_key, subject).round(3)
+            for df, frames in ((wrong_df, distributions), (analysis_df, analyses)):
+                df.insert(0, '과목명', subject_name)
+                df.insert(0, '과목코드', subject)
+                frames.append(df)
+        write_csv(pd.concat(distributions, ignore_index=True) if distributions else pd.DataFrame(), wrong_path)
+        write_csv(pd.concat(analyses, ignore_index=True) if analyses else pd.DataFrame(), items_path)
+
+    return str(results_path), str(wrong_path), str(items_path)
+
+
+def grade_file(job, output_dir, file_format='xlsx'):
+    """작업 하나 채점 (프로세스 풀에서 실행)
+
+    학생 답안은 조각 단위로 읽어 채점하므로 큰 파일도 메모리를 적게 사용합니다.
+    오류가 나도 예외를 던지지 않고 BatchResult.error에 담아 다른 파일 채점을 계속합니다.
+    """
+    result = BatchResult(job)
+    started = time.perf_counter()
+    try:
+        with open(job.answer_file, 'rb') as answer_file:
+            answer_hash = hashlib.sha256(answer_file.read()).hexdigest()
+            answer_file.seek(0)
+            answer_df = load_answer_data(answer_file)
+        # 같은 프로세스에서 같은 정답 파일이면 컴파일된 정답 재사용
+        answer_key = compile_answer_key(answer_df, answer_hash)
+
+        student_info_dict = None
+        issues = []
+        if job.info_file:
+            with open(job.info_file, 'rb') as info_file:
+                student_info_dict = load_student_info(info_file)
+            issues.extend(student_info_dict['issues'])
+
+        layout = ROW_LAYOUTS.get(job.subject_type)
+        subject_code_mapping = SUBJECT_CODE_MAPPINGS.get(job.subject_type, {})
+        with open(job.student_file, 'rb') as student_file:
+            result_df, response_data, grade_issues = grade_chunks(
+                iter_student_data_chunks(student_file, layout), answer_key, student_info_dict, subject_code_mapping
+            )
+        issues.extend(grade_issues)
+        scale = STANDARD_SCORE_SCALES.get(job.subject_type, DEFAULT_STANDARD_SCORE_SCALE)
+        result_df = result_df.join(convert_scores(result_df, scale).scores)
+
+        result.outputs = write_outputs(
+            result_df, response_data, answer_key, Path(output_dir), job.output_name, file_format
+        )
+        result.rows = len(result_df)
+        result.subjects = len(response_data.subjects)
+        result.issues = tuple(issues)
+    except Exception as e:
+        result.error = str(e)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def run_batch(jobs, output_dir, workers=None, file_format='xlsx', report=print):
+    """작업 목록을 프로세스 풀에서 채점 (작업 하나 = 파일 하나)
+
+    Args:
+        jobs: BatchJob 목록
+        output_dir: 결과 저장 폴더
+        workers: 프로세스 수 (None이면 CPU 수, 작업 수보다 많으면 작업 수로 제한)
+        file_format: 'xlsx' 또는 'csv'
+        report: 파일 하나가 끝날 때마다 요약 한 줄을 받는 함수
+
+    Returns:
+        list[BatchResult]: jobs와 같은 순서의 결과
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    results = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(grade_file, job, output_dir, file_format): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            report(format_result(result))
+    return results
+
+
+def format_result(result):
+    """파일별 처리 결과 요약 한 줄 (+ 경고/오류)"""
+    name = result.job.student_file.name
+    if result.job.output_name != result.job.student_file.stem:
+        name += f" → {result.job.output_name}_*"
+    if result.error:
+        return f"❌ {name}: 채점 실패 ({result.seconds:.2f}초)\n{result.error}"
+    lines = [
+        f"✅ {name}: {result.rows:,}행, {result.subjects}개 과목, "
+        f"{result.seconds:.2f}초 ({result.rows_per_second:,.0f}행/초)"
+    ]
+    lines.extend(f"   [{level}] {message.splitlines()[0]}" for level, message in result.issues)
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="학생 답안 파일 일괄 채점 (Streamlit 없이 실행)")
+    parser.add_argument('student_dir', nargs='?', help="학생 답안 파일(CSV/Excel)이 있는 폴더")
+    parser.add_argument('--manifest', help="작업 목록 CSV (student_file, answer_file, info_file, subject_type)")
+    parser.add_argument('--answers', help="정답 파일 (폴더 모드에서 필수)")
+    parser.add_argument('--info', help="학생 정보 파일 (선택)")
+    parser.add_argument('--subject-type', choices=sorted(SUBJECT_CODE_MAPPINGS), help="과목 종류 (과목명 매핑, 탐구 행 구조)")
+    parser.add_argument('-o', '--output', default='results', help="결과 저장 폴더 (기본값: results)")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본값: CPU 수)")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='xlsx', help="결과 파일 형식 (기본값: xlsx)")
+    args = parser.parse_args(argv)
+
+    if bool(args.manifest) == bool(args.student_dir):
+        parser.error("학생 답안 폴더 또는 --manifest 중 하나를 지정하세요")
+    if args.student_dir and not args.answers:
+        parser.error("폴더 모드에서는 --answers가 필요합니다")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.manifest:
+        jobs = jobs_from_manifest(args.manifest, args.subject_type)
+    else:
+        jobs = jobs_from_directory(args.student_dir, args.answers, args.info, args.subject_type)
+    if not jobs:
+        print("채점할 학생 답안 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    results = run_batch(jobs, args.output, args.workers, args.format)
+    elapsed = time.perf_counter() - started
+
+    total_rows = sum(result.rows for result in results)
+    failed = [result for result in results if result.error]
+    print(
+        f"\n📊 {len(results) - len(failed)}/{len(results)}개 파일, {total_rows:,}행, "
+        f"{elapsed:.2f}초 ({total_rows / elapsed if elapsed > 0 else 0:,.0f}행/초) → {args.output}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
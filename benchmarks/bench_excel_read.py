@@ -0,0 +1,87 @@
+"""Excel 읽기 벤치마크
+
+기존 경로(pd.read_excel, engine='openpyxl')와 loaders.read_excel_bytes의
+openpyxl 읽기 전용 경로, calamine 경로(python-calamine 설치 시)를 비교합니다.
+각 경로의 결과가 기존 경로와 같은지도 확인합니다.
+
+사용 예:
+    python benchmarks/bench_excel_read.py --rows 50000 --repeat 3
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import loaders  # noqa: E402
+
+
+def make_student_workbook(n_rows, n_questions=20, seed=0):
+    """학생 답안 형식의 Excel 파일 bytes 생성 (빈칸과 잘못된 답안 일부 포함)"""
+    rng = np.random.default_rng(seed)
+    answers = rng.integers(1, 6, size=(n_rows, n_questions)).astype(object)
+    answers[rng.random(answers.shape) < 0.02] = np.nan
+    answers[rng.random(answers.shape) < 0.005] = 'x'
+    df = pd.DataFrame(answers, columns=[f'{i}번' for i in range(1, n_questions + 1)])
+    df.insert(0, '과목코드', rng.choice(['1', '2', '3'], size=n_rows))
+    df.insert(0, '수험번호', np.arange(n_rows, dtype=np.int64) + 202400100000000)
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def read_with_openpyxl(data):
+    return pd.read_excel(io.BytesIO(data), engine='openpyxl')
+
+
+def read_with_read_only(data):
+    calamine_available = loaders.CALAMINE_AVAILABLE
+    loaders.CALAMINE_AVAILABLE = False
+    try:
+        return loaders.read_excel_bytes(data)
+    finally:
+        loaders.CALAMINE_AVAILABLE = calamine_available
+
+
+def read_with_calamine(data):
+    return pd.read_excel(io.BytesIO(data), engine='calamine')
+
+
+def best_time(read, data, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        df = read(data)
+        times.append(time.perf_counter() - started)
+    return min(times), df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Excel 읽기 경로 벤치마크")
+    parser.add_argument('--rows', type=int, default=20_000, help="학생 수 (기본값: 20000)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수, 가장 빠른 시간 사용 (기본값: 3)")
+    args = parser.parse_args(argv)
+
+    data = make_student_workbook(args.rows)
+    print(f"{args.rows:,}행 × 22열, {len(data) / 1024 / 1024:.1f}MB")
+
+    readers = [('pd.read_excel (openpyxl)', read_with_openpyxl), ('읽기 전용 openpyxl', read_with_read_only)]
+    if loaders.CALAMINE_AVAILABLE:
+        readers.append(('calamine', read_with_calamine))
+
+    baseline_seconds, baseline_df = None, None
+    for name, read in readers:
+        seconds, df = best_time(read, data, args.repeat)
+        if baseline_df is None:
+            baseline_seconds, baseline_df = seconds, df
+        pd.testing.assert_frame_equal(df, baseline_df)
+        print(f"{name:<28} {seconds:8.2f}초  {args.rows / seconds:>10,.0f}행/초  ×{baseline_seconds / seconds:.1f}")
+
+
+if __name__ == '__main__':
+    main()
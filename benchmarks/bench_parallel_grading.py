@@ -0,0 +1,142 @@
+"""과목별 병렬 채점 벤치마크
+
+synthetic_data로 만든 여러 과목 시험을 작업 프로세스 수(--workers)별로 채점해
+순차 채점(workers=1) 대비 배율을 측정합니다. 앱의 기본값(app.DEFAULT_GRADING_WORKERS)은
+순차 채점이며, 배포 환경의 CPU 수에서 이 벤치마크가 빨라지는 것을 확인한 경우에만 늘립니다.
+
+- 프로세스 풀은 grading.shard_executor가 처음 요청할 때 한 번 만들고 재사용하므로,
+  풀 시작 시간(첫 채점)과 이후 채점 시간(가장 빠른 반복)을 나누어 표시합니다.
+- 병렬 채점 결과가 순차 채점과 같은지도 확인합니다.
+
+사용 예:
+    python benchmarks/bench_parallel_grading.py --sizes 100000 400000 --workers 1 2 4
+    python benchmarks/bench_parallel_grading.py --sizes 200000 --subjects 1 2 3 4 5 6 --chunk-rows 50000
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import grading  # noqa: E402
+from grading import compile_answer_key, grade_chunks, grade_frame, shard_executor  # noqa: E402
+from loaders import load_answer_data, load_student_data  # noqa: E402
+from profiling import environment  # noqa: E402
+from bench_pipeline import open_file  # noqa: E402
+from synthetic_data import add_spec_arguments, generate_exam, spec_from_args, write_exam  # noqa: E402
+
+
+def grade_once(student_df, answer_key, layout_rows, workers, chunk_rows):
+    """채점 한 번 (chunk_rows가 있으면 그 행 수씩 나누어 grade_chunks)"""
+    if not chunk_rows:
+        return grade_frame(student_df, answer_key, workers=workers)
+    step = chunk_rows * layout_rows
+    chunks = (student_df.iloc[start:start + step] for start in range(0, len(student_df), step))
+    return grade_chunks(chunks, answer_key, workers=workers)
+
+
+def measure(run, repeat):
+    """첫 실행 시간(풀 시작 포함)과 이후 repeat번 중 가장 빠른 시간, 마지막 반환값"""
+    started = time.perf_counter()
+    value = run()
+    first = time.perf_counter() - started
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = run()
+        times.append(time.perf_counter() - started)
+    return first, min(times), value
+
+
+def same_result(left, right):
+    """두 채점 결과(result_df, ResponseData)가 같은지"""
+    (left_df, left_data, _), (right_df, right_data, _) = left, right
+    if not left_df.equals(right_df) or left_data.subjects.keys() != right_data.subjects.keys():
+        return False
+    return all(
+        (left_data[subject].correct == right_data[subject].correct).all()
+        for subject in left_data.subjects
+    )
+
+
+def run_size(args, students, output_dir):
+    """학생 수 하나에 대해 작업 프로세스 수별로 측정"""
+    exam = generate_exam(spec_from_args(args, students))
+    paths = write_exam(exam, output_dir)
+    layout = grading.TAMGU_LAYOUT if args.tamgu else None
+    student_df = load_student_data(open_file(paths['students']), layout=layout)
+    answer_key = compile_answer_key(load_answer_data(open_file(paths['answers'])))
+    layout_rows = layout.subjects_per_row if layout is not None else 1
+
+    results = []
+    baseline = None
+    for workers in args.workers:
+        first, seconds, value = measure(
+            lambda: grade_once(student_df, answer_key, layout_rows, workers, args.chunk_rows), args.repeat
+        )
+        if baseline is None:
+            baseline = (seconds, value)
+        results.append({
+            'size': students,
+            'rows': len(student_df),
+            'workers': workers,
+            'first_seconds': first,
+            'seconds': seconds,
+            'speedup': baseline[0] / seconds,
+            'same_result': same_result(baseline[1], value),
+        })
+    return results
+
+
+def format_result(result):
+    return (
+        f"workers={result['workers']:<3} 첫 채점 {result['first_seconds']:8.3f}초  "
+        f"채점 {result['seconds']:8.3f}초  {result['rows'] / result['seconds']:>12,.0f}행/초  "
+        f"×{result['speedup']:.2f}{'' if result['same_result'] else '  (결과 다름!)'}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="과목별 병렬 채점 벤치마크 (순차 채점 대비 배율)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 400_000],
+                        help="학생 수 목록 (기본값: 100000 400000)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help="작업 프로세스 수 목록, 첫 값이 비교 기준 (기본값: 1 2 4)")
+    parser.add_argument('--chunk-rows', type=int, default=0,
+                        help="스트리밍 채점처럼 이 행 수씩 나누어 채점 (기본값: 0, 한 번에 채점)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수, 가장 빠른 시간 사용 (기본값: 3)")
+    parser.add_argument('--json', type=Path, help="결과를 저장할 JSON 파일")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    env = environment()
+    print(f"CPU {env['cpu_count']}개, 작업 프로세스 시작 방식 {grading.SHARD_START_METHOD}, "
+          f"병렬 채점 최소 행 수 {grading.PARALLEL_MIN_ROWS:,}")
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for students in args.sizes:
+            print(f"\n학생 {students:,}명 ({'탐구' if args.tamgu else '일반'})")
+            for result in run_size(args, students, Path(temp_dir) / str(students)):
+                print(format_result(result))
+                results.append(result)
+
+    for workers in args.workers:
+        if workers > 1:
+            shard_executor(workers).shutdown()
+
+    if args.json:
+        report = {
+            'environment': env,
+            'start_method': grading.SHARD_START_METHOD,
+            'options': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+            'results': results,
+        }
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
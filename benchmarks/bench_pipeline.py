@@ -0,0 +1,248 @@
+"""채점 파이프라인 단계별 벤치마크
+
+synthetic_data로 만든 가상 시험 파일을 여러 크기로 채점하면서 단계마다
+걸린 시간(가장 빠른 반복), 처리량(행/초), 최대 할당 메모리(tracemalloc)를 측정합니다.
+시간은 tracemalloc 없이 재고, 메모리는 따로 한 번 더 실행해 잽니다.
+
+--json으로 결과를 저장하고 다음 실행에서 --compare로 넘기면 단계별 속도 변화를 함께 표시합니다.
+
+사용 예:
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000 --json before.json
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000 --compare before.json
+    python benchmarks/bench_pipeline.py --sizes 20000 --tamgu --format xlsx --encoding cp949
+"""
+import argparse
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+import unicodedata
+import warnings
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from exports import build_results_workbook, iter_result_chunks, write_csv  # noqa: E402
+from grading import (  # noqa: E402
+    ROW_LAYOUTS, SUBJECT_CODE_MAPPINGS, compile_answer_key, grade_chunks, grade_frame,
+    match_student_infos, wrong_answer_distribution,
+)
+from item_analysis import analyze_subject  # noqa: E402
+from loaders import iter_student_data_chunks, load_answer_data, load_student_data, load_student_info  # noqa: E402
+from profiling import environment  # noqa: E402
+from reports import subject_report_aggregates  # noqa: E402
+from rendering import render_statistics_report, statistics_report_aggregates  # noqa: E402
+from standard_scores import DEFAULT_STANDARD_SCORE_SCALE, STANDARD_SCORE_SCALES, convert_scores  # noqa: E402
+from synthetic_data import (  # noqa: E402
+    ENCODINGS, FILE_FORMATS, add_spec_arguments, generate_exam, spec_from_args, write_exam,
+)
+
+
+@dataclass
+class StageResult:
+    """단계 하나의 측정 결과"""
+    size: int           # 학생 수
+    stage: str
+    rows: int           # 처리한 행 수 (처리량 계산 기준)
+    seconds: float      # 가장 빠른 반복의 시간
+    peak_mb: float      # 최대 할당 메모리 (MB, 측정하지 않았으면 None)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else float('inf')
+
+
+def measure(run, repeat, trace_memory=True):
+    """run()을 repeat번 실행한 가장 빠른 시간과 (별도 실행의) 최대 할당 메모리, 마지막 반환값"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = run()
+        times.append(time.perf_counter() - started)
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            value = run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
+    return min(times), peak_mb, value
+
+
+def open_file(path):
+    """업로드 파일처럼 이름(.name)이 있는 파일 객체"""
+    buffer = io.BytesIO(Path(path).read_bytes())
+    buffer.name = Path(path).name
+    return buffer
+
+
+def pipeline_stages(paths, subject_type, render=True):
+    """(단계 이름, 처리 행 수 함수, 실행 함수) 목록 - 앞 단계 결과는 state에 담아 다음 단계에 넘김
+
+    app.py의 채점 흐름과 같은 순서: 파일 읽기 → 정답 컴파일 → 채점/매칭 → 환산 → 통계 → 내보내기 → 렌더링
+    처리 행 수는 단계를 실행한 뒤에 구합니다. (읽기 단계는 읽은 행 수)
+    """
+    layout = ROW_LAYOUTS.get(subject_type)
+    subject_code_mapping = SUBJECT_CODE_MAPPINGS.get(subject_type, {})
+    scale = STANDARD_SCORE_SCALES.get(subject_type, DEFAULT_STANDARD_SCORE_SCALE)
+    state = {}
+
+    def load_students():
+        state['student_df'] = load_student_data(open_file(paths['students']), layout=layout)
+
+    def load_answers():
+        state['answer_df'] = load_answer_data(open_file(paths['answers']))
+
+    def compile_key():
+        # 캐시 키(content_hash) 없이 매번 컴파일
+        state['answer_key'] = compile_answer_key(state['answer_df'])
+
+    def load_info():
+        state['student_info'] = load_student_info(open_file(paths['student_info']))
+
+    def match():
+        match_student_infos(state['student_df'].iloc[:, 0].to_numpy(), state['student_info'])
+
+    def grade():
+        state['result_df'], state['response_data'], _ = grade_frame(
+            state['student_df'], state['answer_key'], state['student_info'], subject_code_mapping
+        )
+
+    def grade_streaming():
+        grade_chunks(
+            iter_student_data_chunks(open_file(paths['students']), layout),
+            state['answer_key'], state['student_info'], subject_code_mapping,
+        )
+
+    def convert():
+        state['scores'] = convert_scores(state['result_df'], scale).scores
+
+    def subject_statistics():
+        # display_subject_statistics가 과목마다 만드는 표와 PDF 집계값
+        result_df, response_data = state['result_df'], state['response_data']
+        for subject in response_data.subjects:
+            subject_responses = response_data[subject]
+            wrong_answer_distribution(subject_responses)
+            analysis_df = analyze_subject(result_df, response_data, state['answer_key'], subject)
+            subject_report_aggregates(result_df.iloc[subject_responses.rows], subject_responses, analysis_df)
+
+    def export_excel():
+        response_data = state['response_data']
+        build_results_workbook(state['result_df'], response_data, list(response_data.subjects), io.BytesIO())
+
+    def export_csv():
+        write_csv(iter_result_chunks(state['result_df'], state['response_data']), io.BytesIO())
+
+    def render_statistics():
+        render_statistics_report(statistics_report_aggregates(state['result_df']))
+
+    def n_students():
+        return len(state['student_df'])
+
+    def n_answer_rows():
+        return len(state['answer_df'])
+
+    def n_info_rows():
+        return len(state['student_info']['by_student_id'])
+
+    def n_results():
+        return len(state['result_df'])
+
+    stages = [
+        ('학생 답안 읽기', n_students, load_students),
+        ('정답 읽기', n_answer_rows, load_answers),
+        ('정답 컴파일', n_answer_rows, compile_key),
+        ('학생 정보 읽기', n_info_rows, load_info),
+        ('학생 정보 매칭', n_students, match),
+        ('채점 (grade_frame)', n_students, grade),
+        ('스트리밍 채점 (읽기 포함)', n_students, grade_streaming),
+        ('표준점수 환산', n_results, convert),
+        ('과목별 통계', n_results, subject_statistics),
+        ('결과 Excel 내보내기', n_results, export_excel),
+        ('결과 CSV 내보내기', n_results, export_csv),
+    ]
+    if render:
+        stages.append(('통계 이미지 렌더링', n_results, render_statistics))
+    return stages
+
+
+def run_size(args, students, output_dir):
+    """학생 수 하나에 대해 파일을 만들고 단계별로 측정"""
+    exam = generate_exam(spec_from_args(args, students))
+    paths = write_exam(exam, output_dir, args.format, args.encoding)
+    subject_type = '탐구' if args.tamgu else None
+
+    results = []
+    for stage, count_rows, run in pipeline_stages(paths, subject_type, render=not args.no_render):
+        seconds, peak_mb, _ = measure(run, args.repeat, trace_memory=not args.no_memory)
+        results.append(StageResult(students, stage, count_rows(), seconds, peak_mb))
+    return results
+
+
+def load_baseline(path):
+    """이전 --json 결과 → {(학생 수, 단계): 시간}"""
+    records = json.loads(Path(path).read_text(encoding='utf-8'))['results']
+    return {(record['size'], record['stage']): record['seconds'] for record in records}
+
+
+def pad(text, width):
+    """한글(전각 문자)을 두 칸으로 세어 width 칸에 맞게 오른쪽을 공백으로 채움"""
+    text_width = sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in text)
+    return text + ' ' * max(width - text_width, 0)
+
+
+def format_result(result, baseline=None):
+    peak = f"{result.peak_mb:9.1f}MB" if result.peak_mb is not None else f"{'-':>9}  "
+    line = (
+        f"{pad(result.stage, 28)} {result.rows:>10,}행 {result.seconds:9.3f}초 "
+        f"{result.rows_per_second:>12,.0f}행/초 {peak}"
+    )
+    previous = (baseline or {}).get((result.size, result.stage))
+    if previous:
+        line += f"  ×{previous / result.seconds:.2f}"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="채점 파이프라인 단계별 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help="학생 수 목록 (기본값: 1000 10000 100000)")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수, 가장 빠른 시간 사용 (기본값: 3)")
+    parser.add_argument('--format', choices=FILE_FORMATS, default='csv', help="입력 파일 형식 (기본값: csv)")
+    parser.add_argument('--encoding', choices=ENCODINGS, default='utf-8', help="CSV 인코딩 (기본값: utf-8)")
+    parser.add_argument('--no-render', action='store_true', help="통계 이미지 렌더링 단계 제외")
+    parser.add_argument('--no-memory', action='store_true', help="메모리 측정 생략 (실행 시간 단축)")
+    parser.add_argument('--json', type=Path, help="결과를 저장할 JSON 파일")
+    parser.add_argument('--compare', type=Path, help="비교할 이전 --json 결과 (×배율 = 이전 시간 / 현재 시간)")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # 한글 폰트가 없는 환경의 matplotlib 글꼴 경고는 측정과 무관하므로 숨김
+    warnings.filterwarnings('ignore', message='Glyph .* missing from font')
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for students in args.sizes:
+            print(f"\n학생 {students:,}명 ({'탐구 ' if args.tamgu else ''}{args.format}, {args.encoding})")
+            for result in run_size(args, students, Path(temp_dir) / str(students)):
+                print(format_result(result, baseline))
+                results.append(result)
+
+    if args.json:
+        report = {
+            'environment': environment(),
+            'options': {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+            'results': [dict(asdict(result), rows_per_second=result.rows_per_second) for result in results],
+        }
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""벤치마크용 가상 시험 데이터 생성
+
+학생 답안, 정답/배점, 학생 정보 파일을 실제 업로드 파일과 같은 형식으로 만듭니다.
+학생 능력과 문항 난이도로 정답 확률을 정하므로(1모수 로지스틱) 점수 분포와
+문항 분석 결과가 실제 시험과 비슷하며, 빈칸·잘못된 답안·잘못된 행을 섞을 수 있습니다.
+
+- 일반 과목: 수험번호 | 과목코드 | 1번 ... N번 (한 행에 한 과목)
+- 탐구: 수험번호 | 과목코드1 | 과목코드2 | 1번 ... 40번 (grading.TAMGU_LAYOUT, 한 행에 두 과목)
+- 수험번호는 학번 + 전화번호 8자리이므로 학생 정보 파일과 매칭됩니다.
+
+사용 예:
+    python benchmarks/synthetic_data.py --students 100000 --out /tmp/exam
+    python benchmarks/synthetic_data.py --students 20000 --tamgu --format xlsx --encoding cp949 --out /tmp/tamgu
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grading import SUBJECT_CODE_MAPPINGS, TAMGU_LAYOUT  # noqa: E402
+
+FILE_FORMATS = ('csv', 'xlsx')
+ENCODINGS = ('utf-8', 'cp949')
+
+# 잘못된 답안으로 넣는 값 (범위 밖 번호, 문자, 중복 표기)
+INVALID_ANSWERS = ('6', '0', 'x', '1,3')
+
+# 정답지에 없는 과목코드 (잘못된 행)
+UNKNOWN_SUBJECT_CODE = '99'
+
+# 학생 정보 파일의 성/이름 글자
+FAMILY_NAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN_NAME_CHARS = '민서지현준우예은도하윤수연호진영성재경'
+
+
+@dataclass
+class ExamSpec:
+    """가상 시험 설정
+
+    Attributes:
+        students: 학생 수 (탐구는 행 하나에 두 과목이므로 채점 행은 두 배)
+        questions: 과목당 문항 수 (탐구는 TAMGU_LAYOUT.questions_per_subject로 고정)
+        subjects: 과목코드 목록 (None이면 일반 과목 '1'~'3', 탐구는 SUBJECT_CODE_MAPPINGS['탐구'] 전체)
+        tamgu: 탐구 두 과목 한 행 구조 여부
+        blank_ratio: 빈칸 답안 비율
+        invalid_ratio: 잘못된 답안(범위 밖 번호, 문자) 비율
+        bad_row_ratio: 잘못된 행 비율 (정답지에 없는 과목코드, 빈 과목코드)
+        info_ratio: 학생 정보 파일에 들어가는 학생 비율 (나머지는 매칭 실패)
+        seed: 난수 시드 (같은 설정이면 같은 파일)
+    """
+    students: int = 10_000
+    questions: int = 20
+    subjects: tuple = None
+    tamgu: bool = False
+    blank_ratio: float = 0.02
+    invalid_ratio: float = 0.005
+    bad_row_ratio: float = 0.001
+    info_ratio: float = 0.95
+    seed: int = 0
+
+    @property
+    def subject_codes(self):
+        if self.subjects:
+            return tuple(str(code) for code in self.subjects)
+        if self.tamgu:
+            return tuple(SUBJECT_CODE_MAPPINGS['탐구'])
+        return ('1', '2', '3')
+
+    @property
+    def questions_per_subject(self):
+        return TAMGU_LAYOUT.questions_per_subject if self.tamgu else self.questions
+
+
+@dataclass
+class SyntheticExam:
+    """generate_exam 결과 (업로드 파일과 같은 형식의 DataFrame)"""
+    students: pd.DataFrame
+    answers: pd.DataFrame
+    student_info: pd.DataFrame
+
+    @property
+    def n_graded_rows(self):
+        """채점 대상 행 수 (탐구는 과목 수만큼 늘어남, 잘못된 행 포함)"""
+        n_codes = sum(1 for column in self.students.columns if str(column).startswith('과목코드'))
+        return len(self.students) * n_codes
+
+
+def make_answer_key(spec, rng):
+    """정답/배점 DataFrame (과목번호 | 문항 | 정답 | 배점)과 과목별 문항 난이도"""
+    n_questions = spec.questions_per_subject
+    frames, difficulties = [], {}
+    for code in spec.subject_codes:
+        # 2·3·4점 문항을 섞되 탐구는 2·3점 문항 절반씩 (만점 50점)
+        if spec.tamgu:
+            points = rng.permutation(np.repeat([2, 3], [n_questions - n_questions // 2, n_questions // 2]))
+        else:
+            points = rng.choice([2, 3, 4], size=n_questions, p=[0.3, 0.5, 0.2])
+        frames.append(pd.DataFrame({
+            '과목번호': code,
+            '문항': np.arange(1, n_questions + 1),
+            '정답': rng.integers(1, 6, size=n_questions),
+            '배점': points,
+        }))
+        difficulties[code] = rng.normal(0, 1, size=n_questions)
+    return pd.concat(frames, ignore_index=True), difficulties
+
+
+def make_responses(key_answers, difficulty, ability, rng):
+    """학생 능력과 문항 난이도로 정한 확률에 따라 맞히거나 다른 번호를 고른 답안 행렬 (int8)"""
+    probability = 1 / (1 + np.exp(-1.7 * (ability[:, None] - difficulty[None, :])))
+    correct = rng.random(probability.shape) < probability
+    # 오답은 정답을 뺀 네 개 번호 중 하나
+    wrong = (key_answers[None, :] - 1 + rng.integers(1, 5, size=probability.shape)) % 5 + 1
+    return np.where(correct, key_answers[None, :], wrong).astype(np.int8)
+
+
+def add_noise(answer_values, spec, rng):
+    """답안 행렬에 빈칸과 잘못된 답안을 섞은 object 행렬"""
+    values = answer_values.astype(object)
+    noise = rng.random(values.shape)
+    values[noise < spec.blank_ratio] = np.nan
+    invalid = (noise >= spec.blank_ratio) & (noise < spec.blank_ratio + spec.invalid_ratio)
+    values[invalid] = rng.choice(INVALID_ANSWERS, size=int(invalid.sum()))
+    return values
+
+
+def make_student_ids(n_students, rng):
+    """학번(8자리)과 전화번호(8자리, 0으로 시작하지 않음)"""
+    student_numbers = (24_000_000 + np.arange(1, n_students + 1)).astype(str)
+    phones = rng.integers(10_000_000, 100_000_000, size=n_students).astype(str)
+    return student_numbers, phones
+
+
+def make_names(n_students, rng):
+    family = rng.choice(list(FAMILY_NAMES), size=n_students)
+    given = rng.choice(list(GIVEN_NAME_CHARS), size=(n_students, 2))
+    return [f + g1 + g2 for f, (g1, g2) in zip(family, given)]
+
+
+def generate_exam(spec):
+    """설정에 맞는 학생 답안/정답/학생 정보 DataFrame 생성
+
+    Returns:
+        SyntheticExam
+    """
+    rng = np.random.default_rng(spec.seed)
+    answer_df, difficulties = make_answer_key(spec, rng)
+    key_by_subject = {
+        code: group['정답'].to_numpy() for code, group in answer_df.groupby('과목번호', sort=False)
+    }
+    codes = np.array(spec.subject_codes, dtype=object)
+    n_students = spec.students
+    n_questions = spec.questions_per_subject
+    ability = rng.normal(0, 1, size=n_students)
+
+    # 학생별 과목 선택 (탐구는 서로 다른 두 과목)
+    n_slots = TAMGU_LAYOUT.subjects_per_row if spec.tamgu else 1
+    if spec.tamgu and len(codes) >= 2:
+        first = rng.integers(0, len(codes), size=n_students)
+        second = (first + rng.integers(1, len(codes), size=n_students)) % len(codes)
+        chosen = np.column_stack([first, second])
+    else:
+        chosen = rng.integers(0, len(codes), size=(n_students, n_slots))
+
+    answer_blocks = []
+    for slot in range(n_slots):
+        block = np.empty((n_students, n_questions), dtype=np.int8)
+        for index, code in enumerate(codes):
+            rows = np.flatnonzero(chosen[:, slot] == index)
+            block[rows] = make_responses(key_by_subject[code], difficulties[code], ability[rows], rng)
+        answer_blocks.append(block)
+    answer_values = add_noise(np.hstack(answer_blocks), spec, rng)
+
+    subject_columns = [codes[chosen[:, slot]] for slot in range(n_slots)]
+    for column in subject_columns:
+        bad = rng.random(n_students) < spec.bad_row_ratio
+        column[bad] = rng.choice(np.array([UNKNOWN_SUBJECT_CODE, np.nan], dtype=object), size=int(bad.sum()))
+
+    student_numbers, phones = make_student_ids(n_students, rng)
+    student_df = pd.DataFrame(
+        answer_values, columns=[f'{i}번' for i in range(1, n_questions * n_slots + 1)]
+    )
+    if spec.tamgu:
+        for slot in reversed(range(n_slots)):
+            student_df.insert(0, f'과목코드{slot + 1}', subject_columns[slot])
+    else:
+        student_df.insert(0, '과목코드', subject_columns[0])
+    student_df.insert(0, '수험번호', np.char.add(student_numbers, phones).astype(np.int64))
+
+    # 학생 정보는 일부 학생만, 순서를 섞어서
+    in_info = np.flatnonzero(rng.random(n_students) < spec.info_ratio)
+    in_info = rng.permutation(in_info)
+    info_df = pd.DataFrame({
+        '학번': student_numbers[in_info].astype(np.int64),
+        '전화번호': phones[in_info].astype(np.int64),
+        '이름': make_names(len(in_info), rng),
+    })
+    return SyntheticExam(student_df, answer_df, info_df)
+
+
+def write_table(df, path, encoding='utf-8'):
+    """확장자(.csv/.xlsx)에 맞게 저장 (CSV는 encoding 사용, UTF-8은 Excel용 BOM 포함)"""
+    path = Path(path)
+    if path.suffix == '.xlsx':
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig' if encoding == 'utf-8' else encoding)
+    return path
+
+
+def write_exam(exam, output_dir, file_format='csv', encoding='utf-8'):
+    """학생 답안/정답/학생 정보 파일 저장
+
+    Returns:
+        dict: 'students' / 'answers' / 'student_info' → 저장한 경로
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return {
+        name: write_table(df, output_dir / f'{name}.{file_format}', encoding)
+        for name, df in (('students', exam.students), ('answers', exam.answers), ('student_info', exam.student_info))
+    }
+
+
+def add_spec_arguments(parser):
+    """ExamSpec 설정 인자 추가 (bench_pipeline.py와 공유)"""
+    parser.add_argument('--questions', type=int, default=20, help="과목당 문항 수 (기본값: 20, 탐구는 20 고정)")
+    parser.add_argument('--subjects', nargs='+', help="과목코드 목록 (기본값: 1 2 3, 탐구는 11~27)")
+    parser.add_argument('--tamgu', action='store_true', help="탐구 두 과목 한 행 구조")
+    parser.add_argument('--blank-ratio', type=float, default=0.02, help="빈칸 답안 비율 (기본값: 0.02)")
+    parser.add_argument('--invalid-ratio', type=float, default=0.005, help="잘못된 답안 비율 (기본값: 0.005)")
+    parser.add_argument('--bad-row-ratio', type=float, default=0.001, help="잘못된 과목코드 행 비율 (기본값: 0.001)")
+    parser.add_argument('--info-ratio', type=float, default=0.95, help="학생 정보에 있는 학생 비율 (기본값: 0.95)")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드 (기본값: 0)")
+
+
+def spec_from_args(args, students):
+    return ExamSpec(
+        students=students,
+        questions=args.questions,
+        subjects=tuple(args.subjects) if args.subjects else None,
+        tamgu=args.tamgu,
+        blank_ratio=args.blank_ratio,
+        invalid_ratio=args.invalid_ratio,
+        bad_row_ratio=args.bad_row_ratio,
+        info_ratio=args.info_ratio,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크용 가상 시험 데이터 파일 생성")
+    parser.add_argument('--students', type=int, default=10_000, help="학생 수 (기본값: 10000)")
+    parser.add_argument('--format', choices=FILE_FORMATS, default='csv', help="파일 형식 (기본값: csv)")
+    parser.add_argument('--encoding', choices=ENCODINGS, default='utf-8', help="CSV 인코딩 (기본값: utf-8)")
+    parser.add_argument('--out', type=Path, required=True, help="저장 폴더")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    exam = generate_exam(spec_from_args(args, args.students))
+    paths = write_exam(exam, args.out, args.format, args.encoding)
+    for name, path in paths.items():
+        print(f"{name:<14} {path}  ({path.stat().st_size / 1024 / 1024:.1f}MB)")
+
+
+if __name__ == '__main__':
+    main()
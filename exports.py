@@ -0,0 +1,195 @@
+"""결과 파일 내보내기
+
+채점 결과와 과목별 오답 분포를 Excel/CSV로 만듭니다.
+Streamlit 다운로드 버튼(app.py)과 명령줄 일괄 채점(batch_grade.py)이 함께 사용합니다.
+
+DataFrame 전체를 한 번에 변환하지 않고 EXPORT_CHUNK_ROWS 행씩 써 내려가므로,
+행 수가 늘어도 변환 과정에서 추가로 쓰는 메모리는 조각 크기만큼입니다.
+(Excel은 openpyxl 쓰기 전용 모드, CSV는 조각별 to_csv)
+"""
+import codecs
+import io
+
+import pandas as pd
+from openpyxl import Workbook
+
+from grading import wrong_answer_distribution
+from item_analysis import analyze_subject
+
+# 내보내기 시 한 번에 변환하는 행 수
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def iter_frame_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    """DataFrame을 chunk_rows 행씩 나누어 반환 (복사 없이 iloc 조각)"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_result_chunks(result_df, response_data, positions=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """채점 결과를 조각 단위로 표시 형식(정답수 '17/20', 오답번호 컬럼)으로 바꿔 반환
+
+    Args:
+        result_df: 채점 결과 전체 또는 그 일부 (인덱스가 전체 결과의 행 위치)
+        response_data: 채점 시 함께 만든 ResponseData
+        positions: 내보낼 result_df 행 위치 (optional, 과목별 시트 등)
+        chunk_rows: 한 번에 변환하는 행 수
+    """
+    if positions is None:
+        chunks = iter_frame_chunks(result_df, chunk_rows)
+    else:
+        chunks = (result_df.iloc[positions[start:start + chunk_rows]] for start in range(0, len(positions), chunk_rows))
+    for chunk in chunks:
+        yield response_data.display_frame(chunk)
+
+
+def _as_chunks(frames):
+    """DataFrame 또는 DataFrame 조각 iterable을 (컬럼 목록, 조각 iterator)로 변환"""
+    if isinstance(frames, pd.DataFrame):
+        return list(frames.columns), iter_frame_chunks(frames)
+    chunks = iter(frames)
+    first = next(chunks, None)
+    if first is None:
+        return [], iter(())
+
+    def chained():
+        yield first
+        yield from chunks
+    return list(first.columns), chained()
+
+
+def _excel_rows(chunk):
+    # 결측값은 빈 셀로, numpy 값은 Python 값으로 변환
+    values = chunk.to_numpy(dtype=object)
+    values[pd.isna(values)] = None
+    return values.tolist()
+
+
+def write_excel(sheets, target):
+    """시트별 데이터를 Excel 파일로 쓰기 (openpyxl 쓰기 전용 모드)
+
+    Args:
+        sheets: 시트 이름 → DataFrame 또는 DataFrame 조각 iterable
+        target: 파일 경로 또는 쓰기 가능한 바이너리 파일 객체
+    """
+    workbook = Workbook(write_only=True)
+    for sheet_name, frames in sheets.items():
+        sheet = workbook.create_sheet(sheet_name)
+        columns, chunks = _as_chunks(frames)
+        if columns:
+            sheet.append([str(column) for column in columns])
+        for chunk in chunks:
+            for row in _excel_rows(chunk):
+                sheet.append(row)
+    workbook.save(target)
+
+
+def to_excel_bytes(sheets):
+    """시트 이름 → DataFrame(또는 조각 iterable) 딕셔너리를 Excel 파일 bytes로 변환"""
+    buffer = io.BytesIO()
+    write_excel(sheets, buffer)
+    return buffer.getvalue()
+
+
+def iter_csv_bytes(frames):
+    """DataFrame 또는 조각 iterable을 CSV bytes 조각으로 차례로 반환
+
+    첫 조각에만 UTF-8 BOM(Excel 한글 깨짐 방지)과 헤더를 붙입니다.
+    """
+    columns, chunks = _as_chunks(frames)
+    yield codecs.BOM_UTF8
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+    if header and columns:
+        # 데이터 행이 없으면 헤더만
+        yield pd.DataFrame(columns=columns).to_csv(index=False).encode('utf-8')
+
+
+def write_csv(frames, target):
+    """DataFrame 또는 조각 iterable을 CSV 파일로 쓰기 (UTF-8 BOM 포함)
+
+    Args:
+        frames: DataFrame 또는 DataFrame 조각 iterable
+        target: 파일 경로 또는 쓰기 가능한 바이너리 파일 객체
+    """
+    if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+        with open(target, 'wb') as file:
+            write_csv(frames, file)
+        return
+    for block in iter_csv_bytes(frames):
+        target.write(block)
+
+
+def to_csv_bytes(frames):
+    """DataFrame(또는 조각 iterable)을 CSV bytes로 변환 (Excel 한글 깨짐 방지를 위해 UTF-8 BOM 포함)"""
+    buffer = io.BytesIO()
+    write_csv(frames, buffer)
+    return buffer.getvalue()
+
+
+def subject_sheet_name(subject_df, subject, used_names=None):
+    """과목 시트 이름 (과목명, Excel 제한에 맞춰 최대 31자)
+
+    used_names를 주면 이미 쓴 이름(Excel처럼 대소문자 구분 없이)과 겹치지 않도록
+    31자 안에서 _2, _3 ...을 붙이고 새 이름을 used_names에 추가합니다.
+    """
+    subject_name = subject_df['과목명'].iloc[0] if '과목명' in subject_df.columns else str(subject)
+    sheet_name = str(subject_name)[:31]
+    if used_names is None:
+        return sheet_name
+    stem, n = sheet_name, 1
+    while sheet_name.lower() in used_names:
+        n += 1
+        sheet_name = f"{stem[:31 - len(str(n)) - 1]}_{n}"
+    used_names.add(sheet_name.lower())
+    return sheet_name
+
+
+def build_results_workbook(result_df, response_data, subjects, target=None):
+    """전체 채점결과 시트 + 과목별 채점결과 시트 Excel 생성
+
+    target을 주면 파일로 쓰고, 없으면 bytes를 반환합니다.
+    """
+    sheets = {'전체 채점결과': iter_result_chunks(result_df, response_data)}
+    used_names = {'전체 채점결과'}
+    for subject in subjects:
+        # 과목별 시트도 행 위치로 조각씩 잘라 쓰므로 과목 전체를 따로 복사하지 않음
+        rows = response_data[subject].rows
+        subject_name = subject_sheet_name(result_df.iloc[rows[:1]], subject, used_names)
+        sheets[subject_name] = iter_result_chunks(result_df, response_data, positions=rows)
+    if target is None:
+        return to_excel_bytes(sheets)
+    write_excel(sheets, target)
+
+
+def build_wrong_distribution_workbook(result_df, response_data, subjects, target=None):
+    """과목별 오답분포 시트 Excel 생성 (오답이 있는 과목만)
+
+    target을 주면 파일로 쓰고, 없으면 bytes를 반환합니다.
+    """
+    sheets, used_names = {}, set()
+    for subject in subjects:
+        all_wrong_df = wrong_answer_distribution(response_data[subject])
+        if len(all_wrong_df) > 0:
+            subject_df = result_df.iloc[response_data[subject].rows[:1]]
+            sheets[subject_sheet_name(subject_df, subject, used_names)] = all_wrong_df
+    if target is None:
+        return to_excel_bytes(sheets)
+    write_excel(sheets, target)
+
+
+def build_item_analysis_workbook(result_df, response_data, answer_key, subjects, target=None):
+    """과목별 문항 분석 시트 Excel 생성 (정답률, 변별도, 점이연상관, 선택지 분포)
+
+    target을 주면 파일로 쓰고, 없으면 bytes를 반환합니다.
+    """
+    sheets, used_names = {}, set()
+    for subject in subjects:
+        analysis_df = analyze_subject(result_df, response_data, answer_key, subject).round(3)
+        subject_df = result_df.iloc[response_data[subject].rows[:1]]
+        sheets[subject_sheet_name(subject_df, subject, used_names)] = analysis_df
+    if target is None:
+        return to_excel_bytes(sheets)
+    write_excel(sheets, target)
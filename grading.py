@@ -0,0 +1,1050 @@
+"""채점 엔진
+
+Streamlit UI와 분리된 순수 채점 로직입니다.
+과목코드별로 학생 답안을 하나의 응답 행렬로 만들고, 정답 벡터와 한 번에 비교한 뒤
+배점 벡터와의 행렬-벡터 곱으로 총점을 계산합니다.
+
+UI에 표시할 오류/경고는 직접 출력하지 않고 (level, message) 목록으로 반환합니다.
+"""
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from profiling import NULL_PROFILER
+
+# 빈칸 답안 코드 (어떤 정답과도 일치하지 않음)
+BLANK_CODE = -1
+
+# CSV 엔진이 bool로 읽을 수 있는 표기 → 비교용 토큰
+# (같은 열도 엔진이나 스트리밍 조각에 따라 bool 또는 문자열로 읽히므로 어느 쪽이든 같은 토큰으로 비교)
+BOOL_ANSWER_TOKENS = {
+    'True': 'True', 'TRUE': 'True', 'true': 'True',
+    'False': 'False', 'FALSE': 'False', 'false': 'False',
+}
+
+# 과목별 병렬 채점: 조각의 행 수가 이보다 적으면 프로세스 풀 없이 순차 채점
+PARALLEL_MIN_ROWS = 20_000
+
+# 작업 프로세스 풀(과목별 병렬 채점, 그래프/PDF 렌더링, 성적표) 시작 방식 (worker_context)
+# (Streamlit 서버처럼 스레드가 있는 프로세스를 fork하면 다른 스레드가 잡고 있던 잠금까지 복사되므로 fork는 쓰지 않음)
+SHARD_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# 결과의 학번/전화번호/이름 등 문자열 컬럼 타입 (Arrow 기반 문자열, 결측값은 NaN)
+try:
+    ARROW_STRING_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)  # pandas >= 2.3
+except TypeError:
+    ARROW_STRING_DTYPE = 'string[pyarrow_numpy]'  # pandas 2.2
+except ImportError:
+    ARROW_STRING_DTYPE = object  # pyarrow 미설치
+
+
+def normalize_answer(value):
+    """답안 값을 비교용 토큰으로 변환
+
+    기존 채점 규칙과 동일하게 공백을 제거한 뒤 숫자로 해석되면 float로,
+    그렇지 않으면 문자열로 비교합니다. (1, 1.0, "1", " 1 " 모두 동일 처리)
+    bool 값과 "True"/"TRUE"/"true" 같은 표기는 읽는 방법과 관계없이 같은 토큰('True'/'False')입니다.
+
+    Args:
+        value: 학생 답안 또는 정답 셀 값
+
+    Returns:
+        float | str | None: 비교용 토큰 (빈칸 또는 NaN이면 None)
+    """
+    if pd.isna(value):
+        return None
+    value_str = str(value).strip()
+    if value_str in BOOL_ANSWER_TOKENS:
+        return BOOL_ANSWER_TOKENS[value_str]
+    try:
+        number = float(value_str)
+    except ValueError:
+        return value_str
+    # 'nan' 문자열은 어떤 정답과도 일치하지 않음
+    if number != number:
+        return None
+    return number
+
+
+def encode_answers(values, vocab):
+    """답안 배열을 정수 코드 배열로 변환
+
+    같은 토큰은 같은 코드를 갖도록 vocab을 공유하며, 서로 다른 셀 값의 종류만큼만
+    normalize_answer를 호출합니다.
+
+    Args:
+        values: 답안 값 배열 (1차원 또는 2차원 numpy 배열)
+        vocab: 토큰 → 코드 딕셔너리 (필요 시 새 토큰이 추가됨)
+
+    Returns:
+        numpy.ndarray: values와 같은 모양의 int32 코드 배열 (빈칸은 BLANK_CODE)
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.full(values.shape, BLANK_CODE, dtype=np.int32)
+
+    flat = values.ravel()
+    if flat.dtype.kind not in 'iufO':
+        flat = flat.astype(object)
+    inverse, uniques = pd.factorize(flat, use_na_sentinel=True)
+    if flat.dtype == object:
+        inverse, uniques = split_bool_cells(flat, inverse, uniques)
+
+    lookup = np.empty(len(uniques) + 1, dtype=np.int32)
+    lookup[-1] = BLANK_CODE  # factorize의 NA 표시(-1)가 마지막 칸을 가리키도록
+    for i, raw in enumerate(uniques):
+        token = normalize_answer(raw)
+        if token is None:
+            lookup[i] = BLANK_CODE
+        else:
+            lookup[i] = vocab.setdefault(token, len(vocab))
+
+    return lookup[inverse].reshape(values.shape)
+
+
+_BOOL_TYPES = frozenset([bool, np.bool_])
+
+
+def split_bool_cells(flat, inverse, uniques):
+    """factorize가 1/0과 한 값으로 묶은 True/False 셀을 따로 분리
+
+    Python에서 True == 1이므로 object 배열의 bool 셀은 1(또는 0)과 같은 값으로 묶입니다.
+    1이나 0과 같은 값으로 묶인 셀만 타입을 확인하고, bool 셀이 있으면 'True'/'False'
+    문자열로 바꿔 다시 factorize합니다. (bool 셀이 없으면 입력을 그대로 반환)
+    """
+    suspects = [i for i, raw in enumerate(uniques) if not isinstance(raw, str) and (raw == 0 or raw == 1)]
+    if not suspects:
+        return inverse, uniques
+    is_suspect = np.zeros(len(uniques) + 1, dtype=bool)  # 마지막 칸은 factorize의 NA 표시(-1)
+    is_suspect[suspects] = True
+    cells = np.flatnonzero(is_suspect[inverse])
+    is_bool = np.fromiter(map(_BOOL_TYPES.__contains__, map(type, flat[cells])), dtype=bool, count=len(cells))
+    if not is_bool.any():
+        return inverse, uniques
+    flat = flat.copy()
+    flat[cells[is_bool]] = np.where(flat[cells[is_bool]].astype(bool), 'True', 'False').astype(object)
+    return pd.factorize(flat, use_na_sentinel=True)
+
+
+def answer_code_dtype(n_tokens):
+    """토큰 수에 맞는 가장 작은 답안 코드 정수 타입 (대부분의 과목은 int8)"""
+    for dtype in (np.int8, np.int16):
+        if n_tokens <= np.iinfo(dtype).max:
+            return dtype
+    return np.int32
+
+
+def grade_matrix(responses, key_codes, points):
+    """응답 행렬을 정답 벡터와 비교하여 채점
+
+    Args:
+        responses: (학생 수 × 문항 수) int 코드 행렬
+        key_codes: (문항 수,) 정답 코드 벡터
+        points: (문항 수,) float 배점 벡터
+
+    Returns:
+        tuple: (정답 여부 bool 행렬, 학생별 총점 float 벡터)
+    """
+    correct = (responses == key_codes[np.newaxis, :]) & (key_codes != BLANK_CODE)[np.newaxis, :]
+    scores = correct.astype(np.float64) @ points
+    return correct, scores
+
+
+def format_wrong_questions(correct):
+    """정답 여부 행렬에서 학생별 오답번호 문자열 생성
+
+    Args:
+        correct: (학생 수 × 문항 수) bool 행렬
+
+    Returns:
+        list: "3, 15" 형태의 문자열 목록 (오답이 없으면 '없음')
+    """
+    labels = np.arange(1, correct.shape[1] + 1).astype(str)
+    return [', '.join(labels[~row]) or '없음' for row in correct]
+
+
+@dataclass
+class SubjectKey:
+    """한 과목의 컴파일된 정답 (문항 번호 순)"""
+    subject: object
+    answers: list          # 원본 정답 값 (디버깅 표시용)
+    points_raw: list       # 원본 배점 값 (디버깅 표시용)
+    key_codes: np.ndarray  # 정규화된 정답 코드 (int32)
+    vocab: dict            # 정답 토큰 → 코드
+    points: np.ndarray     # float 배점
+    max_score: float
+    total_questions: int
+
+
+@dataclass
+class AnswerKey:
+    """정답 파일 전체를 과목별로 컴파일한 결과
+
+    정답 파일 하나당 한 번만 만들고 재채점 시 재사용합니다.
+    """
+    subjects: dict = field(default_factory=dict)  # 과목번호 → SubjectKey
+    issues: list = field(default_factory=list)    # 컴파일 중 발생한 오류 (배점 변환 등)
+
+    def __contains__(self, subject):
+        return subject in self.subjects
+
+    def __getitem__(self, subject):
+        return self.subjects[subject]
+
+    def keys(self):
+        return self.subjects.keys()
+
+
+# 정답 파일 내용 해시 → AnswerKey (최근 사용 순)
+ANSWER_KEY_CACHE_SIZE = 16
+_answer_key_cache = OrderedDict()
+
+
+def convert_points(subject, points, issues):
+    """배점을 float 벡터로 변환 (빈칸/inf 등 변환 실패 시 0점 처리 후 issues에 오류 추가)"""
+    points_numeric = np.zeros(len(points), dtype=np.float64)
+    for p_idx, p in enumerate(points):
+        try:
+            value = float(p)
+        except (ValueError, TypeError):
+            value = np.nan
+        if np.isfinite(value):
+            points_numeric[p_idx] = value
+        else:
+            issues.append(('error',
+                f"❌ 배점 변환 오류\n\n"
+                f"과목코드: {subject}, 문항: {p_idx + 1}번\n"
+                f"잘못된 배점 값: {'(빈칸)' if pd.isna(p) else repr(str(p))}\n\n"
+                f"해결방법:\n"
+                f"1. 정답 파일의 배점 컬럼에 숫자만 입력하세요\n"
+                f"2. 해당 문항의 배점을 수정하세요"
+            ))
+    return points_numeric
+
+
+def build_answer_key(answer_df):
+    """정답 데이터를 과목별로 컴파일 (과목번호 기준 groupby 한 번)
+
+    Args:
+        answer_df: load_answer_data로 읽은 정답/배점 DataFrame
+
+    Returns:
+        AnswerKey: 과목별 정답 코드, 배점, 만점, 문항 수
+    """
+    subject_col, question_col, answer_col, points_col = answer_df.columns[:4]
+    answer_key = AnswerKey()
+
+    for subject, subject_answers in answer_df.groupby(subject_col, sort=False):
+        # 문항 번호 순으로 정렬
+        subject_answers = subject_answers.sort_values(by=question_col, kind='stable')
+        answers = subject_answers[answer_col].tolist()
+        points_raw = subject_answers[points_col].tolist()
+        points = convert_points(subject, points_raw, answer_key.issues)
+
+        vocab = {}
+        key_codes = encode_answers(np.asarray(answers, dtype=object), vocab)
+        answer_key.subjects[subject] = SubjectKey(
+            subject=subject,
+            answers=answers,
+            points_raw=points_raw,
+            key_codes=key_codes,
+            vocab=vocab,
+            points=points,
+            max_score=float(points.sum()),
+            total_questions=len(answers),
+        )
+
+    return answer_key
+
+
+def compile_answer_key(answer_df, content_hash=None, profiler=NULL_PROFILER):
+    """정답 파일 내용 해시로 캐시된 AnswerKey 반환
+
+    같은 정답 파일로 다시 채점하면 컴파일을 건너뜁니다.
+
+    Args:
+        answer_df: 정답/배점 DataFrame
+        content_hash: 업로드된 정답 파일 내용의 해시 (없으면 캐시하지 않음)
+        profiler: 단계별 측정기 (profiling.StageProfiler, 캐시를 쓰지 않고 컴파일할 때만 기록)
+
+    Returns:
+        AnswerKey
+    """
+    if content_hash is None:
+        with profiler.stage('정답 컴파일', rows=len(answer_df)):
+            return build_answer_key(answer_df)
+
+    if content_hash in _answer_key_cache:
+        _answer_key_cache.move_to_end(content_hash)
+        return _answer_key_cache[content_hash]
+
+    with profiler.stage('정답 컴파일', rows=len(answer_df)):
+        answer_key = build_answer_key(answer_df)
+    _answer_key_cache[content_hash] = answer_key
+    if len(_answer_key_cache) > ANSWER_KEY_CACHE_SIZE:
+        _answer_key_cache.popitem(last=False)
+    return answer_key
+
+
+@dataclass
+class SubjectResponses:
+    """한 과목의 문항별 채점 결과 (result_df 옆에 보관)"""
+    subject: object
+    rows: np.ndarray       # result_df 내 행 위치
+    correct: np.ndarray    # (학생 수 × 문항 수) 정답 여부 bool 행렬
+    responses: np.ndarray  # (학생 수 × 문항 수) 학생 답안 코드
+    tokens: list           # 답안 코드 → 답안 토큰 (코드 순서)
+
+    def wrong_counts(self):
+        """문항별 오답 인원 (정답 여부 행렬의 열 합)"""
+        return len(self.rows) - self.correct.sum(axis=0)
+
+
+@dataclass
+class ResponseData:
+    """채점 결과 전체의 과목별 정답 여부 행렬
+
+    오답번호 문자열은 화면 표시나 다운로드가 필요할 때 한 번만 만듭니다.
+    """
+    n_rows: int
+    subjects: dict = field(default_factory=dict)  # 과목코드 → SubjectResponses
+    _wrong_questions: np.ndarray = field(default=None, repr=False)
+
+    def __contains__(self, subject):
+        return subject in self.subjects
+
+    def __getitem__(self, subject):
+        return self.subjects[subject]
+
+    def wrong_questions(self):
+        """result_df 행 순서의 오답번호 문자열 배열"""
+        if self._wrong_questions is None:
+            wrong_questions = np.empty(self.n_rows, dtype=object)
+            for subject_responses in self.subjects.values():
+                wrong_questions[subject_responses.rows] = format_wrong_questions(subject_responses.correct)
+            self._wrong_questions = wrong_questions
+        return self._wrong_questions
+
+    def with_wrong_questions(self, df):
+        """result_df(또는 그 부분집합)에 오답번호 컬럼을 붙인 사본 반환
+
+        df의 index는 result_df의 행 위치여야 합니다.
+        """
+        return df.assign(오답번호=self.wrong_questions()[df.index.to_numpy()])
+
+    def display_frame(self, df):
+        """화면 표시/다운로드용 사본
+
+        정수 정답수/문항수 컬럼을 '17/20' 형식의 정답수 문자열 하나로 합치고 오답번호 컬럼을 붙입니다.
+        df의 index는 result_df의 행 위치여야 합니다.
+        """
+        df = self.with_wrong_questions(df)
+        if '문항수' in df.columns:
+            correct_counts = df['정답수'].astype(str) + '/' + df['문항수'].astype(str)
+            df = df.drop(columns='문항수').assign(정답수=correct_counts)
+        return df
+
+
+def wrong_answer_distribution(subject_responses):
+    """과목의 문항별 오답 분포표
+
+    Args:
+        subject_responses: SubjectResponses
+
+    Returns:
+        pandas.DataFrame: 문항 번호 | 오답 인원 | 오답률 (오답이 많은 순, 오답 0명 문항 제외)
+    """
+    counts = subject_responses.wrong_counts()
+    questions = np.flatnonzero(counts) + 1
+    dist_df = pd.DataFrame({'문항 번호': questions, '오답 인원': counts[questions - 1]})
+    dist_df = dist_df.sort_values('오답 인원', ascending=False, kind='stable').reset_index(drop=True)
+    dist_df['오답률'] = (dist_df['오답 인원'] / len(subject_responses.rows) * 100).round(1).astype(str) + '%'
+    return dist_df
+
+
+@dataclass(frozen=True)
+class RowLayout:
+    """한 행에 여러 과목의 답안이 들어 있는 파일 구조
+
+    형식: 수험번호 | 과목코드1 | ... | 과목코드N | 과목1 답안 | ... | 과목N 답안
+    (각 과목의 답안 블록은 answers_start_col_idx부터 questions_per_subject개씩 연속)
+    """
+    name: str
+    student_id_col_idx: int
+    subject_code_col_idxs: tuple
+    answers_start_col_idx: int
+    questions_per_subject: int
+
+    @property
+    def subjects_per_row(self):
+        return len(self.subject_code_col_idxs)
+
+    @property
+    def min_columns(self):
+        """파일에 필요한 최소 컬럼 수"""
+        return self.answers_start_col_idx + self.questions_per_subject * self.subjects_per_row
+
+
+# 탐구: 수험번호 | 과목코드1 | 과목코드2 | 1~20번(과목1) | 21~40번(과목2)
+TAMGU_LAYOUT = RowLayout(
+    name='탐구',
+    student_id_col_idx=0,
+    subject_code_col_idxs=(1, 2),
+    answers_start_col_idx=3,
+    questions_per_subject=20,
+)
+
+# 과목 종류 → 다과목 행 구조 (여기에 없는 과목은 한 행에 한 과목)
+ROW_LAYOUTS = {
+    '탐구': TAMGU_LAYOUT,
+}
+
+# 과목 종류 → 과목코드 → 과목명
+SUBJECT_CODE_MAPPINGS = {
+    "국어": {
+        "1": "화법과 작문",
+        "2": "언어와 매체"
+    },
+    "수학": {
+        "1": "확률과 통계",
+        "2": "미분과 적분",
+        "3": "기하"
+    },
+    "영어": {
+        "1": "영어"
+    },
+    "한국사": {
+        "1": "한국사"
+    },
+    "탐구": {
+        # 사회탐구
+        "11": "생활과 윤리",
+        "12": "윤리와 사상",
+        "13": "한국지리",
+        "14": "세계지리",
+        "15": "동아시아사",
+        "16": "세계사",
+        "17": "경제",
+        "18": "정치와 법",
+        "19": "사회·문화",
+        # 과학탐구
+        "20": "물리학Ⅰ",
+        "21": "화학Ⅰ",
+        "22": "생명과학Ⅰ",
+        "23": "지구과학Ⅰ",
+        "24": "물리학Ⅱ",
+        "25": "화학Ⅱ",
+        "26": "생명과학Ⅱ",
+        "27": "지구과학Ⅱ"
+    }
+}
+
+
+def reshape_wide_to_long(df, layout):
+    """한 행에 여러 과목이 있는 DataFrame을 과목당 한 행으로 변환
+
+    답안 블록이 연속되어 있으므로 (학생 수 × 과목 수·문항 수) 배열을
+    (학생 수·과목 수 × 문항 수)로 reshape하여 한 번에 쌓습니다.
+    결과 행 순서는 학생1-과목1, 학생1-과목2, 학생2-과목1, ... 입니다.
+
+    Args:
+        df: 원본 학생 답안 DataFrame (컬럼 수 검증 완료)
+        layout: RowLayout
+
+    Returns:
+        pandas.DataFrame: 수험번호 | 과목코드 | 1번 ~ N번
+    """
+    n_subjects = layout.subjects_per_row
+    n_questions = layout.questions_per_subject
+    n_rows = len(df)
+
+    answers_end = layout.answers_start_col_idx + n_questions * n_subjects
+    answers = df.iloc[:, layout.answers_start_col_idx:answers_end].to_numpy()
+    answers = answers.reshape(n_rows * n_subjects, n_questions)
+
+    student_ids = np.repeat(df.iloc[:, layout.student_id_col_idx].to_numpy(), n_subjects)
+    subject_codes = df.iloc[:, list(layout.subject_code_col_idxs)].to_numpy().reshape(n_rows * n_subjects)
+
+    long_df = pd.DataFrame(answers, columns=[f'{i + 1}번' for i in range(n_questions)])
+    if answers.dtype == object:
+        long_df = long_df.infer_objects()
+    long_df.insert(0, '과목코드', subject_codes)
+    long_df.insert(0, '수험번호', student_ids)
+    return long_df
+
+
+def build_match_index(entries):
+    """학번/전화번호 딕셔너리로부터 길이별 매칭 색인 생성
+
+    수험번호의 앞(학번) 또는 뒤(전화번호) 몇 자리를 잘라 한 번의 조회로 찾을 수 있도록
+    키 길이별로 나누어 저장합니다. 여러 키가 동시에 맞으면 기존 순차 탐색과 같이
+    파일에서 먼저 나온 키를 우선하기 위해 순위(rank)를 함께 저장합니다.
+
+    Args:
+        entries: 키(학번 또는 전화번호) → 학생 정보 딕셔너리
+
+    Returns:
+        dict: {'ranks': {키 길이: {키: 순위}}, 'infos': [순위별 학생 정보]}
+    """
+    ranks = {}
+    infos = []
+    for rank, (key, info) in enumerate(entries.items()):
+        ranks.setdefault(len(key), {})[key] = rank
+        infos.append(info)
+    return {'ranks': ranks, 'infos': infos}
+
+
+def _best_match_rank(ids, match_index, from_end):
+    """수험번호별로 앞/뒤 자리가 일치하는 키 중 가장 높은 순위 (없으면 NaN)"""
+    best = pd.Series(np.nan, index=ids.index)
+    for length, keys in match_index['ranks'].items():
+        parts = ids.str[-length:] if from_end else ids.str[:length]
+        best = np.fmin(best, parts.map(keys).astype(np.float64))
+    return best
+
+
+def match_student_infos(student_ids, student_info_dict):
+    """수험번호 전체를 학생 정보와 한 번에 매칭
+
+    우선순위는 1) 완전 매칭(학번+전화번호) 2) 수험번호가 학번으로 시작
+    3) 수험번호가 전화번호로 끝남 입니다.
+
+    Args:
+        student_ids: 수험번호 목록
+        student_info_dict: load_student_info의 결과
+
+    Returns:
+        list: 수험번호별 매칭된 학생 정보 (매칭 실패 시 None)
+    """
+    student_id_index = student_info_dict.get('student_id_index')
+    if student_id_index is None:
+        student_id_index = build_match_index(student_info_dict['by_student_id'])
+    phone_index = student_info_dict.get('phone_index')
+    if phone_index is None:
+        phone_index = build_match_index(student_info_dict['by_phone'])
+
+    # 같은 수험번호는 한 번만 매칭
+    codes, unique_ids = pd.factorize(np.array([str(sid) for sid in student_ids], dtype=object))
+    ids = pd.Series(unique_ids, dtype=object)
+
+    by_full = student_info_dict['by_full']
+    matched = [by_full.get(sid) for sid in ids]
+
+    prefix_rank = _best_match_rank(ids, student_id_index, from_end=False)
+    suffix_rank = _best_match_rank(ids, phone_index, from_end=True)
+    for i in np.flatnonzero(prefix_rank.notna().to_numpy() | suffix_rank.notna().to_numpy()):
+        if matched[i] is not None:
+            continue
+        if not np.isnan(prefix_rank.iat[i]):
+            matched[i] = student_id_index['infos'][int(prefix_rank.iat[i])]
+        else:
+            matched[i] = phone_index['infos'][int(suffix_rank.iat[i])]
+
+    return [matched[code] for code in codes]
+
+
+def map_subject_name(subject, subject_code_mapping):
+    """과목코드를 과목명으로 변환 (정수와 문자열 모두 처리)"""
+    if not subject_code_mapping:
+        return subject
+    # 문자열로 변환하여 조회
+    subject_str = str(subject)
+    if subject_str in subject_code_mapping:
+        return subject_code_mapping[subject_str]
+    # 정수로 조회 (소수점 제거)
+    if isinstance(subject, (int, float, np.integer, np.floating)):
+        subject_int_str = str(int(subject))
+        if subject_int_str in subject_code_mapping:
+            return subject_code_mapping[subject_int_str]
+    return subject
+
+
+def grade_subject_answers(subject_key, answer_values, vocab):
+    """과목 하나의 학생 답안 배열을 채점
+
+    Args:
+        subject_key: SubjectKey
+        answer_values: (학생 수 × 답안 수) 원본 답안 배열 (정답 문항 수보다 많은 열은 잘라서 전달)
+        vocab: 토큰 → 코드 딕셔너리 (새 토큰이 추가됨)
+
+    Returns:
+        tuple: (답안 코드 행렬, 정답 여부 bool 행렬, 학생별 총점 float 벡터)
+    """
+    codes = encode_answers(answer_values, vocab)
+    responses = np.full((len(answer_values), subject_key.total_questions), BLANK_CODE, dtype=answer_code_dtype(len(vocab)))
+    responses[:, :answer_values.shape[1]] = codes
+    correct, scores = grade_matrix(responses, subject_key.key_codes, subject_key.points)
+    return responses, correct, scores
+
+
+# 작업 프로세스 수 → 과목별 병렬 채점 프로세스 풀 (프로세스마다 한 번만 만들어 모든 채점이 공유)
+_shard_executors = {}
+_shard_executors_lock = threading.Lock()
+
+
+def worker_context():
+    """작업 프로세스 풀에 넘길 multiprocessing 컨텍스트 (SHARD_START_METHOD, 모든 풀이 같은 규칙)"""
+    context = multiprocessing.get_context(SHARD_START_METHOD)
+    if SHARD_START_METHOD == 'forkserver':
+        # 작업 프로세스마다 numpy/pandas를 다시 import하지 않도록 forkserver에서 한 번만 import
+        context.set_forkserver_preload(['grading'])
+    return context
+
+
+def shard_executor(workers):
+    """과목별 병렬 채점 프로세스 풀 (처음 요청할 때 SHARD_START_METHOD로 생성)
+
+    풀은 정답에 묶이지 않으므로 세션·파일과 관계없이 같은 작업 프로세스 수의 풀을 재사용합니다.
+    """
+    with _shard_executors_lock:
+        executor = _shard_executors.get(workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=worker_context())
+            _shard_executors[workers] = executor
+        return executor
+
+
+def _grade_shard(subject_key, answer_values, vocab):
+    """작업 프로세스에서 과목 하나 채점 (vocab은 복사본이므로 갱신된 것을 함께 반환)"""
+    responses, correct, scores = grade_subject_answers(subject_key, answer_values, vocab)
+    return responses, correct, scores, vocab
+
+
+def compact_totals(values):
+    """점수 합계를 int32로 변환 (유한하지 않은 값이 있으면 잘못된 정수가 되지 않도록 float64 그대로 반환)"""
+    if np.isfinite(values).all():
+        return values.astype(np.int32)
+    return values
+
+
+def compact_strings(values):
+    """문자열 값 목록을 Arrow 기반 문자열 배열로 변환 (결측값은 NaN으로 유지)"""
+    return pd.array(np.asarray(values, dtype=object), dtype=ARROW_STRING_DTYPE)
+
+
+class IncrementalGrader:
+    """학생 답안을 여러 조각(chunk)으로 나누어 받아 채점 결과를 누적
+
+    조각마다 응답 행렬을 채점한 뒤 원본 답안은 버리고 점수와 정답 여부 행렬만 보관하므로,
+    큰 파일도 조각 크기만큼의 메모리로 채점할 수 있습니다.
+    한 번에 전체를 넣어도(grade_frame) 조각으로 나누어 넣어도 결과는 같습니다.
+
+    workers가 2 이상이면 조각을 과목코드별로 나누어 프로세스 풀(shard_executor)에서 동시에 채점합니다.
+    작업에는 과목 하나의 정답(SubjectKey)과 해당 과목 답안만 넘깁니다. PARALLEL_MIN_ROWS보다 작은
+    조각이나 과목이 하나뿐인 조각은 순차 채점하며, 어느 쪽이든 결과는 원래 행 순서 그대로입니다.
+
+    Args:
+        answer_key: compile_answer_key의 결과 (AnswerKey)
+        student_info_dict: load_student_info의 결과 (optional)
+        subject_code_mapping: 과목코드 → 과목명 매핑 (optional)
+        workers: 과목별 병렬 채점 프로세스 수 (None 또는 1이면 순차 채점)
+        profiler: 단계별 측정기 (profiling.StageProfiler, '채점'은 조각마다 누적)
+    """
+
+    def __init__(self, answer_key, student_info_dict=None, subject_code_mapping=None, workers=None,
+                 profiler=NULL_PROFILER):
+        self.answer_key = answer_key
+        self.student_info_dict = student_info_dict
+        self.subject_code_mapping = subject_code_mapping
+        self.workers = workers
+        self.profiler = profiler
+        self.n_graded = 0      # 지금까지 채점된 행 수 (result_df 행 수)
+        self.n_rows = 0        # 지금까지 받은 학생 답안 행 수
+
+        self._columns = {key: [] for key in ('수험번호', '과목코드', '총점', '만점', '정답수', '문항수')}
+        self._subject_parts = {}     # 과목코드 → [(result_df 행 위치, 정답 여부, 답안 코드), ...]
+        self._vocabs = {}            # 과목코드 → 조각 간 공유하는 답안 vocab
+        self._short_subjects = {}    # 과목코드 → [인원, 정답지 문항 수, 학생 답안 수]
+        self._unmatched = {}         # 과목코드 → [인원, 수험번호 예시]
+
+    def add_chunk(self, student_df):
+        """학생 답안 DataFrame 조각 하나를 채점하여 누적
+
+        Args:
+            student_df: 학생 답안 DataFrame (수험번호 | 과목코드 | 답안...)
+        """
+        with self.profiler.stage('채점', rows=len(student_df), accumulate=self.n_rows > 0):
+            self._grade_chunk(student_df)
+
+    def _grade_chunk(self, student_df):
+        id_col = student_df.columns[0]
+        subject_col = student_df.columns[1]
+        student_ids = student_df[id_col].to_numpy()
+        answer_values = student_df.iloc[:, 2:].to_numpy()
+        n_answer_cols = answer_values.shape[1]
+        n_rows = len(student_df)
+
+        matched = np.zeros(n_rows, dtype=bool)
+        total_scores = np.zeros(n_rows, dtype=np.float64)
+        max_scores = np.zeros(n_rows, dtype=np.float64)
+        correct_counts = np.zeros(n_rows, dtype=np.int64)
+        question_counts = np.zeros(n_rows, dtype=np.int64)
+        shards = []
+
+        subject_codes, subject_uniques = pd.factorize(student_df[subject_col], use_na_sentinel=True)
+        for code, subject in enumerate(subject_uniques):
+            rows = np.flatnonzero(subject_codes == code)
+            if subject not in self.answer_key:
+                self._add_unmatched(subject, student_ids[rows])
+                continue
+
+            total_questions = self.answer_key[subject].total_questions
+
+            # 학생 답안 수와 정답 문항 수 비교
+            if n_answer_cols < total_questions:
+                short = self._short_subjects.setdefault(subject, [0, total_questions, n_answer_cols])
+                short[0] += len(rows)
+
+            shards.append((subject, rows, answer_values[rows, :min(n_answer_cols, total_questions)]))
+
+        graded_subjects = []
+        for (subject, rows, _), (responses, correct, scores) in zip(shards, self._grade_shards(shards, n_rows)):
+            subject_key = self.answer_key[subject]
+            matched[rows] = True
+            total_scores[rows] = scores
+            max_scores[rows] = subject_key.max_score
+            correct_counts[rows] = correct.sum(axis=1)
+            question_counts[rows] = subject_key.total_questions
+            graded_subjects.append((subject, rows, correct, responses))
+
+        # NaN 과목코드 (정답과 매칭 불가)
+        if (subject_codes == -1).any():
+            self._add_unmatched(np.nan, student_ids[subject_codes == -1])
+
+        # 학생 답안 행 위치 → result_df 행 위치
+        result_positions = self.n_graded + np.cumsum(matched) - 1
+        for subject, rows, correct, responses in graded_subjects:
+            self._subject_parts.setdefault(subject, []).append((result_positions[rows], correct, responses))
+
+        rows = np.flatnonzero(matched)
+        self._columns['수험번호'].append(student_ids[rows])
+        self._columns['과목코드'].append(student_df[subject_col].to_numpy()[rows])
+        self._columns['총점'].append(total_scores[rows])
+        self._columns['만점'].append(max_scores[rows])
+        self._columns['정답수'].append(correct_counts[rows])
+        self._columns['문항수'].append(question_counts[rows])
+        self.n_graded += len(rows)
+        self.n_rows += n_rows
+
+    def _vocab(self, subject):
+        # 정답 vocab은 공유 객체이므로 복사본에 학생 답안 토큰을 추가 (조각 간에는 공유)
+        if subject not in self._vocabs:
+            self._vocabs[subject] = dict(self.answer_key[subject].vocab)
+        return self._vocabs[subject]
+
+    def _grade_shards(self, shards, n_rows):
+        """과목별 답안 묶음을 채점하여 shards 순서대로 (답안 코드, 정답 여부, 총점) 목록 반환"""
+        if not self.workers or self.workers < 2 or n_rows < PARALLEL_MIN_ROWS or len(shards) < 2:
+            return [grade_subject_answers(self.answer_key[subject], values, self._vocab(subject))
+                    for subject, _, values in shards]
+
+        executor = shard_executor(self.workers)
+        futures = [executor.submit(_grade_shard, self.answer_key[subject], values, self._vocab(subject))
+                   for subject, _, values in shards]
+        graded = []
+        for (subject, _, _), future in zip(shards, futures):
+            responses, correct, scores, self._vocabs[subject] = future.result()
+            graded.append((responses, correct, scores))
+        return graded
+
+    def _add_unmatched(self, subject, student_ids):
+        key = None if pd.isna(subject) else subject
+        unmatched = self._unmatched.setdefault(key, [0, []])
+        unmatched[0] += len(student_ids)
+        unmatched[1].extend(student_ids[:5 - len(unmatched[1])])
+
+    def issues(self):
+        """누적된 오류/경고 목록 [(level, message), ...]"""
+        issues = list(self.answer_key.issues)
+
+        for subject, (count, total_questions, n_answer_cols) in self._short_subjects.items():
+            issues.append(('warning',
+                f"⚠️ 답안 부족 경고\n\n"
+                f"과목: {subject} ({count}명)\n"
+                f"정답지 문항 수: {total_questions}개\n"
+                f"학생 답안 수: {n_answer_cols}개\n\n"
+                f"누락된 {total_questions - n_answer_cols}개 문항은 오답 처리됩니다."
+            ))
+
+        available_subjects = ', '.join([str(s) for s in self.answer_key.keys()])
+        for subject, (count, sample_ids) in self._unmatched.items():
+            subject = np.nan if subject is None else subject
+            issues.append(('error',
+                f"❌ 과목코드 매칭 오류\n\n"
+                f"학생 답안의 과목코드 '{subject}'에 해당하는 정답이 없습니다.\n"
+                f"수험번호: {', '.join(map(str, sample_ids))}{' 외' if count > 5 else ''} ({count}명)\n\n"
+                f"정답 파일에 있는 과목코드: {available_subjects}\n\n"
+                f"해결방법:\n"
+                f"1. 정답 파일에 과목코드 '{subject}'의 정답을 추가하세요\n"
+                f"2. 학생 답안 파일의 과목코드가 올바른지 확인하세요\n"
+                f"3. 과목코드가 정확히 일치하는지 확인하세요 (대소문자, 공백 주의)"
+            ))
+        return issues
+
+    def finish(self):
+        """누적된 채점 결과를 합쳐 반환
+
+        Returns:
+            tuple: (채점 결과 DataFrame, ResponseData, [(level, message), ...] 오류/경고 목록)
+        """
+        def concat(key, dtype=None):
+            parts = self._columns[key]
+            if not parts:
+                return np.array([], dtype=dtype or object)
+            return np.concatenate(parts)
+
+        student_ids = concat('수험번호')
+        if student_ids.dtype == object:
+            student_ids = compact_strings(student_ids)
+        result_df = pd.DataFrame({'수험번호': student_ids})
+
+        # 학생 정보 매칭 (3가지 방식 시도)
+        if self.student_info_dict:
+            with self.profiler.stage('학생 정보 매칭', rows=len(result_df)):
+                matched_infos = match_student_infos(result_df['수험번호'], self.student_info_dict)
+            if any(info is not None for info in matched_infos):
+                for key in ['학번', '전화번호', '이름']:
+                    result_df[key] = compact_strings([info[key] if info is not None else np.nan for info in matched_infos])
+
+        # 과목명 매핑 (과목코드 종류별로 한 번만 계산)
+        subjects = concat('과목코드')
+        subject_names = {}
+        for subject in pd.unique(subjects):
+            subject_names[subject] = map_subject_name(subject, self.subject_code_mapping)
+        if len({type(name) for name in subject_names.values()}) > 1:
+            # 매핑에 없는 과목코드(숫자)와 과목명(문자열)이 섞이면 범주형을 Arrow/Parquet으로 바꿀 수 없으므로 문자열로 통일
+            subject_names = {subject: str(name) for subject, name in subject_names.items()}
+
+        # 과목코드/과목명은 종류가 적으므로 범주형, 점수와 문항 수는 작은 정수형으로 보관
+        # (정답수는 '17/20' 문자열 대신 정답수/문항수 두 정수 컬럼, 표시할 때 ResponseData.display_frame으로 합침)
+        result_df['과목코드'] = pd.Categorical(subjects)
+        result_df['과목명'] = pd.Categorical([subject_names[s] for s in subjects])
+        result_df['총점'] = compact_totals(concat('총점', np.float64))
+        result_df['만점'] = compact_totals(concat('만점', np.float64))
+        result_df['정답수'] = concat('정답수', np.int64).astype(np.int16)
+        result_df['문항수'] = concat('문항수', np.int64).astype(np.int16)
+
+        response_data = ResponseData(n_rows=len(result_df))
+        for subject, parts in self._subject_parts.items():
+            response_data.subjects[subject] = SubjectResponses(
+                subject=subject,
+                rows=np.concatenate([rows for rows, _, _ in parts]),
+                correct=np.concatenate([correct for _, correct, _ in parts]),
+                responses=np.concatenate([responses for _, _, responses in parts]),
+                tokens=list(self._vocabs[subject]),
+            )
+
+        return result_df, response_data, self.issues()
+
+
+def grade_frame(student_df, answer_key, student_info_dict=None, subject_code_mapping=None, workers=None,
+                profiler=NULL_PROFILER):
+    """학생 답안 DataFrame 전체를 과목코드 단위로 채점
+
+    Args:
+        student_df: 학생 답안 DataFrame (수험번호 | 과목코드 | 답안...)
+        answer_key: compile_answer_key의 결과 (AnswerKey)
+        student_info_dict: load_student_info의 결과 (optional)
+        subject_code_mapping: 과목코드 → 과목명 매핑 (optional)
+        workers: 과목별 병렬 채점 프로세스 수 (optional, IncrementalGrader 참고)
+        profiler: 단계별 측정기 (optional, profiling.StageProfiler)
+
+    Returns:
+        tuple: (채점 결과 DataFrame, ResponseData, [(level, message), ...] 오류/경고 목록)
+            채점 결과에는 오답번호 컬럼이 없으며 ResponseData.with_wrong_questions로 붙입니다.
+    """
+    grader = IncrementalGrader(answer_key, student_info_dict, subject_code_mapping, workers, profiler)
+    grader.add_chunk(student_df)
+    return grader.finish()
+
+
+def grade_chunks(chunks, answer_key, student_info_dict=None, subject_code_mapping=None, progress=None, workers=None,
+                 profiler=NULL_PROFILER):
+    """학생 답안 조각들을 도착하는 대로 채점 (스트리밍 채점)
+
+    Args:
+        chunks: 학생 답안 DataFrame 조각을 차례로 내놓는 iterable
+        answer_key: compile_answer_key의 결과 (AnswerKey)
+        student_info_dict: load_student_info의 결과 (optional)
+        subject_code_mapping: 과목코드 → 과목명 매핑 (optional)
+        progress: 조각마다 호출되는 함수 progress(grader) (optional)
+        workers: 과목별 병렬 채점 프로세스 수 (optional, IncrementalGrader 참고)
+        profiler: 단계별 측정기 (optional, profiling.StageProfiler)
+
+    Returns:
+        tuple: grade_frame과 같은 (채점 결과 DataFrame, ResponseData, 오류/경고 목록)
+    """
+    grader = IncrementalGrader(answer_key, student_info_dict, subject_code_mapping, workers, profiler)
+    for chunk in chunks:
+        grader.add_chunk(chunk)
+        if progress is not None:
+            progress(grader)
+    return grader.finish()
+
+
+def map_key_codes(subject_key, token_codes):
+    """정답 코드를 학생 답안 코드 체계로 변환
+
+    Args:
+        subject_key: SubjectKey
+        token_codes: 답안 토큰 → 답안 코드 딕셔너리 (답안에 없는 정답 토큰은 새 코드로 추가됨)
+
+    Returns:
+        numpy.ndarray: 문항별 정답의 답안 코드 (빈칸 정답은 BLANK_CODE)
+    """
+    key_tokens = list(subject_key.vocab)  # vocab은 코드 순서로 추가됨
+    return np.array([
+        BLANK_CODE if code == BLANK_CODE else token_codes.setdefault(key_tokens[code], len(token_codes))
+        for code in subject_key.key_codes
+    ], dtype=np.int32)
+
+
+def diff_answer_keys(old_key, new_key):
+    """두 정답 사이에서 정답 또는 배점이 바뀐 문항 찾기
+
+    Args:
+        old_key: 채점에 사용한 AnswerKey
+        new_key: 정정된 AnswerKey
+
+    Returns:
+        tuple: (과목코드 → 바뀐 문항 위치(0부터) 배열, [(level, message), ...] 재채점할 수 없는 과목 경고)
+    """
+    changes = {}
+    issues = []
+    for subject, new_subject_key in new_key.subjects.items():
+        if subject not in old_key:
+            issues.append(('warning', f"⚠️ 과목코드 {subject}는 기존 채점 결과에 없어 재채점하지 않았습니다."))
+            continue
+        old_subject_key = old_key[subject]
+        if old_subject_key.total_questions != new_subject_key.total_questions:
+            issues.append(('warning',
+                f"⚠️ 과목코드 {subject}의 문항 수가 바뀌었습니다 "
+                f"({old_subject_key.total_questions}개 → {new_subject_key.total_questions}개)\n\n"
+                f"문항 수가 바뀐 과목은 정답 정정 재채점을 할 수 없습니다. 학생 답안 파일과 함께 다시 채점하세요."
+            ))
+            continue
+        token_codes = dict(old_subject_key.vocab)
+        answers_changed = map_key_codes(new_subject_key, token_codes) != old_subject_key.key_codes
+        old_points, new_points = old_subject_key.points, new_subject_key.points
+        points_changed = (old_points != new_points) & ~(np.isnan(old_points) & np.isnan(new_points))
+        questions = np.flatnonzero(answers_changed | points_changed)
+        if len(questions):
+            changes[subject] = questions
+    for subject in old_key.keys():
+        if subject not in new_key:
+            issues.append(('warning', f"⚠️ 과목코드 {subject}가 정정된 정답 파일에 없어 기존 채점 결과를 유지합니다."))
+    return changes, issues
+
+
+@dataclass
+class RegradeResult:
+    """정답 정정 재채점 결과"""
+    result_df: pd.DataFrame
+    response_data: ResponseData
+    answer_key: AnswerKey          # 재채점에 사용한 정답 (재채점하지 못한 과목은 기존 정답)
+    changed_questions: pd.DataFrame  # 바뀐 문항과 정답 여부가 바뀐 학생 수
+    changed_students: pd.DataFrame   # 총점이 바뀐 학생 (index는 result_df 행 위치)
+    issues: list
+
+
+def regrade(result_df, response_data, old_key, new_key):
+    """보관한 답안 코드 행렬로 바뀐 문항만 다시 채점
+
+    정답 또는 배점이 바뀐 문항 열만 새 정답과 비교하고, 정답 여부가 바뀌었거나
+    배점이 바뀐 문항을 맞힌 학생만 총점/정답수/오답번호를 다시 계산합니다.
+    결과는 학생 답안 파일 전체를 새 정답으로 다시 채점한 것과 같습니다.
+
+    Args:
+        result_df: 채점 결과 DataFrame
+        response_data: 채점 시 함께 만든 ResponseData
+        old_key: 채점에 사용한 AnswerKey
+        new_key: 정정된 AnswerKey
+
+    Returns:
+        RegradeResult (입력 result_df와 response_data는 바꾸지 않음)
+    """
+    changes, issues = diff_answer_keys(old_key, new_key)
+    issues = list(new_key.issues) + issues
+
+    answer_key = AnswerKey(subjects=dict(old_key.subjects), issues=list(new_key.issues))
+    for subject, new_subject_key in new_key.subjects.items():
+        if subject in old_key and old_key[subject].total_questions == new_subject_key.total_questions:
+            answer_key.subjects[subject] = new_subject_key
+
+    scores = result_df['총점'].to_numpy().copy()
+    correct_counts = result_df['정답수'].to_numpy().copy()
+    max_scores = result_df['만점'].to_numpy().copy()
+    old_scores = result_df['총점'].to_numpy()
+    new_response_data = ResponseData(n_rows=response_data.n_rows, subjects=dict(response_data.subjects))
+    wrong_questions = response_data._wrong_questions
+    if wrong_questions is not None:
+        wrong_questions = wrong_questions.copy()
+
+    question_records = []
+    for subject, questions in changes.items():
+        if subject not in response_data:
+            continue  # 정답에는 있지만 응시한 학생이 없는 과목
+        subject_responses = response_data[subject]
+        old_subject_key, new_subject_key = old_key[subject], new_key[subject]
+
+        token_codes = {token: code for code, token in enumerate(subject_responses.tokens)}
+        new_codes = map_key_codes(new_subject_key, token_codes)[questions]
+        old_columns = subject_responses.correct[:, questions]
+        new_columns = (subject_responses.responses[:, questions] == new_codes) & (new_codes != BLANK_CODE)
+
+        old_points, new_points = old_subject_key.points[questions], new_subject_key.points[questions]
+        points_changed = (old_points != new_points) & ~(np.isnan(old_points) & np.isnan(new_points))
+        flipped = old_columns != new_columns
+        affected = flipped.any(axis=1) | (new_columns & points_changed).any(axis=1)
+
+        correct = subject_responses.correct.copy()
+        correct[:, questions] = new_columns
+        rows = subject_responses.rows[affected]
+        scores[rows] = (correct[affected].astype(np.float64) @ new_subject_key.points).astype(scores.dtype)
+        correct_counts[rows] = correct[affected].sum(axis=1)
+        max_scores[subject_responses.rows] = np.float64(new_subject_key.max_score).astype(max_scores.dtype)
+        if wrong_questions is not None:
+            wrong_questions[rows] = format_wrong_questions(correct[affected])
+
+        new_response_data.subjects[subject] = SubjectResponses(
+            subject=subject,
+            rows=subject_responses.rows,
+            correct=correct,
+            responses=subject_responses.responses,
+            tokens=list(token_codes),
+        )
+        for question, n_flipped in zip(questions, flipped.sum(axis=0)):
+            question_records.append({
+                '과목코드': subject,
+                '문항 번호': question + 1,
+                '이전 정답': old_subject_key.answers[question],
+                '새 정답': new_subject_key.answers[question],
+                '이전 배점': old_subject_key.points[question],
+                '새 배점': new_subject_key.points[question],
+                '정답 여부 변경 인원': int(n_flipped),
+            })
+
+    new_response_data._wrong_questions = wrong_questions
+    new_result_df = result_df.assign(총점=scores, 만점=max_scores, 정답수=correct_counts)
+
+    changed = np.flatnonzero(scores != old_scores)
+    id_columns = [column for column in ('이름', '학번', '수험번호', '과목코드', '과목명') if column in result_df.columns]
+    changed_students = result_df.iloc[changed][id_columns].assign(
+        **{'이전 총점': old_scores[changed], '새 총점': scores[changed], '변동': scores[changed] - old_scores[changed]}
+    )
+
+    return RegradeResult(
+        result_df=new_result_df,
+        response_data=new_response_data,
+        answer_key=answer_key,
+        changed_questions=pd.DataFrame(question_records, columns=[
+            '과목코드', '문항 번호', '이전 정답', '새 정답', '이전 배점', '새 배점', '정답 여부 변경 인원'
+        ]),
+        changed_students=changed_students,
+        issues=issues,
+    )
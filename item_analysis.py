@@ -0,0 +1,126 @@
+"""문항 분석
+
+과목별 답안 코드 행렬과 정답 여부 행렬로 문항마다 다음을 한 번에 계산합니다.
+
+- 선택지 분포: 1~5번 선택 인원, 그 밖의 답(기타), 무응답
+- 정답률(난이도 p): 정답 인원 / 응시 인원
+- 변별도(D): 총점 상위 27% 집단 정답률 - 하위 27% 집단 정답률
+- 점이연상관(r_pb): 문항 정답 여부(0/1)와 총점의 상관계수 (총점에 해당 문항 포함)
+
+학생별 반복 없이 과목당 행렬 연산 몇 번으로 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from grading import BLANK_CODE
+
+# 선택지 분포에 따로 세는 답 (그 밖의 답은 '기타')
+CHOICES = (1, 2, 3, 4, 5)
+
+# 변별도 계산 시 상위/하위 집단 비율
+GROUP_RATIO = 0.27
+
+CHOICE_COLUMNS = [f'선택 {choice}' for choice in CHOICES] + ['기타', '무응답']
+ITEM_ANALYSIS_COLUMNS = ['문항 번호', '정답', '정답률', '변별도', '점이연상관'] + CHOICE_COLUMNS
+
+
+def answer_labels(subject_key):
+    """문항별 정답 표시 문자열 (정수 답은 '3'처럼 소수점 없이, 빈 정답은 빈 문자열)"""
+    key_tokens = list(subject_key.vocab)
+    labels = []
+    for code in subject_key.key_codes:
+        token = None if code == BLANK_CODE else key_tokens[code]
+        if token is None:
+            labels.append('')
+        elif isinstance(token, float):
+            labels.append(f'{token:g}')
+        else:
+            labels.append(str(token))
+    return labels
+
+
+def choice_distribution(responses, tokens):
+    """문항별 선택지 분포
+
+    Args:
+        responses: (학생 수 × 문항 수) 답안 코드 행렬 (빈칸은 BLANK_CODE)
+        tokens: 답안 코드 → 답안 토큰
+
+    Returns:
+        numpy.ndarray: (문항 수 × len(CHOICE_COLUMNS)) 인원 행렬
+    """
+    n_questions = responses.shape[1]
+    # 답안 코드 → 분포 열 위치 (마지막 칸은 BLANK_CODE(-1)가 가리키는 무응답)
+    other, blank = len(CHOICES), len(CHOICES) + 1
+    column_of_code = np.full(len(tokens) + 1, other, dtype=np.int64)
+    for code, token in enumerate(tokens):
+        if token in CHOICES:
+            column_of_code[code] = CHOICES.index(token)
+    column_of_code[BLANK_CODE] = blank
+
+    columns = column_of_code[responses]
+    flat = (np.arange(n_questions) * len(CHOICE_COLUMNS))[np.newaxis, :] + columns
+    counts = np.bincount(flat.ravel(), minlength=n_questions * len(CHOICE_COLUMNS))
+    return counts.reshape(n_questions, len(CHOICE_COLUMNS))
+
+
+def discrimination_index(correct, scores, ratio=GROUP_RATIO):
+    """상위/하위 집단 정답률 차이 (총점 순, 동점은 원래 순서 유지)"""
+    n_students = len(scores)
+    group_size = max(1, int(round(n_students * ratio)))
+    if n_students < 2:
+        return np.full(correct.shape[1], np.nan)
+    order = np.argsort(scores, kind='stable')
+    lower = correct[order[:group_size]].mean(axis=0)
+    upper = correct[order[-group_size:]].mean(axis=0)
+    return upper - lower
+
+
+def point_biserial(correct, scores):
+    """문항 정답 여부와 총점의 점이연상관계수 (모든 학생이 맞혔거나 틀린 문항, 총점이 모두 같으면 NaN)"""
+    scores = np.asarray(scores, dtype=np.float64)
+    p = correct.mean(axis=0)
+    score_std = scores.std()
+    centered = scores - scores.mean()
+    covariance = (centered @ correct) / len(scores)
+    denominator = score_std * np.sqrt(p * (1 - p))
+    # 공분산이 정확히 0이 아닌 부동소수점 잔차라 나누기 결과로는 NaN이 아닌 ±inf가 나오므로 직접 가림
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((p > 0) & (p < 1) & (score_std > 0), covariance / denominator, np.nan)
+
+
+def analyze_items(subject_responses, subject_key, scores):
+    """과목 하나의 문항 분석표
+
+    Args:
+        subject_responses: grading.SubjectResponses
+        subject_key: 채점에 사용한 grading.SubjectKey (정답 표시용)
+        scores: subject_responses.rows 순서의 학생별 총점
+
+    Returns:
+        pandas.DataFrame: 문항 번호 | 정답 | 정답률 | 변별도 | 점이연상관 | 선택 1~5 | 기타 | 무응답
+    """
+    correct = subject_responses.correct
+    n_students, n_questions = correct.shape
+    if n_students == 0:
+        return pd.DataFrame(columns=ITEM_ANALYSIS_COLUMNS)
+
+    scores = np.asarray(scores, dtype=np.float64)
+    analysis_df = pd.DataFrame({
+        '문항 번호': np.arange(1, n_questions + 1),
+        '정답': answer_labels(subject_key)[:n_questions],
+        '정답률': correct.mean(axis=0),
+        '변별도': discrimination_index(correct, scores),
+        '점이연상관': point_biserial(correct, scores),
+    })
+    counts = choice_distribution(subject_responses.responses, subject_responses.tokens)
+    for i, column in enumerate(CHOICE_COLUMNS):
+        analysis_df[column] = counts[:, i]
+    return analysis_df
+
+
+def analyze_subject(result_df, response_data, answer_key, subject):
+    """채점 결과에서 과목 하나의 문항 분석표 (총점은 result_df의 총점 사용)"""
+    subject_responses = response_data[subject]
+    scores = result_df['총점'].to_numpy()[subject_responses.rows]
+    return analyze_items(subject_responses, answer_key[subject], scores)
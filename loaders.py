@@ -0,0 +1,715 @@
+"""업로드 파일 로더
+
+학생 답안, 정답, 학생 정보 파일(CSV/Excel)을 읽고 검증합니다.
+Streamlit UI(app.py)와 명령줄 일괄 채점(batch_grade.py)이 함께 사용하므로
+화면 출력 없이 오류는 예외로, 경고는 (level, message) 목록으로 돌려줍니다.
+"""
+import codecs
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+
+from grading import TAMGU_LAYOUT, build_match_index, reshape_wide_to_long
+from profiling import NULL_PROFILER
+
+# pyarrow 선택적 import (멀티스레드 CSV 파싱용)
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# python-calamine 선택적 import (Rust 기반 빠른 Excel 읽기용)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# 스트리밍 채점: 학생 답안 파일을 이 행 수만큼씩 읽어 채점
+STREAMING_CHUNK_ROWS = 50_000
+
+# CSV 인코딩 판별에 사용하는 파일 앞부분 크기
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# float32로 바꿔도 정수 답안 값이 정확히 유지되는 한계 (2**24)
+FLOAT32_EXACT_LIMIT = 1 << 24
+
+
+def is_excel_file(file):
+    """파일 이름 확장자로 Excel 파일 여부 판단"""
+    file_name = file.name.lower() if hasattr(file, 'name') else ''
+    return file_name.endswith('.xlsx') or file_name.endswith('.xls')
+
+
+def read_upload_bytes(file):
+    """업로드 파일 내용 전체를 bytes로 반환 (파일 포인터는 처음으로 되돌림)"""
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    file.seek(0)
+    data = file.read()
+    file.seek(0)
+    return data
+
+
+def sniff_encoding(sample, is_complete=False):
+    """CSV 파일 앞부분으로 인코딩 판별
+
+    Args:
+        sample: 파일 앞부분 bytes
+        is_complete: sample이 파일 전체인지 여부 (아니면 끝에서 잘린 글자는 무시)
+
+    Returns:
+        str: 'utf-8-sig' (BOM 있음), 'utf-8' 또는 'cp949'
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=is_complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def parse_csv_bytes(data, encoding):
+    """CSV bytes를 DataFrame으로 파싱
+
+    pyarrow가 설치되어 있으면 멀티스레드 pyarrow 엔진을 사용합니다.
+    pyarrow 엔진은 1/0이 섞인 열까지 bool로 읽으므로 bool 추론을 끄고 읽습니다.
+    (True/False 표기는 채점 시 normalize_answer가 bool과 같은 토큰으로 비교)
+    pyarrow 엔진이 처리하지 못하는 파일(행마다 컬럼 수가 다르거나 컬럼 이름이 중복 또는 빈 경우)은
+    기존 C 엔진으로 다시 읽습니다.
+    """
+    if PYARROW_AVAILABLE:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                df = pd.read_csv(io.BytesIO(data), encoding=encoding, engine='pyarrow',
+                                 true_values=[], false_values=[])
+            # 중복/빈 컬럼 이름은 C 엔진만 '이름.1', 'Unnamed: 2' 형태로 바꾸므로 그런 헤더가 없을 때만 사용
+            if not df.columns.has_duplicates and '' not in df.columns:
+                return df
+        except ValueError:
+            pass
+    return pd.read_csv(io.BytesIO(data), encoding=encoding)
+
+
+def _excel_cell_value(value):
+    # pandas의 openpyxl 읽기와 같은 변환: 빈 셀은 '', 정수 값 float는 int
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def read_excel_bytes(data, nrows=None):
+    """Excel 파일의 첫 번째 시트를 DataFrame으로 읽기
+
+    python-calamine이 설치되어 있으면 calamine 엔진을 사용합니다.
+    없으면 openpyxl 읽기 전용 모드로 첫 번째 시트의 셀 값만 행 단위로 읽고
+    (셀 객체, 서식, 다른 시트는 만들지 않음) 사용 범위 밖의 빈 행/열은 버립니다.
+    어느 쪽이든 컬럼 타입은 pd.read_excel(engine='openpyxl')과 같게 추론합니다.
+
+    Args:
+        data: Excel 파일 내용 bytes
+        nrows: 헤더 다음부터 읽을 최대 행 수 (None이면 전체)
+
+    Returns:
+        pandas.DataFrame: 첫 번째 시트 (첫 행이 헤더)
+    """
+    if CALAMINE_AVAILABLE:
+        return pd.read_excel(io.BytesIO(data), engine='calamine', nrows=nrows)
+
+    rows = []
+    last_row_with_data = -1
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True, keep_links=False)
+    try:
+        max_row = nrows + 1 if nrows is not None else None
+        for values in workbook.worksheets[0].iter_rows(max_row=max_row, values_only=True):
+            row = [_excel_cell_value(value) for value in values]
+            # 서식만 남은 오른쪽 빈 셀 제거
+            while row and row[-1] == '':
+                row.pop()
+            if row:
+                last_row_with_data = len(rows)
+            rows.append(row)
+    finally:
+        workbook.close()
+
+    # 서식만 남은 아래쪽 빈 행 제거 후 가장 긴 행에 맞춰 채움
+    rows = rows[:last_row_with_data + 1]
+    if not rows:
+        return pd.DataFrame()
+    width = max(len(row) for row in rows)
+    rows = [row + [''] * (width - len(row)) for row in rows]
+    return TextParser(rows, header=0).read()
+
+
+def read_table(file):
+    """업로드 파일(CSV/Excel)을 DataFrame으로 읽는 공통 입력 단계
+
+    파일 내용을 한 번만 읽고, CSV는 앞부분으로 인코딩(UTF-8 / UTF-8 BOM / CP949)을
+    판별한 뒤 파싱하므로 CP949 파일을 UTF-8로 끝까지 읽다가 다시 읽지 않습니다.
+
+    Args:
+        file: CSV 또는 Excel 파일 객체
+
+    Returns:
+        pandas.DataFrame: 첫 번째 시트(Excel, read_excel_bytes) 또는 CSV 전체
+
+    Raises:
+        UnicodeDecodeError: UTF-8과 CP949 모두 실패한 경우
+        pd.errors.EmptyDataError: 빈 파일일 경우
+    """
+    data = read_upload_bytes(file)
+    if is_excel_file(file):
+        return read_excel_bytes(data)
+    if not data.strip():
+        raise pd.errors.EmptyDataError("No columns to parse from file")
+
+    encoding = sniff_encoding(data[:ENCODING_SAMPLE_BYTES], is_complete=len(data) <= ENCODING_SAMPLE_BYTES)
+    try:
+        return parse_csv_bytes(data, encoding)
+    except UnicodeDecodeError:
+        if encoding == 'cp949':
+            raise
+        # 앞부분은 ASCII뿐이라 UTF-8로 판단했지만 뒤쪽에 CP949 한글이 있는 경우
+        return parse_csv_bytes(data, 'cp949')
+
+
+def validate_student_data(df, layout=None):
+    """학생 답안 DataFrame의 컬럼 수와 데이터 행 존재 여부 검증
+
+    Args:
+        df: 원본 학생 답안 DataFrame (변환 전)
+        layout: 한 행에 여러 과목이 있는 경우의 RowLayout (optional)
+
+    Raises:
+        Exception: 컬럼이 부족하거나 데이터 행이 없는 경우
+    """
+    # 기본 컬럼 수 검증
+    if layout is not None:
+        # 다과목 행: 수험번호 + 과목코드 N개 + 과목별 문항
+        min_required_cols = layout.min_columns
+        n_subjects = layout.subjects_per_row
+        total_questions = layout.questions_per_subject * n_subjects
+        subject_code_cols = [f'과목코드{i + 1}' for i in range(n_subjects)]
+        if len(df.columns) < min_required_cols:
+            raise Exception(
+                f"❌ {layout.name} 과목 파일 형식 오류\n\n"
+                f"현재 컬럼 수: {len(df.columns)}개\n"
+                f"필요한 최소 컬럼 수: {min_required_cols}개\n"
+                f"(수험번호 + {' + '.join(subject_code_cols)} + {total_questions}개 문항)\n\n"
+                f"해결방법:\n"
+                f"1. {layout.name} 샘플 파일을 다운로드하여 형식을 확인하세요\n"
+                f"2. 모든 {total_questions}개 문항 답안이 입력되었는지 확인하세요\n"
+                f"3. {', '.join(subject_code_cols)}가 올바르게 입력되었는지 확인하세요"
+            )
+    else:
+        # 일반 과목: 최소 3개 컬럼 (수험번호, 과목코드, 답안 최소 1개)
+        min_required_cols = 3
+        if len(df.columns) < min_required_cols:
+            raise Exception(
+                f"❌ 학생 답안 파일 형식 오류\n\n"
+                f"현재 컬럼 수: {len(df.columns)}개\n"
+                f"필요한 최소 컬럼 수: {min_required_cols}개\n"
+                f"(수험번호 + 과목코드 + 답안 1개 이상)\n\n"
+                f"해결방법:\n"
+                f"1. 샘플 파일을 다운로드하여 형식을 확인하세요\n"
+                f"2. 첫 번째 열: 수험번호, 두 번째 열: 과목코드, 세 번째 열부터: 답안\n"
+                f"3. 헤더 행이 포함되어 있는지 확인하세요"
+            )
+
+    # 데이터 행 존재 확인
+    if len(df) == 0:
+        raise Exception(
+            f"❌ 데이터 없음 오류\n\n"
+            f"파일에 데이터 행이 없습니다. (헤더만 있음)\n\n"
+            f"해결방법:\n"
+            f"1. 학생 답안 데이터가 입력되었는지 확인하세요\n"
+            f"2. 최소 1명 이상의 학생 데이터가 필요합니다"
+        )
+
+
+def compact_answer_columns(df):
+    """학생 답안 컬럼(세 번째 열부터)을 값 범위에 맞는 작은 숫자 타입으로 변환
+
+    정수 답안은 가장 작은 정수 타입(보통 int8)으로, 빈칸 때문에 float로 읽힌 답안은
+    모든 값이 float32로 정확히 표현되는 정수일 때만 float32로 줄입니다.
+    문자열이 섞인 컬럼은 그대로 둡니다. (채점 결과는 변환 전과 같음)
+    """
+    for position in range(2, len(df.columns)):
+        column = df.iloc[:, position]
+        if column.dtype.kind == 'i':
+            df.isetitem(position, pd.to_numeric(column, downcast='integer'))
+        elif column.dtype == np.float64:
+            values = column.to_numpy()
+            finite = values[~np.isnan(values)]
+            if np.all(finite == np.round(finite)) and np.all(np.abs(finite) < FLOAT32_EXACT_LIMIT):
+                df.isetitem(position, column.astype(np.float32))
+    return df
+
+
+def load_student_data(file, is_tamgu=False, layout=None, profiler=NULL_PROFILER):
+    """학생 답안 파일 로드
+
+    Args:
+        file: CSV 또는 Excel 파일 객체
+        is_tamgu: 탐구 과목 여부 (기본값: False, True이면 TAMGU_LAYOUT 사용)
+        layout: 한 행에 여러 과목이 있는 경우의 RowLayout (optional)
+        profiler: 단계별 측정기 (optional, profiling.StageProfiler - 읽기와 검증/변환을 나누어 기록)
+
+    Returns:
+        pandas.DataFrame: 학생 답안 데이터
+
+    Raises:
+        UnicodeDecodeError: 인코딩 오류 시
+        pd.errors.EmptyDataError: 빈 파일일 경우
+        Exception: 기타 파일 읽기 오류
+    """
+    if is_tamgu and layout is None:
+        layout = TAMGU_LAYOUT
+
+    # 파일 확장자 확인
+    is_excel = is_excel_file(file)
+    
+    try:
+        # 파일 내용을 한 번만 읽고 인코딩을 판별하여 파싱
+        with profiler.stage('학생 답안 읽기') as stage:
+            df = read_table(file)
+            stage.rows = len(df)
+    except UnicodeDecodeError as e:
+        raise Exception(
+            f"❌ 파일 인코딩 오류\n\n"
+            f"원인: UTF-8과 CP949(한글 Windows) 인코딩 모두 실패했습니다.\n\n"
+            f"해결방법:\n"
+            f"1. Excel 파일로 저장하거나\n"
+            f"2. CSV 파일을 Excel에서 다시 저장할 때 'UTF-8' 인코딩 선택\n"
+            f"3. 메모장에서 '다른 이름으로 저장' → 인코딩을 'UTF-8'로 선택\n\n"
+            f"상세 오류: {str(e)}"
+        )
+    except pd.errors.EmptyDataError:
+        raise Exception(
+            f"❌ 빈 파일 오류\n\n"
+            f"학생 답안 파일이 비어있습니다.\n\n"
+            f"해결방법:\n"
+            f"1. 파일에 데이터가 있는지 확인하세요\n"
+            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
+        )
+    except Exception as e:
+        file_type = "Excel" if is_excel else "CSV"
+        raise Exception(
+            f"❌ 파일 읽기 오류\n\n"
+            f"학생 답안 {file_type} 파일을 읽는 중 오류가 발생했습니다.\n\n"
+            f"해결방법:\n"
+            f"1. {file_type} 파일 형식이 올바른지 확인하세요\n"
+            f"2. 파일이 손상되지 않았는지 확인하세요\n"
+            f"3. 다른 프로그램으로 파일을 열어보세요\n"
+            f"4. Excel 파일인 경우 첫 번째 시트에 데이터가 있는지 확인하세요\n\n"
+            f"상세 오류: {str(e)}"
+        )
+
+    with profiler.stage('학생 답안 검증/변환', rows=len(df)):
+        # 컬럼 수 및 데이터 행 검증
+        validate_student_data(df, layout)
+
+        # 한 행에 여러 과목이 있는 경우 (탐구 등) 과목당 한 행으로 변환
+        if layout is not None:
+            df = reshape_wide_to_long(df, layout)
+
+        return compact_answer_columns(df)
+
+
+def detect_csv_encoding(file, block_size=1 << 20):
+    """스트리밍 채점용 CSV 파일 인코딩 감지
+
+    앞부분(ENCODING_SAMPLE_BYTES)으로 판별하고, 앞부분이 ASCII뿐이라 UTF-8과 CP949를
+    구분할 수 없을 때만 나머지를 블록 단위로 UTF-8 디코딩해 봅니다.
+    파일 전체를 메모리에 올리지 않으며, 끝나면 파일 포인터를 처음으로 되돌립니다.
+
+    Returns:
+        str: 'utf-8-sig', 'utf-8' 또는 'cp949'
+    """
+    file.seek(0)
+    try:
+        sample = file.read(ENCODING_SAMPLE_BYTES)
+        encoding = sniff_encoding(sample, is_complete=len(sample) < ENCODING_SAMPLE_BYTES)
+        if encoding != 'utf-8' or not sample.isascii():
+            return encoding
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        while True:
+            block = file.read(block_size)
+            decoder.decode(block, final=not block)
+            if not block:
+                return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+    finally:
+        file.seek(0)
+
+
+def iter_student_data_chunks(file, layout=None, chunk_rows=STREAMING_CHUNK_ROWS, profiler=NULL_PROFILER):
+    """학생 답안 파일을 chunk_rows 행씩 읽어 차례로 반환 (스트리밍 채점용)
+
+    CSV는 조각 단위로 읽으므로 파일 전체를 DataFrame으로 만들지 않습니다.
+    Excel은 조각 단위 읽기를 지원하지 않아 전체를 읽은 뒤 나누어 반환합니다.
+
+    Args:
+        file: CSV 또는 Excel 파일 객체
+        layout: 한 행에 여러 과목이 있는 경우의 RowLayout (optional)
+        chunk_rows: 한 번에 읽을 원본 행 수
+        profiler: 단계별 측정기 (optional, profiling.StageProfiler - 조각마다 누적)
+
+    Yields:
+        pandas.DataFrame: load_student_data와 같은 형식의 학생 답안 조각
+
+    Raises:
+        Exception: 파일 형식 오류 또는 데이터가 없는 경우
+    """
+    if is_excel_file(file):
+        df = load_student_data(file, layout=layout, profiler=profiler)
+        step = chunk_rows * (layout.subjects_per_row if layout is not None else 1)
+        for start in range(0, len(df), step):
+            yield df.iloc[start:start + step]
+        return
+
+    encoding = detect_csv_encoding(file)
+    try:
+        reader = pd.read_csv(file, encoding=encoding, chunksize=chunk_rows)
+    except pd.errors.EmptyDataError:
+        raise Exception(
+            f"❌ 빈 파일 오류\n\n"
+            f"학생 답안 파일이 비어있습니다.\n\n"
+            f"해결방법:\n"
+            f"1. 파일에 데이터가 있는지 확인하세요\n"
+            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
+        )
+
+    is_first_chunk = True
+    with reader:
+        chunks = iter(reader)
+        while True:
+            # 읽기/검증 시간만 측정 (yield 뒤 채점 시간은 포함하지 않음)
+            with profiler.stage('학생 답안 읽기', accumulate=not is_first_chunk) as stage:
+                chunk = next(chunks, None)
+                stage.rows = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                return
+            with profiler.stage('학생 답안 검증/변환', rows=len(chunk), accumulate=not is_first_chunk):
+                if is_first_chunk:
+                    # 컬럼 구조는 첫 조각에서 한 번만 검증 (헤더만 있는 파일은 빈 조각 하나가 들어옴)
+                    validate_student_data(chunk, layout)
+                chunk = compact_answer_columns(reshape_wide_to_long(chunk, layout) if layout is not None else chunk)
+            is_first_chunk = False
+            yield chunk
+
+
+def load_student_preview(file, layout=None, n_rows=5):
+    """학생 답안 파일의 앞부분 n_rows행만 읽어 미리보기용 DataFrame 반환 (스트리밍 채점용)
+
+    CSV는 앞부분(ENCODING_SAMPLE_BYTES)으로 인코딩을 판별하고 n_rows행만 파싱하며,
+    Excel은 첫 번째 시트의 앞쪽 행만 읽으므로 파일 크기와 관계없이 빠릅니다.
+    검증/변환은 load_student_data와 같습니다. 끝나면 파일 포인터를 처음으로 되돌립니다.
+
+    Args:
+        file: CSV 또는 Excel 파일 객체
+        layout: 한 행에 여러 과목이 있는 경우의 RowLayout (optional)
+        n_rows: 읽을 원본 행 수
+
+    Returns:
+        pandas.DataFrame: load_student_data와 같은 형식의 앞부분
+
+    Raises:
+        Exception: 파일 형식 오류 또는 데이터가 없는 경우
+    """
+    file.seek(0)
+    try:
+        if is_excel_file(file):
+            df = read_excel_bytes(read_upload_bytes(file), nrows=n_rows)
+        else:
+            sample = file.read(ENCODING_SAMPLE_BYTES)
+            encoding = sniff_encoding(sample, is_complete=len(sample) < ENCODING_SAMPLE_BYTES)
+            file.seek(0)
+            try:
+                df = pd.read_csv(file, encoding=encoding, nrows=n_rows)
+            except UnicodeDecodeError:
+                # 앞부분은 ASCII뿐이라 UTF-8로 판단했지만 미리보기 행에 CP949 한글이 있는 경우
+                file.seek(0)
+                df = pd.read_csv(file, encoding='cp949', nrows=n_rows)
+    except pd.errors.EmptyDataError:
+        raise Exception(
+            f"❌ 빈 파일 오류\n\n"
+            f"학생 답안 파일이 비어있습니다.\n\n"
+            f"해결방법:\n"
+            f"1. 파일에 데이터가 있는지 확인하세요\n"
+            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
+        )
+    finally:
+        file.seek(0)
+
+    validate_student_data(df, layout)
+    if layout is not None:
+        df = reshape_wide_to_long(df, layout)
+    return compact_answer_columns(df)
+
+
+def load_answer_data(file):
+    """정답/배점 파일 로드
+
+    Args:
+        file: CSV 또는 Excel 파일 객체
+
+    Returns:
+        pandas.DataFrame: 정답 및 배점 데이터
+
+    Raises:
+        UnicodeDecodeError: 인코딩 오류 시
+        pd.errors.EmptyDataError: 빈 파일일 경우
+        Exception: 기타 파일 읽기 오류
+    """
+    # 파일 확장자 확인
+    is_excel = is_excel_file(file)
+    
+    try:
+        # 파일 내용을 한 번만 읽고 인코딩을 판별하여 파싱
+        df = read_table(file)
+    except UnicodeDecodeError as e:
+        raise Exception(
+            f"❌ 파일 인코딩 오류\n\n"
+            f"원인: UTF-8과 CP949(한글 Windows) 인코딩 모두 실패했습니다.\n\n"
+            f"해결방법:\n"
+            f"1. Excel 파일로 저장하거나\n"
+            f"2. CSV 파일을 Excel에서 다시 저장할 때 'UTF-8' 인코딩 선택\n"
+            f"3. 메모장에서 '다른 이름으로 저장' → 인코딩을 'UTF-8'로 선택\n\n"
+            f"상세 오류: {str(e)}"
+        )
+    except pd.errors.EmptyDataError:
+        raise Exception(
+            f"❌ 빈 파일 오류\n\n"
+            f"정답/배점 파일이 비어있습니다.\n\n"
+            f"해결방법:\n"
+            f"1. 파일에 데이터가 있는지 확인하세요\n"
+            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
+        )
+    except Exception as e:
+        file_type = "Excel" if is_excel else "CSV"
+        raise Exception(
+            f"❌ 파일 읽기 오류\n\n"
+            f"정답/배점 {file_type} 파일을 읽는 중 오류가 발생했습니다.\n\n"
+            f"해결방법:\n"
+            f"1. {file_type} 파일 형식이 올바른지 확인하세요\n"
+            f"2. 파일이 손상되지 않았는지 확인하세요\n"
+            f"3. 다른 프로그램으로 파일을 열어보세요\n"
+            f"4. Excel 파일인 경우 첫 번째 시트에 데이터가 있는지 확인하세요\n\n"
+            f"상세 오류: {str(e)}"
+        )
+
+    # 컬럼 수 검증 (최소 4개: 과목번호, 문항, 정답, 배점)
+    if len(df.columns) < 4:
+        raise Exception(
+            f"❌ 정답/배점 파일 형식 오류\n\n"
+            f"현재 컬럼 수: {len(df.columns)}개\n"
+            f"필요한 컬럼 수: 4개 (과목번호, 문항, 정답, 배점)\n\n"
+            f"해결방법:\n"
+            f"1. 샘플 파일을 다운로드하여 형식을 확인하세요\n"
+            f"2. 필수 컬럼: 과목번호 | 문항 | 정답 | 배점\n"
+            f"3. 현재 컬럼: {', '.join(df.columns.tolist())}"
+        )
+
+    # 데이터 행 존재 확인
+    if len(df) == 0:
+        raise Exception(
+            f"❌ 데이터 없음 오류\n\n"
+            f"정답/배점 파일에 데이터 행이 없습니다. (헤더만 있음)\n\n"
+            f"해결방법:\n"
+            f"1. 정답 및 배점 데이터가 입력되었는지 확인하세요\n"
+            f"2. 최소 1개 이상의 문항 정답이 필요합니다"
+        )
+
+    # 배점 컬럼 유효성 검사 (숫자로 변환 가능한지)
+    points_col = df.columns[3]  # 네 번째 컬럼이 배점
+    invalid_rows = []
+    for idx, value in enumerate(df[points_col]):
+        try:
+            float(value)
+        except (ValueError, TypeError):
+            invalid_rows.append(idx + 2)  # +2는 헤더 포함 및 1-based 인덱싱
+
+    if invalid_rows:
+        raise Exception(
+            f"❌ 배점 데이터 형식 오류\n\n"
+            f"배점 컬럼에 숫자가 아닌 값이 있습니다.\n"
+            f"문제가 있는 행: {', '.join(map(str, invalid_rows[:5]))}"
+            f"{'...' if len(invalid_rows) > 5 else ''}\n\n"
+            f"해결방법:\n"
+            f"1. 배점 컬럼(4번째 컬럼)에 숫자만 입력하세요\n"
+            f"2. 빈칸, 문자, 특수문자가 있는지 확인하세요\n"
+            f"3. 소수점은 점(.)으로 표시하세요 (예: 2.5)"
+        )
+
+    return df
+
+
+def load_student_info(file):
+    """학생 정보 파일 로드
+
+    Args:
+        file: CSV 또는 Excel 파일 객체
+
+    Returns:
+        dict: 3가지 방식으로 매칭 가능한 학생 정보 딕셔너리
+            - by_full: 학번+전화번호로 매칭
+            - by_student_id: 학번으로 매칭
+            - by_phone: 전화번호로 매칭
+            - student_id_index / phone_index: 학번/전화번호 길이별 매칭 색인
+            - issues: 건너뛴 행에 대한 (level, message) 경고 목록
+
+    Raises:
+        UnicodeDecodeError: 인코딩 오류 시
+        pd.errors.EmptyDataError: 빈 파일일 경우
+        Exception: 기타 파일 읽기 오류
+    """
+    # 파일 확장자 확인
+    is_excel = is_excel_file(file)
+    
+    try:
+        # 파일 내용을 한 번만 읽고 인코딩을 판별하여 파싱
+        df = read_table(file)
+    except UnicodeDecodeError as e:
+        raise Exception(
+            f"❌ 파일 인코딩 오류\n\n"
+            f"원인: UTF-8과 CP949(한글 Windows) 인코딩 모두 실패했습니다.\n\n"
+            f"해결방법:\n"
+            f"1. Excel 파일로 저장하거나\n"
+            f"2. CSV 파일을 Excel에서 다시 저장할 때 'UTF-8' 인코딩 선택\n"
+            f"3. 메모장에서 '다른 이름으로 저장' → 인코딩을 'UTF-8'로 선택\n\n"
+            f"상세 오류: {str(e)}"
+        )
+    except pd.errors.EmptyDataError:
+        raise Exception(
+            f"❌ 빈 파일 오류\n\n"
+            f"학생 정보 파일이 비어있습니다.\n\n"
+            f"해결방법:\n"
+            f"1. 파일에 데이터가 있는지 확인하세요\n"
+            f"2. 샘플 파일을 다운로드하여 형식을 확인하세요"
+        )
+    except Exception as e:
+        file_type = "Excel" if is_excel else "CSV"
+        raise Exception(
+            f"❌ 파일 읽기 오류\n\n"
+            f"학생 정보 {file_type} 파일을 읽는 중 오류가 발생했습니다.\n\n"
+            f"해결방법:\n"
+            f"1. {file_type} 파일 형식이 올바른지 확인하세요\n"
+            f"2. 파일이 손상되지 않았는지 확인하세요\n"
+            f"3. 다른 프로그램으로 파일을 열어보세요\n"
+            f"4. Excel 파일인 경우 첫 번째 시트에 데이터가 있는지 확인하세요\n\n"
+            f"상세 오류: {str(e)}"
+        )
+
+    # 컬럼 수 검증 (최소 3개: 학번, 전화번호, 이름)
+    if len(df.columns) < 3:
+        raise Exception(
+            f"❌ 학생 정보 파일 형식 오류\n\n"
+            f"현재 컬럼 수: {len(df.columns)}개\n"
+            f"필요한 컬럼 수: 3개 (학번, 전화번호, 이름)\n\n"
+            f"해결방법:\n"
+            f"1. 샘플 파일을 다운로드하여 형식을 확인하세요\n"
+            f"2. 필수 컬럼: 학번 | 전화번호 | 이름\n"
+            f"3. 현재 컬럼: {', '.join(df.columns.tolist())}"
+        )
+
+    # 데이터 행 존재 확인
+    if len(df) == 0:
+        raise Exception(
+            f"❌ 데이터 없음 오류\n\n"
+            f"학생 정보 파일에 데이터 행이 없습니다. (헤더만 있음)\n\n"
+            f"해결방법:\n"
+            f"1. 학생 정보 데이터가 입력되었는지 확인하세요\n"
+            f"2. 최소 1명 이상의 학생 정보가 필요합니다"
+        )
+
+    # 학번, 전화번호, 이름 저장 (3가지 방식으로 매칭 가능하도록)
+    student_info_dict = {
+        'by_full': {},      # 학번+전화번호 (완전 매칭)
+        'by_student_id': {},  # 학번으로 매칭
+        'by_phone': {}      # 전화번호로 매칭
+    }
+
+    # 컬럼 인덱스 범위 검증 및 데이터 처리
+    skipped_rows = []
+    valid_count = 0
+
+    for idx, row in df.iterrows():
+        try:
+            # 학번과 이름이 모두 비어있으면 빈 행으로 간주하고 건너뛰기
+            is_student_num_empty = pd.isna(row[df.columns[0]]) or str(row[df.columns[0]]).strip() == ''
+            is_name_empty = pd.isna(row[df.columns[2]]) or str(row[df.columns[2]]).strip() == ''
+
+            # 둘 다 비어있으면 건너뛰기 (완전히 빈 행)
+            if is_student_num_empty and is_name_empty:
+                skipped_rows.append(idx + 2)
+                continue
+
+            # 학번이나 이름 중 하나만 비어있으면 경고하고 건너뛰기
+            if is_student_num_empty:
+                skipped_rows.append(idx + 2)
+                continue
+
+            if is_name_empty:
+                skipped_rows.append(idx + 2)
+                continue
+
+            student_num = str(row[df.columns[0]])  # 학번
+            phone = str(row[df.columns[1]]) if not pd.isna(row[df.columns[1]]) else ''  # 전화번호 (선택)
+            name = str(row[df.columns[2]])  # 이름
+
+            full_id = student_num + phone  # 학번 + 전화번호
+
+            info = {
+                '학번': student_num,
+                '전화번호': phone,
+                '이름': name
+            }
+
+            # 3가지 방식으로 저장
+            student_info_dict['by_full'][full_id] = info
+            student_info_dict['by_student_id'][student_num] = info
+            if phone:  # 전화번호가 있을 때만 저장
+                student_info_dict['by_phone'][phone] = info
+
+            valid_count += 1
+
+        except IndexError:
+            # 컬럼이 부족한 행은 건너뛰기
+            skipped_rows.append(idx + 2)
+            continue
+
+    # 수험번호 앞/뒤 자리로 한 번에 조회할 수 있도록 길이별 색인 생성
+    student_info_dict['student_id_index'] = build_match_index(student_info_dict['by_student_id'])
+    student_info_dict['phone_index'] = build_match_index(student_info_dict['by_phone'])
+
+    # 건너뛴 행이 있으면 경고 (화면 표시는 호출하는 쪽에서)
+    student_info_dict['issues'] = []
+    if skipped_rows:
+        if len(skipped_rows) <= 5:
+            student_info_dict['issues'].append(('warning',
+                f"⚠️ 학생 정보 파일 일부 행 건너뛰기\n\n"
+                f"건너뛴 행: {', '.join(map(str, skipped_rows))}\n"
+                f"(학번 또는 이름이 비어있거나 컬럼이 부족함)\n\n"
+                f"유효한 학생 정보: {valid_count}명"
+            ))
+        else:
+            student_info_dict['issues'].append(('warning',
+                f"⚠️ 학생 정보 파일 일부 행 건너뛰기\n\n"
+                f"건너뛴 행 수: {len(skipped_rows)}개\n"
+                f"첫 5개 행: {', '.join(map(str, skipped_rows[:5]))}\n"
+                f"(학번 또는 이름이 비어있거나 컬럼이 부족함)\n\n"
+                f"유효한 학생 정보: {valid_count}명"
+            ))
+
+    return student_info_dict
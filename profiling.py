@@ -0,0 +1,170 @@
+"""채점 파이프라인 단계별 시간/메모리 측정
+
+파일 읽기, 검증, 정답 컴파일, 채점, 학생 정보 매칭, 통계, 내보내기, 렌더링 단계마다
+걸린 시간, 처리량(행/초), 최대 할당 메모리(tracemalloc)를 기록합니다.
+디버깅 모드의 "단계별 성능" 패널에 표시하고 JSON으로 내려받아 실행 간 비교에 씁니다.
+
+측정하지 않을 때는 비활성 측정기(NULL_PROFILER)를 넘기므로 채점 코드는 측정 여부와 관계없이 같습니다.
+
+주의:
+    - tracemalloc은 프로세스 전체의 Python 할당을 추적하므로 같은 프로세스의 다른 세션(스레드) 할당도
+      포함될 수 있고, 작업 프로세스(병렬 채점, 렌더링)의 메모리는 포함되지 않습니다.
+    - 다른 단계 안에서 시작한 단계는 시간만 기록합니다. (메모리는 바깥 단계에 포함)
+    - 메모리를 측정하는 동안에는 할당마다 추적 비용이 들어 처리가 느려집니다.
+
+사용 예:
+    profiler = StageProfiler()
+    with profiler.stage('채점', rows=len(student_df)):
+        ...
+    profiler.to_frame()
+"""
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+PROFILE_COLUMNS = ['단계', '시간(초)', '행 수', '행/초', '최대 메모리(MB)', '호출 수']
+
+# tracemalloc 시작/종료는 프로세스 전역이므로 세션(스레드) 사이에서 잠금
+_tracemalloc_lock = threading.Lock()
+
+
+@dataclass
+class StageTiming:
+    """단계 하나의 측정값"""
+    stage: str
+    seconds: float = 0.0
+    rows: int = 0
+    peak_mb: float = None    # 측정하지 않았으면 None
+    calls: int = 1
+
+    @property
+    def rows_per_second(self):
+        """처리량 (행 수나 시간이 없으면 None)"""
+        if not self.rows or self.seconds <= 0:
+            return None
+        return self.rows / self.seconds
+
+    def merge(self, other):
+        """조각 단위로 여러 번 나누어 실행한 같은 단계의 측정값 합치기"""
+        self.seconds += other.seconds
+        self.rows += other.rows
+        self.calls += other.calls
+        if other.peak_mb is not None:
+            self.peak_mb = max(self.peak_mb or 0.0, other.peak_mb)
+
+    def to_dict(self):
+        return {
+            'stage': self.stage,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'rows_per_second': self.rows_per_second,
+            'peak_mb': self.peak_mb,
+            'calls': self.calls,
+        }
+
+
+def environment():
+    """측정 결과 비교용 실행 환경 정보"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+class StageProfiler:
+    """단계 이름별 마지막 측정값 기록
+
+    같은 이름으로 다시 측정하면 이전 값을 바꾸고, accumulate=True이면 이전 값에 더합니다.
+    (스트리밍 채점처럼 조각마다 나누어 실행하는 단계)
+
+    Args:
+        enabled: False이면 아무것도 측정/기록하지 않음
+        trace_memory: 최대 할당 메모리 측정 여부 (tracemalloc)
+    """
+
+    def __init__(self, enabled=True, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.timings = {}   # 단계 이름 → StageTiming (처음 실행된 순서)
+
+    @contextmanager
+    def stage(self, name, rows=0, accumulate=False):
+        """with 블록 하나를 단계 하나로 측정
+
+        처리 행 수를 블록 안에서 알게 되면 반환된 StageTiming의 rows에 넣습니다.
+
+        Args:
+            name: 단계 이름
+            rows: 처리 행 수 (처리량 계산 기준)
+            accumulate: 같은 이름의 이전 측정값에 더할지 여부
+
+        Yields:
+            StageTiming
+        """
+        timing = StageTiming(name, rows=rows)
+        if not self.enabled:
+            yield timing
+            return
+
+        tracing = False
+        if self.trace_memory:
+            with _tracemalloc_lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    tracing = True
+        started = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - started
+            if tracing:
+                with _tracemalloc_lock:
+                    timing.peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                    tracemalloc.stop()
+            previous = self.timings.get(name)
+            if accumulate and previous is not None:
+                previous.merge(timing)
+            else:
+                self.timings[name] = timing
+
+    def reset(self):
+        self.timings.clear()
+
+    @property
+    def total_seconds(self):
+        return sum(timing.seconds for timing in self.timings.values())
+
+    def to_frame(self):
+        """측정값 표 (PROFILE_COLUMNS)"""
+        rows = [
+            [timing.stage, timing.seconds, timing.rows or None, timing.rows_per_second, timing.peak_mb, timing.calls]
+            for timing in self.timings.values()
+        ]
+        return pd.DataFrame(rows, columns=PROFILE_COLUMNS)
+
+    def to_json(self, **context):
+        """측정값, 실행 환경, context(입력 파일 크기 등)를 담은 JSON bytes"""
+        report = {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'environment': environment(),
+            'context': context,
+            'trace_memory': self.trace_memory,
+            'stages': [timing.to_dict() for timing in self.timings.values()],
+        }
+        return json.dumps(report, ensure_ascii=False, indent=2, default=str).encode('utf-8')
+
+
+# 측정하지 않을 때 넘기는 비활성 측정기
+NULL_PROFILER = StageProfiler(enabled=False, trace_memory=False)
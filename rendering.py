@@ -0,0 +1,235 @@
+"""그래프/PDF 렌더링 작업 프로세스 풀
+
+matplotlib 그래프와 reportlab PDF를 Streamlit 스크립트 스레드 밖의 작업 프로세스에서 만듭니다.
+작업 프로세스는 비대화형 백엔드(Agg)와 pyplot 없는 Figure만 쓰므로 전역 pyplot 상태를 공유하지 않고,
+결과 bytes는 입력 집계값의 해시로 캐시해 같은 요청은 다시 그리지 않습니다.
+
+사용 예:
+    service = RenderService()
+    png_bytes = service.render('statistics_png', statistics_report_aggregates(result_df))
+"""
+import hashlib
+import io
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+
+from assets import register_matplotlib_font, warm_up
+from grading import worker_context
+from reports import render_subject_pdf
+
+# 렌더링 작업 프로세스 수
+RENDER_WORKERS = 2
+
+# 렌더링 결과 캐시 크기 (입력 집계값 해시 기준)
+RENDER_CACHE_SIZE = 32
+
+# 렌더링 결과 대기 시간 (초)
+RENDER_TIMEOUT = 120
+
+
+def setup_korean_font_for_matplotlib():
+    """matplotlib 그래프를 위한 한글 폰트 설정
+
+    matplotlib의 rcParams를 설정하여 한글이 제대로 표시되도록 합니다.
+    폰트 검색/등록은 프로세스마다 한 번만 합니다. (assets.register_matplotlib_font)
+    """
+    register_matplotlib_font()
+
+
+def statistics_report_aggregates(result_df):
+    """전체 통계 리포트 이미지에 들어가는 집계값 (기본 타입만 사용)"""
+    scores = result_df['총점']
+    max_score, min_score = scores.max(), scores.min()
+    subject_means = result_df.groupby('과목코드', observed=True)['총점'].mean().sort_values(ascending=False)
+    subject_counts = result_df['과목코드'].value_counts().sort_index()
+    subject_counts = subject_counts[subject_counts > 0]
+    histogram, edges = np.histogram(scores.to_numpy(dtype=np.float64), bins=10)
+    return {
+        'n_students': len(result_df),
+        'mean': float(scores.mean()),
+        'std': float(scores.std()),
+        'max': max_score.item(),
+        'max_id': result_df.loc[scores == max_score, '수험번호'].iat[0],
+        'min': min_score.item(),
+        'min_id': result_df.loc[scores == min_score, '수험번호'].iat[0],
+        'subject_means': [(subject, float(mean)) for subject, mean in subject_means.items()],
+        'subject_counts': [(subject, int(count)) for subject, count in subject_counts.items()],
+        'histogram': (histogram.tolist(), edges.tolist()),
+    }
+
+
+def render_statistics_report(aggregates):
+    """전체 통계 리포트 이미지 (2×2 그래프) PNG bytes
+
+    pyplot 대신 Figure를 직접 만들어 전역 그림 상태를 쓰지 않습니다.
+    """
+    from matplotlib.figure import Figure
+
+    # 한글 폰트 설정
+    setup_korean_font_for_matplotlib()
+
+    fig = Figure(figsize=(16, 12))
+    axes = fig.subplots(2, 2)
+    fig.suptitle('채점 통계 리포트 (전체)', fontsize=20, fontweight='bold', y=0.98)
+
+    # 1. 기본 통계 표
+    ax1 = axes[0, 0]
+    ax1.axis('off')
+    stats_data = [
+        ['인원', f"{aggregates['n_students']}명"],
+        ['평균 점수', f"{aggregates['mean']:.1f}점"],
+        ['표준편차', f"{aggregates['std']:.2f}"],
+        ['최고 점수', f"{aggregates['max']}점 (수험번호: {aggregates['max_id']})"],
+        ['최저 점수', f"{aggregates['min']}점 (수험번호: {aggregates['min_id']})"]
+    ]
+    table1 = ax1.table(cellText=stats_data, cellLoc='left', loc='center',
+                      colWidths=[0.3, 0.7])
+    table1.auto_set_font_size(False)
+    table1.set_fontsize(12)
+    table1.scale(1, 3)
+    for i in range(len(stats_data)):
+        table1[(i, 0)].set_facecolor('#E8F4F8')
+        table1[(i, 0)].set_text_props(weight='bold')
+    ax1.set_title('📈 전체 기본 통계', fontsize=16, fontweight='bold', pad=20)
+
+    # 2. 과목별 평균 점수
+    ax2 = axes[0, 1]
+    if len(aggregates['subject_means']) > 1:
+        subjects_list = [subject for subject, _ in aggregates['subject_means']]
+        means = [mean for _, mean in aggregates['subject_means']]
+        bars = ax2.bar(subjects_list, means, color='lightgreen', edgecolor='black', alpha=0.7)
+        ax2.set_ylabel('평균 점수', fontsize=12)
+        ax2.set_title('📚 과목별 평균 점수', fontsize=16, fontweight='bold', pad=20)
+        ax2.grid(axis='y', alpha=0.3)
+        # 막대에 숫자 표시
+        for bar, mean in zip(bars, means):
+            ax2.text(bar.get_x() + bar.get_width()/2, bar.get_height(),
+                    f'{mean:.1f}', ha='center', va='bottom', fontsize=10)
+    else:
+        ax2.text(0.5, 0.5, '단일 과목', ha='center', va='center', fontsize=14)
+        ax2.axis('off')
+
+    # 3. 과목별 응시 인원
+    ax3 = axes[1, 0]
+    subjects_list = [subject for subject, _ in aggregates['subject_counts']]
+    counts = [count for _, count in aggregates['subject_counts']]
+    bars = ax3.barh(subjects_list, counts, color='skyblue', edgecolor='black', alpha=0.7)
+    ax3.set_xlabel('응시 인원', fontsize=12)
+    ax3.set_title('📊 과목별 응시 인원', fontsize=16, fontweight='bold', pad=20)
+    ax3.invert_yaxis()
+    ax3.grid(axis='x', alpha=0.3)
+    # 막대에 숫자 표시
+    for bar, count in zip(bars, counts):
+        ax3.text(bar.get_width(), bar.get_y() + bar.get_height()/2,
+                f' {count}명', va='center', fontsize=10)
+
+    # 4. 전체 점수 분포 (구간별 인원은 미리 집계)
+    ax4 = axes[1, 1]
+    histogram, edges = aggregates['histogram']
+    ax4.hist(edges[:-1], bins=edges, weights=histogram, color='coral', edgecolor='black', alpha=0.7)
+    ax4.set_xlabel('점수', fontsize=12)
+    ax4.set_ylabel('학생 수', fontsize=12)
+    ax4.set_title('📊 전체 점수 분포', fontsize=16, fontweight='bold', pad=20)
+    ax4.grid(axis='y', alpha=0.3)
+
+    fig.tight_layout()
+
+    # 이미지를 바이트로 저장
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+# 작업 종류 → 렌더링 함수 (인자는 기본 타입 집계값, 반환값은 bytes)
+RENDERERS = {
+    'statistics_png': render_statistics_report,
+    'subject_pdf': render_subject_pdf,
+}
+
+
+def _init_render_worker():
+    matplotlib.use('Agg')
+    warm_up()
+
+
+def _ping():
+    return True
+
+
+def _render(kind, args):
+    return RENDERERS[kind](*args)
+
+
+class RenderService:
+    """그래프/PDF 렌더링 작업 프로세스 풀 + 결과 캐시
+
+    같은 (작업 종류, 집계값) 요청은 진행 중이거나 끝난 결과를 함께 씁니다.
+    여러 세션(스레드)에서 동시에 사용할 수 있습니다.
+    """
+
+    def __init__(self, workers=RENDER_WORKERS, cache_size=RENDER_CACHE_SIZE):
+        self.workers = workers
+        self.cache_size = cache_size
+        self._executor = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(kind, *args):
+        """작업 종류와 집계값의 SHA-256 해시"""
+        return hashlib.sha256(pickle.dumps((kind, args), protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+    def submit(self, kind, *args):
+        """렌더링 작업 요청 (bytes를 돌려주는 Future 반환, 같은 요청이 캐시에 있으면 그 Future)"""
+        key = self.cache_key(kind, *args)
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None:
+                self._cache.move_to_end(key)
+                return future
+
+            future = self._get_executor().submit(_render, kind, args)
+            self._cache[key] = future
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        # 실패한 결과는 캐시하지 않음
+        future.add_done_callback(lambda done: done.exception() is not None and self._discard(key, done))
+        return future
+
+    def warm_up(self):
+        """작업 프로세스를 미리 시작 (폰트 등록은 작업 프로세스 시작 시 한 번, 기다리지 않음)"""
+        with self._lock:
+            executor = self._get_executor()
+            for _ in range(self.workers):
+                executor.submit(_ping)
+
+    def render(self, kind, *args, timeout=RENDER_TIMEOUT):
+        """렌더링 결과 bytes (끝날 때까지 대기)"""
+        return self.submit(kind, *args).result(timeout=timeout)
+
+    def _get_executor(self):
+        # 작업 프로세스는 첫 요청(또는 warm_up) 때 시작, self._lock 안에서 호출
+        # (Streamlit 서버 프로세스를 fork하지 않도록 과목별 병렬 채점과 같은 worker_context 사용)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=worker_context(), initializer=_init_render_worker
+            )
+        return self._executor
+
+    def _discard(self, key, future):
+        with self._lock:
+            if self._cache.get(key) is future:
+                del self._cache[key]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._cache.clear()
@@ -0,0 +1,410 @@
+"""PDF 리포트 (과목별 리포트, 학생별 성적표)
+
+reportlab으로 PDF를 만드는 함수를 Streamlit 화면과 분리해 둔 모듈입니다.
+학생별 성적표는 프로세스 풀에서 나누어 만들고, 끝나는 대로 ZIP 파일에 씁니다.
+"""
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+import pandas as pd
+
+from assets import register_pdf_font
+from grading import worker_context, wrong_answer_distribution
+
+# reportlab 선택적 import (PDF 기능용)
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+# 성적표 생성 작업 프로세스 수 기본값 (CPU 수, 최대 4개 - 앱에서는 성적표 ZIP마다 풀을 따로 만들므로 상한을 둠)
+REPORT_CARD_WORKERS = max(1, min(os.cpu_count() or 1, 4))
+
+# 성적표 생성 시 작업 프로세스마다 동시에 맡겨 두는 학생 수 (ZIP에 쓰지 않은 PDF가 쌓이지 않도록 제한)
+REPORT_CARD_QUEUE_PER_WORKER = 4
+
+# 성적표 과목별 표 머리글
+REPORT_CARD_HEADER = ['과목', '원점수', '정답수', '표준점수', '백분위', '등급', '석차']
+REPORT_CARD_HEADER_EN = ['Subject', 'Score', 'Correct', 'Std. Score', 'Percentile', 'Grade', 'Rank']
+
+
+def setup_korean_font_for_pdf():
+    """PDF 생성을 위한 한글 폰트 설정
+
+    폰트 검색/등록은 프로세스마다 한 번만 합니다. (assets.register_pdf_font)
+
+    Returns:
+        str: 사용 가능한 폰트 이름 ('Korean' 또는 'Helvetica')
+    """
+    return register_pdf_font()
+
+
+def report_table_style(font_name, header_color, header_font_size=12, body_font_size=10, header_padding=12):
+    """리포트 표 공통 스타일 (색 머리글 행 + 줄무늬 본문 + 격자)"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_color)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
+        ('FONTSIZE', (0, 1), (-1, -1), body_font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), header_padding),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
+    ])
+
+
+def report_paragraph_styles(font_name):
+    """리포트 제목/소제목 스타일"""
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1f77b4'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName=font_name
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName=font_name
+    )
+    body_style = ParagraphStyle('CustomBody', parent=styles['Normal'], fontSize=11, leading=16, fontName=font_name)
+    return title_style, heading_style, body_style
+
+
+def subject_report_aggregates(subject_df, subject_responses, item_analysis_df=None):
+    """과목별 PDF 리포트에 들어가는 집계값 (작업 프로세스로 보내고 캐시 키로 쓰도록 기본 타입만 사용)
+
+    Args:
+        subject_df: 해당 과목의 채점 결과 DataFrame
+        subject_responses: 해당 과목의 문항별 채점 결과 (grading.SubjectResponses)
+        item_analysis_df: 해당 과목의 문항 분석표 (item_analysis.analyze_items, optional)
+
+    Returns:
+        dict: 기본 통계, 10점 단위 점수 분포, 오답 많은 문항 15개, 문항 분석표 행
+    """
+    scores = subject_df['총점']
+
+    # 점수 분포 계산
+    bins = list(range(0, 101, 10))
+    labels = [f"{i}-{i+9}" for i in range(0, 100, 10)]
+    score_dist = pd.cut(scores, bins=bins, labels=labels, include_lowest=True).value_counts().sort_index()
+
+    # 문항별 오답 분포 (정답 여부 행렬의 열 합)
+    wrong_dist_df = wrong_answer_distribution(subject_responses).head(15)
+
+    aggregates = {
+        'n_students': len(subject_df),
+        'mean': float(scores.mean()),
+        'std': float(scores.std()),
+        'max': scores.max().item(),
+        'min': scores.min().item(),
+        'score_distribution': [(str(label), int(count)) for label, count in score_dist.items()],
+        'wrong_distribution': [(int(q), int(count)) for q, count in wrong_dist_df[['문항 번호', '오답 인원']].itertuples(index=False)],
+        'item_columns': None,
+        'item_rows': None,
+    }
+    if item_analysis_df is not None and len(item_analysis_df) > 0:
+        aggregates['item_columns'] = [str(column) for column in item_analysis_df.columns]
+        aggregates['item_rows'] = [
+            (int(row[0]), str(row[1]), float(row[2]), float(row[3]), float(row[4])) + tuple(int(count) for count in row[5:])
+            for row in item_analysis_df.itertuples(index=False)
+        ]
+    return aggregates
+
+
+def render_subject_pdf(subject, aggregates, font_name=None):
+    """과목별 PDF 리포트를 bytes로 생성
+
+    Args:
+        subject: 과목명
+        aggregates: subject_report_aggregates의 결과
+        font_name: 등록된 PDF 폰트 이름 (None이면 setup_korean_font_for_pdf로 등록)
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4), 
+                           rightMargin=30, leftMargin=30, 
+                           topMargin=30, bottomMargin=30)
+    
+    # 스토리 (PDF 내용)
+    story = []
+
+    # 한글 폰트 설정
+    if font_name is None:
+        font_name = setup_korean_font_for_pdf()
+
+    # 스타일 정의
+    title_style, heading_style, _ = report_paragraph_styles(font_name)
+    styles = getSampleStyleSheet()
+
+    # 제목
+    title_text = f"{subject} 과목 채점 리포트"
+    if font_name == 'Helvetica':
+        title_text = f"{subject} Subject Report"  # 폰트 실패 시 영문으로
+    story.append(Paragraph(title_text, title_style))
+    story.append(Spacer(1, 0.2*inch))
+    
+    # 1. 기본 통계
+    story.append(Paragraph("1. Basic Statistics" if font_name == 'Helvetica' else "1. 기본 통계", heading_style))
+    
+    n_students = aggregates['n_students']
+    stats_data = [
+        ['Item' if font_name == 'Helvetica' else '항목', 'Value' if font_name == 'Helvetica' else '값'],
+        ['Students' if font_name == 'Helvetica' else '인원', f"{n_students}"],
+        ['Average' if font_name == 'Helvetica' else '평균 점수', f"{aggregates['mean']:.1f}"],
+        ['Std Dev' if font_name == 'Helvetica' else '표준편차', f"{aggregates['std']:.2f}"],
+        ['Max Score' if font_name == 'Helvetica' else '최고 점수', f"{aggregates['max']}"],
+        ['Min Score' if font_name == 'Helvetica' else '최저 점수', f"{aggregates['min']}"],
+    ]
+    
+    stats_table = Table(stats_data, colWidths=[3*inch, 3*inch])
+    stats_table.setStyle(report_table_style(font_name, '#3498db', body_font_size=11))
+    story.append(stats_table)
+    story.append(Spacer(1, 0.3*inch))
+    
+    # 2. 점수 분포
+    story.append(Paragraph("2. Score Distribution" if font_name == 'Helvetica' else "2. 점수 분포 (10점 단위)", heading_style))
+    
+    # 점수 분포 테이블
+    dist_data = [['Score Range' if font_name == 'Helvetica' else '점수 구간', 'Students' if font_name == 'Helvetica' else '학생 수', 'Ratio' if font_name == 'Helvetica' else '비율']]
+    for label, count in aggregates['score_distribution']:
+        ratio = f"{(count / n_students * 100):.1f}%"
+        dist_data.append([label, str(count), ratio])
+    
+    dist_table = Table(dist_data, colWidths=[2*inch, 2*inch, 2*inch])
+    dist_table.setStyle(report_table_style(font_name, '#2ecc71'))
+    story.append(dist_table)
+    story.append(Spacer(1, 0.3*inch))
+    
+    # 3. 오답 분석
+    story.append(Paragraph("3. Wrong Answer Analysis" if font_name == 'Helvetica' else "3. 오답 분석", heading_style))
+    
+    if aggregates['wrong_distribution']:
+        wrong_data = [['Question No.' if font_name == 'Helvetica' else '문항 번호', 
+                       'Wrong Count' if font_name == 'Helvetica' else '오답 인원', 
+                       'Wrong Rate' if font_name == 'Helvetica' else '오답률']]
+        for q_num, count in aggregates['wrong_distribution']:
+            rate = f"{(count / n_students * 100):.1f}%"
+            wrong_data.append([str(q_num), str(count), rate])
+        
+        wrong_table = Table(wrong_data, colWidths=[2*inch, 2*inch, 2*inch])
+        wrong_table.setStyle(report_table_style(font_name, '#e74c3c'))
+        story.append(wrong_table)
+    else:
+        no_wrong_text = "All students answered correctly!" if font_name == 'Helvetica' else "모든 학생이 전 문항을 맞췄습니다!"
+        story.append(Paragraph(no_wrong_text, styles['Normal']))
+
+    # 4. 문항 분석 (정답률, 변별도, 점이연상관, 선택지 분포)
+    if aggregates['item_rows']:
+        story.append(Spacer(1, 0.3*inch))
+        story.append(Paragraph("4. Item Analysis" if font_name == 'Helvetica' else "4. 문항 분석", heading_style))
+
+        choice_columns = aggregates['item_columns'][5:]
+        if font_name == 'Helvetica':
+            item_header = ['No.', 'Key', 'p', 'D', 'r_pb'] + ['1', '2', '3', '4', '5', 'Other', 'Blank']
+        else:
+            item_header = ['문항', '정답', '정답률', '변별도', '점이연상관'] + [column.replace('선택 ', '') for column in choice_columns]
+        item_data = [item_header]
+        for row in aggregates['item_rows']:
+            item_data.append(
+                [str(row[0]), str(row[1]), f"{row[2]:.2f}", f"{row[3]:.2f}", f"{row[4]:.2f}"]
+                + [str(count) for count in row[5:]]
+            )
+
+        item_table = Table(item_data, repeatRows=1)
+        item_table.setStyle(report_table_style(font_name, '#8e44ad', header_font_size=10, body_font_size=9, header_padding=8))
+        story.append(item_table)
+    
+    # PDF 생성
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def generate_subject_pdf_report(subject, subject_df, subject_label, subject_responses, item_analysis_df=None):
+    """과목별 PDF 리포트 생성
+
+    Args:
+        subject: 과목명
+        subject_df: 해당 과목의 채점 결과 DataFrame
+        subject_label: 과목 코드
+        subject_responses: 해당 과목의 문항별 채점 결과 (grading.SubjectResponses)
+        item_analysis_df: 해당 과목의 문항 분석표 (item_analysis.analyze_items, optional)
+    """
+    if not REPORTLAB_AVAILABLE:
+        return None
+    aggregates = subject_report_aggregates(subject_df, subject_responses, item_analysis_df)
+    return io.BytesIO(render_subject_pdf(subject, aggregates))
+
+
+@dataclass(frozen=True)
+class ReportCard:
+    """학생 한 명의 성적표 내용 (작업 프로세스로 보내는 값만 보관)"""
+    file_name: str
+    student_label: str
+    rows: tuple             # 과목별 REPORT_CARD_HEADER 순서의 문자열
+    wrong_questions: tuple  # 과목별 (과목, 오답번호)
+
+
+def _safe_file_name(name):
+    """ZIP 안 파일 이름에 쓸 수 없는 문자 제거"""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', name).strip('_') or 'student'
+
+
+def iter_report_cards(result_df, response_data):
+    """채점 결과를 학생(수험번호)별 성적표 내용으로 변환
+
+    석차는 과목별 총점 내림차순 순위(동점자는 같은 순위)이며,
+    result_df에 표준점수/백분위/등급 컬럼이 있으면 함께 표시합니다. (standard_scores.convert_scores)
+
+    Args:
+        result_df: 채점 결과 DataFrame (index는 행 위치)
+        response_data: 채점 시 함께 만든 ResponseData (오답번호용)
+
+    Yields:
+        ReportCard: 수험번호가 처음 나온 순서
+    """
+    by_subject = result_df.groupby('과목코드', observed=True)['총점']
+    ranks = by_subject.rank(method='min', ascending=False).astype(int).astype(str)
+    ranks = ranks + ' / ' + by_subject.transform('size').astype(str)
+    df = response_data.display_frame(result_df).assign(석차=ranks)
+
+    def column(name):
+        return df[name].astype(str) if name in df.columns else pd.Series('-', index=df.index)
+
+    subject_names = df['과목명'].astype(str) if '과목명' in df.columns else df['과목코드'].astype(str)
+    scores = df['총점'].astype(str) + ' / ' + df['만점'].astype(str)
+    table_rows = list(zip(
+        subject_names, scores, df['정답수'].astype(str), column('표준점수'), column('백분위'), column('등급'), df['석차']
+    ))
+    wrong_rows = list(zip(subject_names, df['오답번호'].astype(str)))
+
+    has_info = '이름' in df.columns
+    for student_id, positions in df.groupby('수험번호', sort=False).indices.items():
+        first = df.iloc[positions[0]]
+        if has_info and pd.notna(first['이름']):
+            label = f"{first['이름']} ({first['학번']})"
+            file_name = f"{student_id}_{first['이름']}"
+        else:
+            label = f"수험번호: {student_id}"
+            file_name = str(student_id)
+        yield ReportCard(
+            file_name=f"{_safe_file_name(file_name)}.pdf",
+            student_label=label,
+            rows=tuple(table_rows[i] for i in positions),
+            wrong_questions=tuple(wrong_rows[i] for i in positions),
+        )
+
+
+def render_report_card(card, font_name=None, title=None):
+    """성적표 한 장을 PDF bytes로 생성
+
+    Args:
+        card: ReportCard
+        font_name: 등록된 PDF 폰트 이름 (None이면 setup_korean_font_for_pdf로 등록)
+        title: 성적표 제목 (예: 시험 이름, 없으면 '개인 성적표')
+    """
+    if font_name is None:
+        font_name = setup_korean_font_for_pdf()
+    english = font_name == 'Helvetica'
+    title_style, heading_style, body_style = report_paragraph_styles(font_name)
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
+    story = [
+        Paragraph(title or ('Report Card' if english else '개인 성적표'), title_style),
+        Paragraph(card.student_label, heading_style),
+        Spacer(1, 0.1*inch),
+    ]
+
+    score_table = Table([REPORT_CARD_HEADER_EN if english else REPORT_CARD_HEADER] + [list(row) for row in card.rows])
+    score_table.setStyle(report_table_style(font_name, '#3498db', header_font_size=11))
+    story.append(score_table)
+    story.append(Spacer(1, 0.3*inch))
+
+    story.append(Paragraph("Wrong Questions" if english else "오답 문항", heading_style))
+    for subject_name, wrong in card.wrong_questions:
+        story.append(Paragraph(f"{subject_name}: {wrong}", body_style))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+# 작업 프로세스마다 한 번 등록한 PDF 폰트 이름 (_init_report_worker)
+_worker_font_name = None
+
+
+def _init_report_worker():
+    global _worker_font_name
+    _worker_font_name = setup_korean_font_for_pdf()
+
+
+def _render_report_card_job(card, title):
+    return card.file_name, render_report_card(card, _worker_font_name, title)
+
+
+def write_report_cards_zip(cards, target, workers=None, title=None, progress=None):
+    """학생별 성적표 PDF를 프로세스 풀에서 만들어 ZIP 파일로 저장
+
+    PDF는 끝나는 순서대로 ZIP에 바로 쓰고, 아직 쓰지 않은 작업은 작업 프로세스당
+    REPORT_CARD_QUEUE_PER_WORKER개까지만 맡기므로 전체 PDF를 메모리에 모으지 않습니다.
+
+    Args:
+        cards: ReportCard 목록 (iter_report_cards)
+        target: ZIP 파일 경로 또는 쓰기 가능한 파일 객체
+        workers: 프로세스 수 (None이면 REPORT_CARD_WORKERS)
+        title: 성적표 제목
+        progress: 성적표 한 장을 쓸 때마다 (완료 수, 전체 수)를 받는 함수
+
+    Returns:
+        int: ZIP에 쓴 성적표 수
+    """
+    cards = list(cards)
+    workers = max(1, min(workers or REPORT_CARD_WORKERS, len(cards) or 1))
+    max_pending = workers * REPORT_CARD_QUEUE_PER_WORKER
+    written = 0
+    used_names = set()
+
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=worker_context(),
+                                initializer=_init_report_worker) as executor:
+        pending = set()
+        queued = iter(cards)
+        while True:
+            for card in queued:
+                pending.add(executor.submit(_render_report_card_job, card, title))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_name, pdf_bytes = future.result()
+                # 같은 수험번호/이름이 두 번 나오면 번호를 붙여 덮어쓰지 않음
+                stem, suffix, n = file_name[:-4], file_name[-4:], 1
+                while file_name in used_names:
+                    n += 1
+                    file_name = f"{stem}_{n}{suffix}"
+                used_names.add(file_name)
+                archive.writestr(file_name, pdf_bytes)
+                written += 1
+                if progress is not None:
+                    progress(written, len(cards))
+    return written
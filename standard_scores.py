@@ -0,0 +1,114 @@
+"""표준점수, 백분위, 등급 환산
+
+채점 결과(result_df)의 원점수를 과목코드별로 다음과 같이 환산합니다.
+
+- 표준점수: 평균 + 표준편차 × z (z = (원점수 - 과목 평균) / 과목 표준편차), 소수 첫째 자리에서 반올림
+- 백분위: (표준점수가 더 낮은 인원 + 같은 인원의 절반) / 응시 인원 × 100, 반올림
+- 등급: 표준점수 기준 상위 누적 비율 4, 11, 23, 40, 60, 77, 89, 96% 경계로 9등급
+  (동점자는 모두 상위 등급, 즉 자기보다 높은 점수의 인원 비율로 등급 결정)
+
+과목마다 정렬(np.unique) 한 번으로 계산하므로 과목당 O(n log n)이며,
+여러 과목(탐구 전 과목 등)을 convert_scores 한 번으로 환산합니다.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+# 과목 종류별 표준점수 (평균, 표준편차) - 수능 기준
+STANDARD_SCORE_SCALES = {
+    '국어': (100, 20),
+    '수학': (100, 20),
+    '탐구': (50, 10),
+}
+DEFAULT_STANDARD_SCORE_SCALE = (50, 10)
+
+# 1~8등급 상위 누적 비율 경계 (9등급은 나머지)
+GRADE_CUMULATIVE_RATIOS = (0.04, 0.11, 0.23, 0.40, 0.60, 0.77, 0.89, 0.96)
+
+SCORE_COLUMNS = ['표준점수', '백분위', '등급']
+
+
+def round_half_up(values):
+    """사사오입 반올림 (np.round는 짝수 쪽으로 반올림하므로 사용하지 않음)"""
+    return np.floor(np.asarray(values, dtype=np.float64) + 0.5)
+
+
+@dataclass
+class ScoreConversion:
+    """convert_scores 결과"""
+    scores: pd.DataFrame                             # 표준점수 | 백분위 | 등급 (index는 result_df와 같음)
+    cut_tables: dict = field(default_factory=dict)   # 과목코드 → 등급컷 표
+
+
+def convert_subject_scores(raw_scores, scale=DEFAULT_STANDARD_SCORE_SCALE, ratios=GRADE_CUMULATIVE_RATIOS):
+    """과목 하나의 원점수 배열을 표준점수/백분위/등급으로 환산
+
+    Args:
+        raw_scores: 학생별 원점수 배열
+        scale: 표준점수 (평균, 표준편차)
+        ratios: 1~8등급 상위 누적 비율 경계
+
+    Returns:
+        tuple: (표준점수, 백분위, 등급) numpy 배열
+    """
+    raw_scores = np.asarray(raw_scores, dtype=np.float64)
+    n_students = len(raw_scores)
+    std = raw_scores.std()  # 모집단 표준편차
+    z_scores = (raw_scores - raw_scores.mean()) / std if std > 0 else np.zeros(n_students)
+    standard = round_half_up(scale[0] + scale[1] * z_scores)
+
+    # 서로 다른 표준점수마다 더 낮은/더 높은 인원을 한 번에 계산 (오름차순 정렬 한 번)
+    unique_scores, inverse, counts = np.unique(standard, return_inverse=True, return_counts=True)
+    cumulative = np.cumsum(counts)
+    below = cumulative - counts
+    above = n_students - cumulative
+    percentile = round_half_up((below + counts / 2) / n_students * 100)
+    grade = np.searchsorted(np.asarray(ratios), above / n_students, side='right') + 1
+
+    return standard, percentile[inverse], grade[inverse]
+
+
+def grade_cut_table(raw_scores, standard, grades, n_grades=len(GRADE_CUMULATIVE_RATIOS) + 1):
+    """등급별 원점수/표준점수 컷과 인원 비율 표 (해당 등급 학생이 없으면 컷은 빈칸)"""
+    table = pd.DataFrame({'등급': grades, '원점수': raw_scores, '표준점수': standard}).groupby('등급').agg(
+        **{'원점수 컷': ('원점수', 'min'), '표준점수 컷': ('표준점수', 'min'), '인원': ('원점수', 'size')}
+    ).reindex(range(1, n_grades + 1))
+    table['인원'] = table['인원'].fillna(0).astype(np.int64)
+    n_students = max(len(grades), 1)
+    table['비율'] = (table['인원'] / n_students * 100).round(1)
+    table['누적 비율'] = (table['인원'].cumsum() / n_students * 100).round(1)
+    return table.reset_index()
+
+
+def convert_scores(result_df, scale=DEFAULT_STANDARD_SCORE_SCALE, ratios=GRADE_CUMULATIVE_RATIOS):
+    """채점 결과 전체를 과목코드별로 표준점수/백분위/등급 환산
+
+    Args:
+        result_df: 채점 결과 DataFrame (과목코드, 총점 컬럼)
+        scale: 표준점수 (평균, 표준편차), 과목 종류별 값은 STANDARD_SCORE_SCALES 참고
+        ratios: 1~8등급 상위 누적 비율 경계
+
+    Returns:
+        ScoreConversion: result_df와 같은 행 순서의 환산 점수와 과목별 등급컷 표
+    """
+    raw_scores = result_df['총점'].to_numpy(dtype=np.float64)
+    standard = np.zeros(len(result_df))
+    percentile = np.zeros(len(result_df))
+    grades = np.zeros(len(result_df), dtype=np.int8)
+
+    cut_tables = {}
+    for subject, positions in result_df.groupby('과목코드', observed=True, sort=False).indices.items():
+        subject_raw = raw_scores[positions]
+        subject_standard, subject_percentile, subject_grades = convert_subject_scores(subject_raw, scale, ratios)
+        standard[positions] = subject_standard
+        percentile[positions] = subject_percentile
+        grades[positions] = subject_grades
+        cut_tables[subject] = grade_cut_table(subject_raw, subject_standard, subject_grades, len(ratios) + 1)
+
+    scores = pd.DataFrame({
+        '표준점수': standard.astype(np.int16),
+        '백분위': percentile.astype(np.int8),
+        '등급': grades,
+    }, index=result_df.index)
+    return ScoreConversion(scores, cut_tables)
@@ -0,0 +1,5 @@
+"""pytest 공통 설정: 저장소 루트의 모듈(grading, loaders 등)을 import할 수 있도록 경로 추가"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
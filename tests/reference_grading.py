@@ -0,0 +1,140 @@
+"""벡터화 이전의 학생별 채점 규칙을 그대로 옮긴 기준 구현 (테스트 전용)
+
+최초 버전 app.py의 grade_students 반복문과 같은 규칙으로 한 행씩 채점합니다.
+grade_frame, grade_chunks, 병렬 채점, 재채점 결과를 이 구현과 비교합니다.
+
+    - 정답 파일은 과목번호별로 문항 번호 순 정렬
+    - 답안은 공백을 제거한 뒤 둘 다 숫자로 해석되면 숫자로, 아니면 문자열로 비교
+      (True/TRUE/true와 bool True처럼 CSV 엔진이 bool로 읽을 수 있는 표기는 같은 답)
+    - 빈칸(학생 답안 또는 정답)과 답안이 없는 문항은 오답
+    - 정답 파일에 없는 과목코드의 학생은 결과에서 제외
+"""
+import random
+
+import numpy as np
+import pandas as pd
+
+
+def reference_answer_dict(answer_df):
+    """정답 DataFrame → {과목번호: {'answers': [...], 'points': [...]}}"""
+    subject_col, question_col, answer_col, points_col = answer_df.columns[:4]
+    answer_dict = {}
+    for subject in answer_df[subject_col].unique():
+        subject_answers = answer_df[answer_df[subject_col] == subject].sort_values(by=question_col, kind='stable')
+        answer_dict[subject] = {
+            'answers': subject_answers[answer_col].tolist(),
+            'points': [float(p) for p in subject_answers[points_col]],
+        }
+    return answer_dict
+
+
+BOOL_SPELLINGS = {'True': 'True', 'TRUE': 'True', 'true': 'True', 'False': 'False', 'FALSE': 'False', 'false': 'False'}
+
+
+def answers_match(student_ans, correct_ans):
+    """기존 채점 규칙의 답안 비교"""
+    if pd.isna(student_ans) or pd.isna(correct_ans):
+        return False
+    student_ans_str = str(student_ans).strip()
+    correct_ans_str = str(correct_ans).strip()
+    student_ans_str = BOOL_SPELLINGS.get(student_ans_str, student_ans_str)
+    correct_ans_str = BOOL_SPELLINGS.get(correct_ans_str, correct_ans_str)
+    try:
+        return float(student_ans_str) == float(correct_ans_str)
+    except ValueError:
+        return student_ans_str == correct_ans_str
+
+
+def reference_grade(student_df, answer_df):
+    """학생 답안을 한 행씩 채점
+
+    Returns:
+        list: 채점된 행마다 dict(수험번호, 과목코드, 총점, 만점, 정답수, 문항수, 오답번호, 정답여부)
+    """
+    answer_dict = reference_answer_dict(answer_df)
+    results = []
+    for row in student_df.itertuples(index=False):
+        student_id, subject = row[0], row[1]
+        if subject not in answer_dict:
+            continue
+        answers = answer_dict[subject]['answers']
+        points = answer_dict[subject]['points']
+        student_answers = list(row[2:])
+
+        correct = [
+            i < len(student_answers) and answers_match(student_answers[i], answers[i])
+            for i in range(len(answers))
+        ]
+        wrong_questions = [str(i + 1) for i, is_correct in enumerate(correct) if not is_correct]
+        results.append({
+            '수험번호': student_id,
+            '과목코드': subject,
+            '총점': int(sum(point for point, is_correct in zip(points, correct) if is_correct)),
+            '만점': int(sum(points)),
+            '정답수': sum(correct),
+            '문항수': len(answers),
+            '오답번호': ', '.join(wrong_questions) or '없음',
+            '정답여부': correct,
+        })
+    return results
+
+
+def assert_matches_reference(result_df, response_data, expected):
+    """채점 결과(result_df, ResponseData)가 기준 구현의 결과와 같은지 확인"""
+    assert len(result_df) == len(expected)
+    assert result_df['수험번호'].tolist() == [row['수험번호'] for row in expected]
+    assert result_df['과목코드'].tolist() == [row['과목코드'] for row in expected]
+    for column in ('총점', '만점', '정답수', '문항수'):
+        assert result_df[column].tolist() == [row[column] for row in expected], column
+    assert list(response_data.wrong_questions()) == [row['오답번호'] for row in expected]
+
+    for subject, subject_responses in response_data.subjects.items():
+        expected_correct = [expected[row]['정답여부'] for row in subject_responses.rows]
+        assert subject_responses.correct.tolist() == expected_correct, subject
+
+
+# 무작위 시험 데이터에 쓰는 답안 값 (같은 답의 여러 표기, 문자 답안, bool 표기 포함)
+ANSWER_SPELLINGS = {
+    1: [1, 1.0, '1', ' 1 ', '1.0', '01'],
+    2: [2, 2.0, '2', '2 '],
+    3: [3, '3', ' 3'],
+    4: [4, '4.00'],
+    5: [5, '5'],
+    'ㄱ': ['ㄱ', ' ㄱ'],
+    'A': ['A', 'A '],
+    'True': [True, 'True', 'true', 'TRUE'],
+}
+
+
+def random_exam(seed, n_students=200, subjects=('S1', 'S2', 'S3'), n_questions=(20, 12, 7), blank_ratio=0.1):
+    """무작위 학생 답안/정답 DataFrame 한 쌍
+
+    학생 답안은 object 배열로 숫자, 숫자 문자열, 공백이 붙은 문자열, 문자 답안, 빈칸을 섞어 만들고,
+    정답에도 빈칸과 문자 답안을 넣습니다. 문항 수가 다른 과목은 답안 열이 남거나 모자랍니다.
+    정답 파일에 없는 과목코드(XX)의 학생도 섞습니다.
+    """
+    rng = random.Random(seed)
+    choices = list(ANSWER_SPELLINGS)
+    answer_rows = []
+    for subject, count in zip(subjects, n_questions):
+        for question in range(1, count + 1):
+            answer = np.nan if rng.random() < 0.05 else rng.choice(choices)
+            answer_rows.append([subject, question, answer, rng.choice([2, 3, 4])])
+    answer_df = pd.DataFrame(answer_rows, columns=['과목번호', '문항', '정답', '배점'])
+    # 문항 번호 순서가 섞여 있어도 같은 결과여야 함
+    answer_df = answer_df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    n_answer_cols = max(n_questions) - 2
+    student_rows = []
+    for i in range(n_students):
+        subject = rng.choice(list(subjects) + ['XX'])
+        answers = []
+        for _ in range(n_answer_cols):
+            if rng.random() < blank_ratio:
+                answers.append(np.nan)
+            else:
+                answers.append(rng.choice(ANSWER_SPELLINGS[rng.choice(choices)]))
+        student_rows.append([f'2024{i:05d}', subject] + answers)
+    columns = ['수험번호', '과목코드'] + [f'{q}번' for q in range(1, n_answer_cols + 1)]
+    student_df = pd.DataFrame(student_rows, columns=columns)
+    return student_df, answer_df
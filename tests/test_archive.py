@@ -0,0 +1,95 @@
+"""archive 시험 결과 보관소 테스트 (저장 후 불러온 결과가 채점 직후와 같은지)"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from grading import compile_answer_key, grade_frame, regrade
+from reference_grading import assert_matches_reference, random_exam, reference_grade
+
+pytest.importorskip('pyarrow')
+
+from archive import ExamArchive  # noqa: E402
+
+
+def assert_same_exam(loaded, result_df, response_data):
+    pd.testing.assert_frame_equal(loaded.result_df, result_df.reset_index(drop=True))
+    assert list(loaded.response_data.subjects) == list(response_data.subjects)
+    for subject, subject_responses in response_data.subjects.items():
+        loaded_responses = loaded.response_data[subject]
+        assert loaded_responses.rows.tolist() == subject_responses.rows.tolist()
+        assert (loaded_responses.correct == subject_responses.correct).all()
+        assert (loaded_responses.responses == subject_responses.responses).all()
+        assert loaded_responses.tokens == subject_responses.tokens
+
+
+def test_save_and_load_round_trip(tmp_path):
+    student_df, answer_df = random_exam(3, n_students=300)
+    answer_key = compile_answer_key(answer_df)
+    result_df, response_data, _ = grade_frame(student_df, answer_key)
+
+    archive = ExamArchive(tmp_path)
+    archive.save(' 2025-06 모의고사 ', result_df, response_data, answer_key, '국어')
+    assert '2025-06 모의고사' in archive
+    assert (tmp_path / 'archive.sqlite3').exists()
+
+    loaded = archive.load('2025-06 모의고사')
+    assert loaded.subject_type == '국어'
+    assert_same_exam(loaded, result_df, response_data)
+    assert_matches_reference(loaded.result_df, loaded.response_data, reference_grade(student_df, answer_df))
+    for subject, subject_key in answer_key.subjects.items():
+        assert loaded.answer_key[subject].points.tolist() == subject_key.points.tolist()
+
+    subjects = archive.subjects('2025-06 모의고사')
+    assert subjects['과목코드'].tolist() == list(response_data.subjects)
+    assert subjects['응시 인원'].tolist() == [len(r.rows) for r in response_data.subjects.values()]
+
+
+def test_numeric_subject_codes_and_mixed_names_round_trip(tmp_path):
+    answer_df = pd.DataFrame([[1, 1, 1, 5], [99, 1, 2, 5]], columns=['과목번호', '문항', '정답', '배점'])
+    student_df = pd.DataFrame([['A', 1, 1], ['B', 99, 2], ['C', 99, 1]], columns=['수험번호', '과목코드', '1번'])
+    answer_key = compile_answer_key(answer_df)
+    result_df, response_data, _ = grade_frame(student_df, answer_key, subject_code_mapping={'1': '화법과 작문'})
+
+    archive = ExamArchive(tmp_path)
+    archive.save('숫자 과목코드', result_df, response_data, answer_key)
+    loaded = archive.load('숫자 과목코드')
+    assert_same_exam(loaded, result_df, response_data)
+    assert archive.subjects('숫자 과목코드')['과목코드'].tolist() == [1, 99]
+
+
+def test_regraded_exam_round_trip(tmp_path):
+    # 재채점 후에는 정답 토큰 순서가 답안 코드 순서와 다를 수 있음
+    student_df, answer_df = random_exam(5, n_students=200)
+    old_key = compile_answer_key(answer_df)
+    result_df, response_data, _ = grade_frame(student_df, old_key)
+    corrected_df = answer_df.copy()
+    corrected_df.loc[corrected_df.index[:5], '정답'] = 'ㄴ'
+    corrected_df.loc[corrected_df.index[5:8], '배점'] = 1
+    regraded = regrade(result_df, response_data, old_key, compile_answer_key(corrected_df))
+
+    archive = ExamArchive(tmp_path)
+    archive.save('정정', regraded.result_df, regraded.response_data, regraded.answer_key)
+    assert_same_exam(archive.load('정정'), regraded.result_df, regraded.response_data)
+
+
+def test_overwrite_list_and_delete(tmp_path):
+    student_df, answer_df = random_exam(1, n_students=50)
+    answer_key = compile_answer_key(answer_df)
+    result_df, response_data, _ = grade_frame(student_df, answer_key)
+    archive = ExamArchive(tmp_path)
+    archive.save('시험', result_df, response_data, answer_key)
+    archive.save('시험', result_df.iloc[:0], type(response_data)(n_rows=0), answer_key)
+    archive.save('다른 시험', result_df, response_data, answer_key)
+
+    exams = archive.exams()
+    assert sorted(exams['시험 ID']) == ['다른 시험', '시험']
+    assert exams.set_index('시험 ID').loc['시험', '인원'] == 0
+
+    archive.delete('시험')
+    assert '시험' not in archive
+    assert archive.exams()['시험 ID'].tolist() == ['다른 시험']
+    with pytest.raises(KeyError):
+        archive.load('시험')
+    with pytest.raises(ValueError):
+        archive.save('  ', result_df, response_data, answer_key)
+    assert np.array_equal(archive.load('다른 시험').result_df['총점'], result_df['총점'])
@@ -0,0 +1,29 @@
+"""batch_grade 작업 목록 테스트 (결과 파일 이름이 겹치지 않는지)"""
+from pathlib import Path
+
+from batch_grade import jobs_from_directory, jobs_from_manifest
+
+
+def test_directory_jobs_with_same_stem_get_distinct_output_names(tmp_path):
+    for name in ('a.csv', 'a.xlsx', 'A.xls', 'b.csv', 'answers.csv'):
+        (tmp_path / name).write_bytes(b'')
+    jobs = jobs_from_directory(tmp_path, tmp_path / 'answers.csv')
+    assert [job.student_file.name for job in jobs] == ['A.xls', 'a.csv', 'a.xlsx', 'b.csv']
+    assert [job.output_name for job in jobs] == ['A', 'a_2', 'a_3', 'b']
+
+
+def test_manifest_jobs_with_same_stem_get_distinct_output_names(tmp_path):
+    manifest = tmp_path / 'manifest.csv'
+    manifest.write_text(
+        'student_file,answer_file\n'
+        'day1/students.csv,answers.csv\n'
+        'day2/students.csv,answers.csv\n'
+        'students_2.csv,answers.csv\n'
+        'other.csv,answers.csv\n',
+        encoding='utf-8',
+    )
+    jobs = jobs_from_manifest(manifest)
+    assert jobs[0].student_file == tmp_path / 'day1' / 'students.csv'
+    assert [job.output_name for job in jobs] == ['students', 'students_2', 'students_2_2', 'other']
+    assert len({job.output_name for job in jobs}) == len(jobs)
+    assert all(isinstance(job.student_file, Path) for job in jobs)
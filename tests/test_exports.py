@@ -0,0 +1,33 @@
+"""exports 시트 이름 테스트 (31자로 잘린 과목명이 겹쳐도 시트가 따로 남는지)"""
+import io
+
+import openpyxl
+import pandas as pd
+
+from exports import build_results_workbook, subject_sheet_name
+from grading import compile_answer_key, grade_frame
+
+LONG_NAME = '가' * 31
+
+
+def test_subject_sheet_name_adds_suffix_within_31_characters():
+    used_names = set()
+    names = [
+        subject_sheet_name(pd.DataFrame({'과목명': [name]}), 'S', used_names)
+        for name in (LONG_NAME + '1', LONG_NAME + '2', 'abc', 'ABC')
+    ]
+    assert names == [LONG_NAME, '가' * 29 + '_2', 'abc', 'ABC_2']
+    assert all(len(name) <= 31 for name in names)
+
+
+def test_results_workbook_keeps_colliding_subjects_on_separate_sheets():
+    answer_df = pd.DataFrame([['S1', 1, 1, 5], ['S2', 1, 2, 5]], columns=['과목번호', '문항', '정답', '배점'])
+    student_df = pd.DataFrame([['A', 'S1', 1], ['B', 'S2', 2], ['C', 'S2', 1]], columns=['수험번호', '과목코드', '1번'])
+    mapping = {'S1': LONG_NAME + '(가)', 'S2': LONG_NAME + '(나)'}
+    result_df, response_data, _ = grade_frame(student_df, compile_answer_key(answer_df), subject_code_mapping=mapping)
+
+    workbook = openpyxl.load_workbook(io.BytesIO(
+        build_results_workbook(result_df, response_data, list(response_data.subjects))
+    ))
+    assert workbook.sheetnames == ['전체 채점결과', LONG_NAME, '가' * 29 + '_2']
+    assert workbook['가' * 29 + '_2'].max_row == 3
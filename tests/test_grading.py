@@ -0,0 +1,174 @@
+"""grade_frame을 기준 구현(reference_grading)과 비교하는 테스트"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grading import (
+    BLANK_CODE, compact_totals, compile_answer_key, encode_answers, format_wrong_questions, grade_chunks, grade_frame,
+    normalize_answer,
+)
+from reference_grading import assert_matches_reference, random_exam, reference_grade
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_answer_df(rows):
+    return pd.DataFrame(rows, columns=['과목번호', '문항', '정답', '배점'])
+
+
+def make_student_df(rows, n_answers):
+    columns = ['수험번호', '과목코드'] + [f'{q}번' for q in range(1, n_answers + 1)]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def grade(student_df, answer_df, **kwargs):
+    return grade_frame(student_df, compile_answer_key(answer_df), **kwargs)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_grade_frame_matches_reference(seed):
+    student_df, answer_df = random_exam(seed)
+    result_df, response_data, _ = grade(student_df, answer_df)
+    assert_matches_reference(result_df, response_data, reference_grade(student_df, answer_df))
+
+
+def test_grade_chunks_matches_reference():
+    student_df, answer_df = random_exam(7, n_students=500)
+    chunks = (student_df.iloc[start:start + 64] for start in range(0, len(student_df), 64))
+    result_df, response_data, _ = grade_chunks(chunks, compile_answer_key(answer_df))
+    assert_matches_reference(result_df, response_data, reference_grade(student_df, answer_df))
+
+
+def test_sample_files_match_reference():
+    student_df = pd.read_csv(REPO_ROOT / 'sample_students.csv')
+    answer_df = pd.read_csv(REPO_ROOT / 'sample_answers.csv')
+    result_df, response_data, issues = grade(student_df, answer_df)
+    assert_matches_reference(result_df, response_data, reference_grade(student_df, answer_df))
+    assert not [message for level, message in issues if level == 'error']
+
+
+@pytest.mark.parametrize('value, token', [
+    (1, 1.0), (1.0, 1.0), ('1', 1.0), (' 1 ', 1.0), ('1.0', 1.0), ('01', 1.0),
+    ('ㄱ', 'ㄱ'), (' ㄱ ', 'ㄱ'), ('A', 'A'),
+    (True, 'True'), (np.True_, 'True'), ('true', 'True'), (' TRUE ', 'True'), (False, 'False'), ('false', 'False'),
+    (np.nan, None), (None, None), ('nan', None),
+])
+def test_normalize_answer(value, token):
+    assert normalize_answer(value) == token
+
+
+def test_encode_answers_shares_codes_between_spellings():
+    vocab = {}
+    codes = encode_answers(np.array([[1, '1', ' 1.0 '], ['ㄱ', np.nan, 'ㄱ ']], dtype=object), vocab)
+    assert codes[0].tolist() == [codes[0, 0]] * 3
+    assert codes[1, 0] == codes[1, 2] != codes[0, 0]
+    assert codes[1, 1] == BLANK_CODE
+    assert len(vocab) == 2
+
+
+def test_encode_answers_keeps_bool_apart_from_one_and_zero():
+    vocab = {}
+    codes = encode_answers(np.array([[1, True, 0, False], ['1', 'true', '0', 'FALSE']], dtype=object), vocab)
+    assert codes[0].tolist() == codes[1].tolist()
+    assert len(set(codes[0].tolist())) == 4
+    assert set(vocab) == {1.0, 'True', 0.0, 'False'}
+
+
+def test_multiple_spellings_of_same_answer_are_correct():
+    answer_df = make_answer_df([['M', 1, 1, 10], ['M', 2, '3', 10], ['M', 3, 'ㄱ', 10], ['M', 4, 2.0, 10]])
+    student_df = make_student_df([
+        ['A', 'M', '1', 3, ' ㄱ', '2'],
+        ['B', 'M', ' 1.0 ', '3.0', 'ㄱ', 2],
+        ['C', 'M', 2, '03', 'ㄴ', np.nan],
+    ], 4)
+    result_df, response_data, _ = grade(student_df, answer_df)
+    assert result_df['총점'].tolist() == [40, 40, 10]
+    assert list(response_data.wrong_questions()) == ['없음', '없음', '1, 3, 4']
+    assert_matches_reference(result_df, response_data, reference_grade(student_df, answer_df))
+
+
+def test_blank_answer_key_is_never_correct():
+    answer_df = make_answer_df([['M', 1, np.nan, 10], ['M', 2, 2, 10], ['M', 3, '', 5]])
+    answer_df['정답'] = answer_df['정답'].replace('', np.nan)
+    student_df = make_student_df([
+        ['A', 'M', np.nan, 2, np.nan],
+        ['B', 'M', 1, 2, 'nan'],
+    ], 3)
+    result_df, response_data, _ = grade(student_df, answer_df)
+    assert result_df['총점'].tolist() == [10, 10]
+    assert result_df['만점'].tolist() == [25, 25]
+    assert list(response_data.wrong_questions()) == ['1, 3', '1, 3']
+    assert_matches_reference(result_df, response_data, reference_grade(student_df, answer_df))
+
+
+def test_missing_answer_columns_are_wrong_with_warning():
+    answer_df = make_answer_df([['M', q, q, 5] for q in range(1, 5)])
+    student_df = make_student_df([['A', 'M', 1, 2]], 2)
+    result_df, response_data, issues = grade(student_df, answer_df)
+    assert result_df['정답수'].tolist() == [2]
+    assert result_df['문항수'].tolist() == [4]
+    assert list(response_data.wrong_questions()) == ['3, 4']
+    assert any(level == 'warning' and '답안 부족' in message for level, message in issues)
+
+
+def test_unknown_subject_is_excluded_with_error():
+    answer_df = make_answer_df([['M', 1, 1, 5]])
+    student_df = make_student_df([['A', 'M', 1], ['B', 'X', 1], ['C', np.nan, 1]], 1)
+    result_df, response_data, issues = grade(student_df, answer_df)
+    assert result_df['수험번호'].tolist() == ['A']
+    errors = [message for level, message in issues if level == 'error']
+    assert len(errors) == 2 and "'X'" in errors[0]
+    assert response_data.wrong_questions().tolist() == ['없음']
+
+
+@pytest.mark.parametrize('correct, expected', [
+    ([[True, True, True]], ['없음']),
+    ([[False, True, False]], ['1, 3']),
+    ([[False, False, False], [True, False, True]], ['1, 2, 3', '2']),
+])
+def test_format_wrong_questions(correct, expected):
+    assert format_wrong_questions(np.array(correct, dtype=bool)) == expected
+
+
+def test_format_wrong_questions_numbers_past_nine():
+    correct = np.ones((1, 12), dtype=bool)
+    correct[0, [0, 9, 11]] = False
+    assert format_wrong_questions(correct) == ['1, 10, 12']
+
+
+def test_display_frame_combines_counts_and_adds_wrong_questions():
+    answer_df = make_answer_df([['M', 1, 1, 10], ['M', 2, 2, 10]])
+    student_df = make_student_df([['A', 'M', 1, 3], ['B', 'M', 1, 2]], 2)
+    result_df, response_data, _ = grade(student_df, answer_df)
+    display_df = response_data.display_frame(result_df.iloc[[1, 0]])
+    assert display_df['정답수'].tolist() == ['2/2', '1/2']
+    assert display_df['오답번호'].tolist() == ['없음', '2']
+    assert '문항수' not in display_df.columns
+
+
+def test_partially_mapped_subject_names_convert_to_arrow():
+    pyarrow = pytest.importorskip('pyarrow')
+    answer_df = make_answer_df([[1, 1, 1, 5], [99, 1, 1, 5]])
+    student_df = make_student_df([['A', 1, 1], ['B', 99, 1]], 1)
+    result_df, _, _ = grade(student_df, answer_df, subject_code_mapping={'1': '화법과 작문'})
+    assert result_df['과목명'].tolist() == ['화법과 작문', '99']
+    assert pyarrow.Table.from_pandas(result_df).num_rows == 2
+
+
+@pytest.mark.parametrize('bad_points', [np.nan, 'inf', 'abc'])
+def test_invalid_points_count_as_zero_with_error(bad_points):
+    answer_df = make_answer_df([['M', 1, 1, 10], ['M', 2, 2, bad_points], ['M', 3, 3, 5]])
+    student_df = make_student_df([['A', 'M', 1, 2, 3], ['B', 'M', 1, 1, 1]], 3)
+    result_df, _, issues = grade(student_df, answer_df)
+    assert result_df['총점'].tolist() == [15, 10]
+    assert result_df['만점'].tolist() == [15, 15]
+    assert result_df['총점'].dtype == np.int32
+    assert [message for level, message in issues if level == 'error' and '배점 변환 오류' in message]
+
+
+def test_compact_totals_keeps_non_finite_totals_as_float():
+    assert compact_totals(np.array([10.0, 15.0])).dtype == np.int32
+    totals = compact_totals(np.array([10.0, np.nan]))
+    assert totals.dtype == np.float64 and np.isnan(totals[1])
@@ -0,0 +1,69 @@
+"""item_analysis 문항 분석 테스트 (문항마다 직접 계산한 값과 비교)"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grading import compile_answer_key, grade_frame
+from item_analysis import (
+    CHOICE_COLUMNS, ITEM_ANALYSIS_COLUMNS, analyze_subject, discrimination_index, point_biserial,
+)
+from reference_grading import random_exam
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def graded(student_df, answer_df):
+    answer_key = compile_answer_key(answer_df)
+    result_df, response_data, _ = grade_frame(student_df, answer_key)
+    return result_df, response_data, answer_key
+
+
+def test_sample_files_have_nan_for_items_everyone_got_right():
+    result_df, response_data, answer_key = graded(
+        pd.read_csv(REPO_ROOT / 'sample_students.csv'), pd.read_csv(REPO_ROOT / 'sample_answers.csv')
+    )
+    for subject in response_data.subjects:
+        analysis_df = analyze_subject(result_df, response_data, answer_key, subject)
+        assert list(analysis_df.columns) == ITEM_ANALYSIS_COLUMNS
+        r_pb = analysis_df['점이연상관'].to_numpy()
+        assert not np.isinf(r_pb).any(), subject
+        assert np.isnan(r_pb[analysis_df['정답률'].to_numpy() == 1]).all(), subject
+
+
+def test_point_biserial_is_nan_for_constant_items_and_scores():
+    correct = np.array([[True, False, True], [True, False, False], [True, False, True]])
+    r_pb = point_biserial(correct, [7.0, 3.0, 11.0])
+    assert np.isnan(r_pb[:2]).all() and np.isfinite(r_pb[2])
+    assert np.isnan(point_biserial(correct, [5.0, 5.0, 5.0])).all()
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_analysis_matches_per_item_computation(seed):
+    student_df, answer_df = random_exam(seed, n_students=300)
+    result_df, response_data, answer_key = graded(student_df, answer_df)
+    for subject, subject_responses in response_data.subjects.items():
+        analysis_df = analyze_subject(result_df, response_data, answer_key, subject)
+        scores = result_df['총점'].to_numpy(np.float64)[subject_responses.rows]
+        correct = subject_responses.correct
+        assert analysis_df['정답률'].tolist() == pytest.approx(correct.mean(axis=0).tolist())
+
+        for question in range(correct.shape[1]):
+            item = correct[:, question].astype(np.float64)
+            if 0 < item.mean() < 1 and scores.std() > 0:
+                expected = np.corrcoef(item, scores)[0, 1]
+                assert analysis_df['점이연상관'].iat[question] == pytest.approx(expected)
+            else:
+                assert np.isnan(analysis_df['점이연상관'].iat[question])
+
+        # 선택지 분포 합은 응시 인원
+        assert (analysis_df[CHOICE_COLUMNS].sum(axis=1) == len(scores)).all()
+
+
+def test_discrimination_index_uses_top_and_bottom_groups():
+    # 총점 순으로 상위 1명은 맞히고 하위 1명은 틀린 문항 / 반대 문항
+    correct = np.array([[False, True], [True, True], [True, False], [True, False]])
+    scores = np.array([1.0, 2.0, 3.0, 4.0])
+    assert discrimination_index(correct, scores, ratio=0.25).tolist() == [1.0, -1.0]
+    assert np.isnan(discrimination_index(correct[:1], scores[:1])).all()
@@ -0,0 +1,115 @@
+"""업로드 파일 로더 테스트: 읽는 방법(pyarrow/C 엔진, 스트리밍 조각, Excel)과 관계없이 같은 채점 결과"""
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import loaders
+from grading import TAMGU_LAYOUT, compile_answer_key, grade_chunks, grade_frame, normalize_answer
+from loaders import iter_student_data_chunks, load_student_data, load_student_preview, parse_csv_bytes
+from reference_grading import assert_matches_reference, random_exam, reference_grade
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def upload(data, name):
+    """업로드 파일처럼 이름(.name)이 있는 파일 객체"""
+    file = io.BytesIO(data)
+    file.name = name
+    return file
+
+
+def exam_files(seed, file_format, encoding='utf-8'):
+    """무작위 시험의 학생 답안 파일 bytes, 답안을 글자 그대로 읽은 DataFrame, AnswerKey"""
+    student_df, answer_df = random_exam(seed, n_students=300)
+    if file_format == 'xlsx':
+        buffer = io.BytesIO()
+        student_df.to_excel(buffer, index=False)
+        data = buffer.getvalue()
+        text_df = pd.read_excel(io.BytesIO(data))
+    else:
+        data = student_df.to_csv(index=False).encode(encoding)
+        answer_columns = student_df.columns[2:]
+        text_df = pd.read_csv(io.BytesIO(data), encoding=encoding, dtype=dict.fromkeys(answer_columns, str))
+    return data, text_df, answer_df
+
+
+def answer_tokens(df):
+    return [[normalize_answer(value) for value in row] for row in df.itertuples(index=False)]
+
+
+@pytest.fixture(params=[True, False], ids=['pyarrow', 'c-engine'])
+def csv_engine(request, monkeypatch):
+    if request.param and not loaders.PYARROW_AVAILABLE:
+        pytest.skip('pyarrow 미설치')
+    monkeypatch.setattr(loaders, 'PYARROW_AVAILABLE', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('file_format, encoding', [('csv', 'utf-8'), ('csv', 'cp949'), ('xlsx', None)])
+def test_whole_file_and_streaming_grade_the_same(csv_engine, seed, file_format, encoding):
+    data, text_df, answer_df = exam_files(seed, file_format, encoding)
+    answer_key = compile_answer_key(answer_df)
+    expected = reference_grade(text_df, answer_df)
+    name = f'students.{file_format}'
+
+    student_df = load_student_data(upload(data, name))
+    result_df, response_data, _ = grade_frame(student_df, answer_key)
+    assert_matches_reference(result_df, response_data, expected)
+
+    # 작은 조각으로 읽으면 같은 열도 조각마다 다른 타입(bool, 정수, 문자열)으로 읽힘
+    chunks = iter_student_data_chunks(upload(data, name), chunk_rows=7)
+    result_df, response_data, _ = grade_chunks(chunks, answer_key)
+    assert_matches_reference(result_df, response_data, expected)
+
+
+def test_true_false_columns_grade_the_same(csv_engine):
+    # pyarrow 엔진은 1/0/true만 있는 열을 bool로, C 엔진은 true/false만 있는 조각을 bool로 읽음
+    data = (
+        '수험번호,과목코드,1번,2번,3번\n'
+        'A,M,1,true,O\n'
+        'B,M,0,TRUE,X\n'
+        'C,M,true,false,O\n'
+        'D,M,1,True,\n'
+    ).encode('utf-8')
+    answer_df = pd.DataFrame({'과목번호': ['M'] * 3, '문항': [1, 2, 3], '정답': [1, 'true', 'O'], '배점': [1, 2, 4]})
+    answer_key = compile_answer_key(answer_df)
+    expected = reference_grade(pd.read_csv(io.BytesIO(data), dtype=str), answer_df)
+    assert [row['총점'] for row in expected] == [7, 2, 4, 3]
+
+    df = parse_csv_bytes(data, 'utf-8')
+    assert df['1번'].map(str).tolist() == ['1', '0', 'true', '1']
+
+    result_df, response_data, _ = grade_frame(load_student_data(upload(data, 'students.csv')), answer_key)
+    assert_matches_reference(result_df, response_data, expected)
+    chunks = iter_student_data_chunks(upload(data, 'students.csv'), chunk_rows=1)
+    result_df, response_data, _ = grade_chunks(chunks, answer_key)
+    assert_matches_reference(result_df, response_data, expected)
+
+
+def test_duplicate_and_empty_headers_are_renamed(csv_engine):
+    df = parse_csv_bytes(b'a,a,,b\n1,2,3,4\n', 'utf-8')
+    assert list(df.columns) == ['a', 'a.1', 'Unnamed: 2', 'b']
+    assert df.iloc[0].tolist() == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'xlsx'])
+def test_student_preview_matches_first_rows(file_format):
+    data, _, _ = exam_files(0, file_format, 'utf-8')
+    file = upload(data, f'students.{file_format}')
+    preview = load_student_preview(file, n_rows=5)
+    assert file.tell() == 0
+    expected = load_student_data(upload(data, f'students.{file_format}')).head(5)
+    # 일부 행만 읽으면 열 타입은 다를 수 있으므로 채점에 쓰는 토큰으로 비교
+    assert list(preview.columns) == list(expected.columns)
+    assert answer_tokens(preview) == answer_tokens(expected)
+
+
+def test_student_preview_reshapes_tamgu_rows():
+    data = (REPO_ROOT / 'sample_students_tamgu.csv').read_bytes()
+    preview = load_student_preview(upload(data, 'students.csv'), TAMGU_LAYOUT, n_rows=2)
+    expected = load_student_data(upload(data, 'students.csv'), layout=TAMGU_LAYOUT)
+    assert len(preview) == 2 * TAMGU_LAYOUT.subjects_per_row
+    assert preview['수험번호'].tolist() == expected['수험번호'].head(len(preview)).tolist()
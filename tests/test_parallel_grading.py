@@ -0,0 +1,53 @@
+"""과목별 병렬 채점(프로세스 풀) 결과를 순차 채점·기준 구현과 비교하는 테스트"""
+import pytest
+
+import grading
+from grading import SHARD_START_METHOD, compile_answer_key, grade_chunks, grade_frame, shard_executor
+from reference_grading import assert_matches_reference, random_exam, reference_grade
+
+
+@pytest.fixture
+def parallel_every_chunk(monkeypatch):
+    # 작은 조각도 프로세스 풀에서 채점
+    monkeypatch.setattr(grading, 'PARALLEL_MIN_ROWS', 1)
+
+
+def test_pool_does_not_fork():
+    assert SHARD_START_METHOD in ('forkserver', 'spawn')
+    assert shard_executor(2)._mp_context.get_start_method() == SHARD_START_METHOD
+
+
+def test_pool_is_created_once():
+    assert shard_executor(2) is shard_executor(2)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_parallel_grade_frame_matches_reference(parallel_every_chunk, seed):
+    student_df, answer_df = random_exam(seed, n_students=400)
+    answer_key = compile_answer_key(answer_df)
+    expected = reference_grade(student_df, answer_df)
+
+    result_df, response_data, issues = grade_frame(student_df, answer_key, workers=2)
+    assert_matches_reference(result_df, response_data, expected)
+
+    serial_df, serial_data, serial_issues = grade_frame(student_df, answer_key, workers=1)
+    assert result_df.equals(serial_df)
+    assert issues == serial_issues
+    for subject, subject_responses in serial_data.subjects.items():
+        assert response_data[subject].tokens == subject_responses.tokens
+        assert (response_data[subject].responses == subject_responses.responses).all()
+
+
+def test_parallel_grade_chunks_shares_vocab_between_chunks(parallel_every_chunk):
+    # 조각마다 새 답안 표기가 나와도 과목별 vocab이 이어져 같은 답안 코드를 가져야 함
+    student_df, answer_df = random_exam(11, n_students=600)
+    answer_key = compile_answer_key(answer_df)
+    chunks = (student_df.iloc[start:start + 50] for start in range(0, len(student_df), 50))
+    result_df, response_data, _ = grade_chunks(chunks, answer_key, workers=2)
+    assert_matches_reference(result_df, response_data, reference_grade(student_df, answer_df))
+
+    _, serial_data, _ = grade_frame(student_df, answer_key)
+    for subject, subject_responses in serial_data.subjects.items():
+        tokens = response_data[subject].tokens
+        assert [tokens[code] if code >= 0 else None for code in response_data[subject].responses.ravel()] == \
+            [subject_responses.tokens[code] if code >= 0 else None for code in subject_responses.responses.ravel()]
@@ -0,0 +1,68 @@
+"""정답 정정 재채점(regrade) 결과를 새 정답으로 처음부터 채점한 결과·기준 구현과 비교하는 테스트"""
+import random
+
+import numpy as np
+import pytest
+
+from grading import compile_answer_key, diff_answer_keys, grade_frame, regrade
+from reference_grading import assert_matches_reference, random_exam, reference_grade
+
+
+def correct_answers(answer_df, seed, n_changes=6):
+    """정답 일부를 다른 답, 빈칸, 학생 답안에 없는 답, 같은 답의 다른 표기로 바꾸고 배점 일부를 바꾼 사본"""
+    rng = random.Random(seed)
+    corrected = answer_df.copy()
+    rows = rng.sample(range(len(corrected)), n_changes * 2)
+    replacements = [3, np.nan, 'Z', 'ㄱ', 'true', 5]
+    for row, replacement in zip(rows[:n_changes], replacements):
+        corrected.at[row, '정답'] = replacement
+    for row in rows[n_changes:]:
+        corrected.at[row, '배점'] = corrected.at[row, '배점'] + 1
+    # 같은 답의 다른 표기 (바뀐 문항이 아님)
+    numeric = corrected.index[corrected['정답'].map(lambda value: isinstance(value, int) and not isinstance(value, bool))]
+    corrected.loc[numeric[:3], '정답'] = [f' {corrected.at[row, "정답"]}.0' for row in numeric[:3]]
+    return corrected
+
+
+@pytest.mark.parametrize('materialize_wrong_questions', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_regrade_matches_full_grading(seed, materialize_wrong_questions):
+    student_df, answer_df = random_exam(seed, n_students=300)
+    old_key = compile_answer_key(answer_df)
+    result_df, response_data, _ = grade_frame(student_df, old_key)
+    if materialize_wrong_questions:
+        response_data.wrong_questions()  # 오답번호 문자열을 이미 만든 경우도 재채점 대상 행만 갱신
+
+    corrected_df = correct_answers(answer_df, seed)
+    new_key = compile_answer_key(corrected_df)
+    regraded = regrade(result_df, response_data, old_key, new_key)
+
+    assert_matches_reference(regraded.result_df, regraded.response_data, reference_grade(student_df, corrected_df))
+    full_df, _, _ = grade_frame(student_df, new_key)
+    assert regraded.result_df[['총점', '만점', '정답수']].equals(full_df[['총점', '만점', '정답수']])
+
+    # 입력 결과는 바꾸지 않음
+    assert result_df.equals(grade_frame(student_df, old_key)[0])
+    changed = regraded.result_df['총점'].to_numpy() != result_df['총점'].to_numpy()
+    assert sorted(regraded.changed_students.index) == np.flatnonzero(changed).tolist()
+
+
+def test_same_answer_with_different_spelling_is_not_a_change():
+    _, answer_df = random_exam(0)
+    corrected = answer_df.copy()
+    numeric = corrected.index[corrected['정답'].map(lambda value: isinstance(value, int) and not isinstance(value, bool))]
+    corrected.loc[numeric, '정답'] = [f'{corrected.at[row, "정답"]}.0 ' for row in numeric]
+    corrected['정답'] = corrected['정답'].map(lambda value: 'TRUE' if value == 'True' else value)
+    changes, issues = diff_answer_keys(compile_answer_key(answer_df), compile_answer_key(corrected))
+    assert changes == {}
+    assert issues == []
+
+
+def test_subject_with_different_question_count_is_kept():
+    student_df, answer_df = random_exam(1)
+    old_key = compile_answer_key(answer_df)
+    result_df, response_data, _ = grade_frame(student_df, old_key)
+    corrected = answer_df[~((answer_df['과목번호'] == 'S3') & (answer_df['문항'] == 7))]
+    regraded = regrade(result_df, response_data, old_key, compile_answer_key(corrected))
+    assert regraded.result_df.equals(result_df)
+    assert any('문항 수가 바뀌었습니다' in message for _, message in regraded.issues)
@@ -0,0 +1,32 @@
+"""rendering 작업 프로세스 풀 테스트 (fork 없이 시작하고 결과를 캐시하는지)"""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from grading import SHARD_START_METHOD, compile_answer_key, grade_frame
+from rendering import RenderService, statistics_report_aggregates
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def render_service():
+    service = RenderService(workers=1)
+    yield service
+    service.shutdown()
+
+
+def test_render_pool_does_not_fork(render_service):
+    render_service.warm_up()
+    assert render_service._executor._mp_context.get_start_method() == SHARD_START_METHOD
+
+
+def test_statistics_png_is_rendered_once(render_service):
+    result_df, _, _ = grade_frame(
+        pd.read_csv(REPO_ROOT / 'sample_students.csv'), compile_answer_key(pd.read_csv(REPO_ROOT / 'sample_answers.csv'))
+    )
+    aggregates = statistics_report_aggregates(result_df)
+    png = render_service.render('statistics_png', aggregates)
+    assert png.startswith(b'\x89PNG')
+    assert render_service.submit('statistics_png', aggregates).result() is png
@@ -0,0 +1,39 @@
+"""학생별 성적표 ZIP 생성 테스트 (fork 없이 프로세스 풀에서 만드는지)"""
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import reports
+from grading import SHARD_START_METHOD, compile_answer_key, grade_frame, worker_context
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(not reports.REPORTLAB_AVAILABLE, reason='reportlab 없음')
+
+
+def test_report_card_zip_uses_worker_context(tmp_path, monkeypatch):
+    result_df, response_data, _ = grade_frame(
+        pd.read_csv(REPO_ROOT / 'sample_students.csv'), compile_answer_key(pd.read_csv(REPO_ROOT / 'sample_answers.csv'))
+    )
+    cards = list(reports.iter_report_cards(result_df, response_data))[:3]
+    contexts = []
+
+    def recording_context():
+        contexts.append(worker_context())
+        return contexts[-1]
+
+    monkeypatch.setattr(reports, 'worker_context', recording_context)
+    target = tmp_path / 'cards.zip'
+    assert reports.write_report_cards_zip(cards, target, workers=2) == len(cards)
+
+    assert [context.get_start_method() for context in contexts] == [SHARD_START_METHOD]
+    with zipfile.ZipFile(target) as archive:
+        names = archive.namelist()
+        assert sorted(names) == sorted(card.file_name for card in cards)
+        assert all(archive.read(name).startswith(b'%PDF') for name in names)
+
+
+def test_report_card_workers_default_is_capped():
+    assert 1 <= reports.REPORT_CARD_WORKERS <= 4
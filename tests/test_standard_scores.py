@@ -0,0 +1,70 @@
+"""standard_scores 환산 테스트 (학생마다 정의대로 직접 계산한 값과 비교)"""
+import math
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from standard_scores import GRADE_CUMULATIVE_RATIOS, convert_scores, convert_subject_scores, round_half_up
+
+
+def reference_convert(raw_scores, scale):
+    """학생 한 명씩 표준점수/백분위/등급 계산 (모듈 docstring의 정의 그대로)"""
+    n = len(raw_scores)
+    mean = sum(raw_scores) / n
+    std = math.sqrt(sum((score - mean) ** 2 for score in raw_scores) / n)
+    standard = [math.floor(scale[0] + scale[1] * ((score - mean) / std if std > 0 else 0) + 0.5) for score in raw_scores]
+    percentile, grades = [], []
+    for value in standard:
+        below = sum(other < value for other in standard)
+        same = sum(other == value for other in standard)
+        above = sum(other > value for other in standard)
+        percentile.append(math.floor((below + same / 2) / n * 100 + 0.5))
+        grades.append(1 + sum(above / n >= ratio for ratio in GRADE_CUMULATIVE_RATIOS))
+    return standard, percentile, grades
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_subject_conversion_matches_reference(seed):
+    rng = random.Random(seed)
+    raw_scores = [rng.choice(range(0, 101, 2)) for _ in range(rng.randint(1, 400))]
+    standard, percentile, grades = convert_subject_scores(raw_scores, (100, 20))
+    expected = reference_convert(raw_scores, (100, 20))
+    assert standard.tolist() == expected[0]
+    assert percentile.tolist() == expected[1]
+    assert grades.tolist() == expected[2]
+
+
+def test_ties_share_the_higher_grade_and_constant_scores():
+    standard, percentile, grades = convert_subject_scores([90, 90, 80, 70] + [60] * 96)
+    assert grades[0] == grades[1] == 1
+    assert percentile[0] == percentile[1]
+    standard, percentile, grades = convert_subject_scores([50, 50, 50])
+    assert standard.tolist() == [50, 50, 50]
+    assert percentile.tolist() == [50, 50, 50]
+    assert grades.tolist() == [1, 1, 1]
+
+
+def test_round_half_up():
+    assert round_half_up([0.5, 1.5, 2.5, -0.5, 2.49]).tolist() == [1, 2, 3, 0, 2]
+
+
+def test_convert_scores_by_subject_keeps_row_order():
+    rng = np.random.default_rng(0)
+    result_df = pd.DataFrame({
+        '과목코드': pd.Categorical(rng.choice(['A', 'B', 'C'], size=500)),
+        '총점': rng.integers(0, 50, size=500).astype(np.int32),
+    }, index=pd.RangeIndex(1000, 1500))
+    conversion = convert_scores(result_df, (50, 10))
+    assert conversion.scores.index.equals(result_df.index)
+    for subject in ('A', 'B', 'C'):
+        mask = (result_df['과목코드'] == subject).to_numpy()
+        expected = reference_convert(result_df['총점'].to_numpy()[mask].tolist(), (50, 10))
+        assert conversion.scores['표준점수'].to_numpy()[mask].tolist() == expected[0]
+        assert conversion.scores['백분위'].to_numpy()[mask].tolist() == expected[1]
+        assert conversion.scores['등급'].to_numpy()[mask].tolist() == expected[2]
+
+        cut_table = conversion.cut_tables[subject]
+        assert cut_table['등급'].tolist() == list(range(1, 10))
+        assert cut_table['인원'].sum() == mask.sum()